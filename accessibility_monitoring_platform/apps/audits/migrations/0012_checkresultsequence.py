@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audits", "0011_remove_audit_accessibility_statement_backup_url_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CheckResultSequence",
+            fields=[
+                (
+                    "audit",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="check_result_sequence",
+                        serialize=False,
+                        to="audits.audit",
+                    ),
+                ),
+                ("last_id_within_case", models.IntegerField(default=0)),
+            ],
+        ),
+    ]
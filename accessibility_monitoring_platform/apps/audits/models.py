@@ -4,9 +4,9 @@ Models - audits (called tests by the users)
 
 from datetime import date
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.db.models import Case as DjangoCase
-from django.db.models import Q, When
+from django.db.models import F, Max, Q, When
 from django.db.models.query import QuerySet
 from django.urls import reverse
 from django.utils import timezone
@@ -654,6 +654,55 @@ class WcagDefinition(models.Model):
         return reverse("audits:wcag-definition-update", kwargs={"pk": self.pk})
 
 
+class CheckResultSequence(models.Model):
+    """
+    Last id_within_case allocated to a check result of an audit
+
+    Ids are reserved by incrementing the counter with an UPDATE, which holds
+    the row lock until the transaction commits, so concurrent edits of the
+    same audit never get the same number.
+    """
+
+    audit = models.OneToOneField(
+        Audit,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="check_result_sequence",
+    )
+    last_id_within_case = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.audit} | #E{self.last_id_within_case}"
+
+    @classmethod
+    def reserve_ids_within_case(cls, audit_id: int, number_of_ids: int = 1) -> range:
+        """Reserve a block of consecutive ids for new check results of audit"""
+        with transaction.atomic():
+            if not cls.objects.filter(audit_id=audit_id).update(
+                last_id_within_case=F("last_id_within_case") + number_of_ids
+            ):
+                try:
+                    with transaction.atomic():
+                        last_id_within_case: int = (
+                            CheckResult.objects.filter(audit_id=audit_id).aggregate(
+                                Max("id_within_case")
+                            )["id_within_case__max"]
+                            or 0
+                        )
+                        cls.objects.create(
+                            audit_id=audit_id,
+                            last_id_within_case=last_id_within_case + number_of_ids,
+                        )
+                except IntegrityError:
+                    cls.objects.filter(audit_id=audit_id).update(
+                        last_id_within_case=F("last_id_within_case") + number_of_ids
+                    )
+            last_id_within_case = cls.objects.values_list(
+                "last_id_within_case", flat=True
+            ).get(audit_id=audit_id)
+        return range(last_id_within_case - number_of_ids + 1, last_id_within_case + 1)
+
+
 class CheckResult(models.Model):
     """
     Model for test result
@@ -721,18 +770,11 @@ class CheckResult(models.Model):
     def save(self, *args, **kwargs) -> None:
         self.updated = timezone.now()
         if not self.id:
-            self.id_within_case = self.audit.checkresult_audit.all().count() + 1
+            self.id_within_case = CheckResultSequence.reserve_ids_within_case(
+                audit_id=self.audit_id
+            )[0]
         super().save(*args, **kwargs)
 
-    @property
-    def matching_wcag_with_retest_notes_check_results(self) -> dict[str, str]:
-        """Other check results with retest notes for matching WCAGDefinition"""
-        return (
-            self.audit.failed_check_results.filter(wcag_definition=self.wcag_definition)
-            .exclude(page=self.page)
-            .exclude(retest_notes="")
-        )
-
     @property
     def unique_id_within_case(self) -> str:
         """Unique identifies of check result within case to aid QA audit communication"""
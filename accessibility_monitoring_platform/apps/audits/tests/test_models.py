@@ -2,10 +2,13 @@
 Tests for cases models
 """
 
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 from unittest.mock import Mock, patch
 
 import pytest
+from django.db import connection
 from django.db.models.query import QuerySet
 from pytest_django.asserts import assertQuerySetEqual
 
@@ -14,6 +17,7 @@ from ...common.models import Boolean
 from ..models import (
     Audit,
     CheckResult,
+    CheckResultSequence,
     Page,
     Retest,
     RetestCheckResult,
@@ -587,6 +591,64 @@ def test_wcag_definition_start_end_date_range():
     assert WcagDefinition.objects.on_date(current_date).first() == wcag_definition
 
 
+@pytest.mark.django_db
+def test_wcag_definition_catalogue_cached_by_date_range(django_assert_num_queries):
+    """
+    Test WCAG definitions in effect on dates in the same date range are read
+    from the catalogue cache.
+    """
+    WcagDefinition.objects.all().delete()
+    current_wcag_definition: WcagDefinition = WcagDefinition.objects.create()
+    WcagDefinition.objects.create(date_end=date(2020, 1, 1))
+    future_wcag_definition: WcagDefinition = WcagDefinition.objects.create(
+        date_start=date(2024, 1, 1)
+    )
+
+    assert WcagDefinition.objects.catalogue_on_date(date(2023, 1, 1)) == (
+        current_wcag_definition,
+    )
+
+    with django_assert_num_queries(0):
+        assert WcagDefinition.objects.catalogue_on_date(date(2023, 6, 1)) == (
+            current_wcag_definition,
+        )
+
+    assert WcagDefinition.objects.catalogue_on_date(date(2024, 1, 1)) == (
+        current_wcag_definition,
+        future_wcag_definition,
+    )
+
+
+@pytest.mark.django_db
+def test_wcag_definition_catalogue_cleared_on_save():
+    """Test saving a WCAG definition clears the catalogue cache"""
+    WcagDefinition.objects.all().delete()
+    wcag_definition: WcagDefinition = WcagDefinition.objects.create()
+
+    assert WcagDefinition.objects.catalogue_on_date(date(2023, 1, 1)) == (
+        wcag_definition,
+    )
+
+    wcag_definition.date_end = date(2022, 1, 1)
+    wcag_definition.save()
+
+    assert WcagDefinition.objects.catalogue_on_date(date(2023, 1, 1)) == ()
+
+
+@pytest.mark.django_db
+def test_statement_check_catalogue_cleared_on_delete():
+    """Test deleting a statement check clears the catalogue cache"""
+    number_of_statement_checks: int = len(
+        StatementCheck.objects.catalogue_on_date(date.today())
+    )
+    StatementCheck.objects.first().delete()
+
+    assert (
+        len(StatementCheck.objects.catalogue_on_date(date.today()))
+        == number_of_statement_checks - 1
+    )
+
+
 @pytest.mark.django_db
 def test_accessibility_statement_initially_found():
     """
@@ -1744,60 +1806,6 @@ def test_retest_statement_check_results_label():
     assert retest_statement_check_result.label == "Is there an accessibility page?"
 
 
-@pytest.mark.django_db
-def test_check_result_matching_wcag_with_retest_notes_check_results():
-    """
-    Test CheckResult.matching_wcag_with_retest_notes_check_results returns other
-    check results on the other pages with the same WCAG definition and retest notes
-    """
-    wcag_definition: WcagDefinition = WcagDefinition.objects.create(
-        type=WcagDefinition.Type.AXE, name=WCAG_TYPE_AXE_NAME
-    )
-    case: Case = Case.objects.create()
-    audit: Audit = Audit.objects.create(case=case)
-    home_page: Page = Page.objects.create(audit=audit, page_type=Page.Type.HOME)
-    contact_page: Page = Page.objects.create(audit=audit, page_type=Page.Type.CONTACT)
-    coronavirus_page: Page = Page.objects.create(
-        audit=audit, page_type=Page.Type.CORONAVIRUS
-    )
-    first_check_result: CheckResult = CheckResult.objects.create(
-        audit=audit,
-        page=home_page,
-        check_result_state=CheckResult.Result.ERROR,
-        retest_state=CheckResult.RetestResult.NOT_FIXED,
-        type=wcag_definition.type,
-        wcag_definition=wcag_definition,
-    )
-    second_check_result: CheckResult = CheckResult.objects.create(
-        audit=audit,
-        page=contact_page,
-        check_result_state=CheckResult.Result.ERROR,
-        retest_state=CheckResult.RetestResult.NOT_FIXED,
-        type=wcag_definition.type,
-        wcag_definition=wcag_definition,
-        retest_notes="Sample note",
-    )
-    third_check_result: CheckResult = CheckResult.objects.create(
-        audit=audit,
-        page=coronavirus_page,
-        check_result_state=CheckResult.Result.ERROR,
-        retest_state=CheckResult.RetestResult.NOT_FIXED,
-        type=wcag_definition.type,
-        wcag_definition=wcag_definition,
-        retest_notes="Another note",
-    )
-
-    assert first_check_result.matching_wcag_with_retest_notes_check_results.count() == 2
-    assert (
-        first_check_result.matching_wcag_with_retest_notes_check_results.first()
-        == second_check_result
-    )
-    assert (
-        first_check_result.matching_wcag_with_retest_notes_check_results.last()
-        == third_check_result
-    )
-
-
 @pytest.mark.django_db
 def test_retest_check_result_matching_wcag_retest_check_results():
     """
@@ -1940,3 +1948,93 @@ def test_check_result_unique_id_within_case():
     )
 
     assert check_result_2a.unique_id_within_case == "#E1"
+
+
+@pytest.mark.django_db
+def test_check_result_id_within_case_allocated_from_sequence():
+    """Test new check results are numbered in sequence within the audit"""
+    audit: Audit = create_audit_and_check_results()
+
+    assert list(
+        CheckResult.objects.filter(audit=audit).values_list("id_within_case", flat=True)
+    ) == list(range(1, CheckResult.objects.filter(audit=audit).count() + 1))
+    assert (
+        CheckResultSequence.objects.get(audit=audit).last_id_within_case
+        == CheckResult.objects.filter(audit=audit).count()
+    )
+
+
+@pytest.mark.django_db
+def test_reserve_ids_within_case_block():
+    """Test a block of ids is reserved for bulk inserts"""
+    audit: Audit = Audit.objects.create(case=Case.objects.create())
+
+    assert CheckResultSequence.reserve_ids_within_case(
+        audit_id=audit.id, number_of_ids=3
+    ) == range(1, 4)
+    assert CheckResultSequence.reserve_ids_within_case(audit_id=audit.id) == range(4, 5)
+
+
+@pytest.mark.django_db
+def test_reserve_ids_within_case_continues_from_existing_check_results():
+    """Test sequence created for existing audit starts after its check results"""
+    audit: Audit = create_audit_and_check_results()
+    last_id_within_case: int = CheckResult.objects.filter(audit=audit).count()
+    CheckResultSequence.objects.all().delete()
+
+    assert CheckResultSequence.reserve_ids_within_case(
+        audit_id=audit.id, number_of_ids=2
+    ) == range(last_id_within_case + 1, last_id_within_case + 3)
+
+
+@pytest.fixture
+def concurrent_database(transactional_db, tmp_path):
+    """
+    Let threads write to the test database at the same time. In-memory SQLite
+    locks tables shared between connections instead of waiting for writers to
+    finish, so copy the test database to a file for the test.
+    """
+    if connection.vendor != "sqlite" or not connection.is_in_memory_db():
+        yield
+        return
+    database_path: str = str(tmp_path / "concurrent_test_db.sqlite3")
+    connection.ensure_connection()
+    with sqlite3.connect(database_path) as file_connection:
+        connection.connection.backup(file_connection)
+    file_connection.close()
+    in_memory_connection: sqlite3.Connection = connection.connection
+    in_memory_database_name: str = connection.settings_dict["NAME"]
+    connection.connection = None
+    connection.settings_dict["NAME"] = database_path
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict["NAME"] = in_memory_database_name
+        connection.connection = in_memory_connection
+
+
+def test_reserve_ids_within_case_concurrently(concurrent_database):
+    """Test concurrent reservations for the same audit never share an id"""
+    audit: Audit = Audit.objects.create(case=Case.objects.create())
+
+    def reserve_ids(number_of_ids: int) -> range:
+        try:
+            return CheckResultSequence.reserve_ids_within_case(
+                audit_id=audit.id, number_of_ids=number_of_ids
+            )
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        reserved_ranges: list[range] = list(
+            executor.map(reserve_ids, [1, 2, 3, 4] * 25)
+        )
+
+    reserved_ids: list[int] = [
+        id_within_case
+        for reserved_range in reserved_ranges
+        for id_within_case in reserved_range
+    ]
+
+    assert sorted(reserved_ids) == list(range(1, 251))
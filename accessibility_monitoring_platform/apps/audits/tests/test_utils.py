@@ -13,6 +13,7 @@ from django.urls import reverse
 
 from ...cases.models import Case
 from ...common.form_extract_utils import FieldLabelAndValue
+from ...common.models import Boolean, Event
 from ...common.sitemap import PlatformPage
 from ..forms import CheckResultFormset
 from ..models import (
@@ -28,11 +29,13 @@ from ..models import (
     WcagDefinition,
 )
 from ..utils import (
+    AuditFailures,
     create_checkresults_for_retest,
     create_mandatory_pages_for_new_audit,
     create_or_update_check_results_for_page,
     create_statement_checks_for_new_audit,
     get_all_possible_check_results_for_page,
+    get_audit_failures,
     get_audit_summary_context,
     get_next_platform_page_equality_body,
     get_next_platform_page_initial,
@@ -402,6 +405,93 @@ def test_create_check_results_for_page():
     assert updated_audit.published_report_data_updated_time is not None
 
 
+@pytest.mark.django_db
+def test_create_or_update_check_results_for_page_saves_in_bulk(
+    django_assert_max_num_queries,
+):
+    """Test check results and events for a page are saved in bulk"""
+    audit: Audit = create_audit_and_check_results()
+    page_home: Page = Page.objects.get(audit=audit, page_type=Page.Type.HOME)
+    check_result: CheckResult = CheckResult.objects.get(page=page_home)
+    new_wcag_definitions: list[WcagDefinition] = [
+        WcagDefinition.objects.create(
+            type=WcagDefinition.Type.AXE, name=f"{WCAG_TYPE_AXE_NAME} {count}"
+        )
+        for count in range(3)
+    ]
+    formset_data: dict[str, int | str] = {
+        "form-TOTAL_FORMS": 4,
+        "form-INITIAL_FORMS": 4,
+        "form-MIN_NUM_FORMS": 0,
+        "form-MAX_NUM_FORMS": 1000,
+        "form-0-wcag_definition": check_result.wcag_definition.id,
+        "form-0-check_result_state": CheckResult.Result.ERROR,
+        "form-0-notes": UPDATED_NOTE,
+    }
+    for count, wcag_definition in enumerate(new_wcag_definitions, start=1):
+        formset_data[f"form-{count}-wcag_definition"] = wcag_definition.id
+        formset_data[f"form-{count}-check_result_state"] = CheckResult.Result.ERROR
+        formset_data[f"form-{count}-notes"] = NEW_CHECK_NOTE
+    check_results_formset: CheckResultFormset = CheckResultFormset(formset_data)
+    check_results_formset.is_valid()
+    audit_version: int = Audit.objects.get(id=audit.id).version
+
+    with django_assert_max_num_queries(12):
+        create_or_update_check_results_for_page(
+            user=audit.case.auditor,
+            page=page_home,
+            check_result_forms=check_results_formset.forms,
+        )
+
+    assert list(
+        CheckResult.objects.filter(
+            page=page_home, type=WcagDefinition.Type.AXE
+        ).values_list("id_within_case", flat=True)
+    ) == [3, 4, 5]
+
+    check_result.refresh_from_db()
+
+    assert check_result.notes == UPDATED_NOTE
+    assert Event.objects.filter(type=Event.Type.UPDATE).count() == 1
+    assert Event.objects.filter(type=Event.Type.CREATE).count() == 3
+
+    update_event: Event = Event.objects.get(type=Event.Type.UPDATE)
+
+    assert update_event.parent == check_result
+    assert "notes" in update_event.value
+    assert Audit.objects.get(id=audit.id).version == audit_version + 1
+
+
+@pytest.mark.django_db
+def test_create_or_update_check_results_for_page_no_changes():
+    """Test nothing is saved when check results have not changed"""
+    audit: Audit = create_audit_and_check_results()
+    page_home: Page = Page.objects.get(audit=audit, page_type=Page.Type.HOME)
+    check_result: CheckResult = CheckResult.objects.get(page=page_home)
+    check_results_formset: CheckResultFormset = CheckResultFormset(
+        {
+            "form-TOTAL_FORMS": 1,
+            "form-INITIAL_FORMS": 1,
+            "form-MIN_NUM_FORMS": 0,
+            "form-MAX_NUM_FORMS": 1000,
+            "form-0-wcag_definition": check_result.wcag_definition.id,
+            "form-0-check_result_state": check_result.check_result_state,
+            "form-0-notes": check_result.notes,
+        }
+    )
+    check_results_formset.is_valid()
+
+    create_or_update_check_results_for_page(
+        user=audit.case.auditor,
+        page=page_home,
+        check_result_forms=check_results_formset.forms,
+    )
+
+    assert Event.objects.count() == 0
+    assert CheckResult.objects.get(id=check_result.id).updated == check_result.updated
+    assert Audit.objects.get(id=audit.id).published_report_data_updated_time is None
+
+
 @pytest.mark.django_db
 def test_get_all_possible_check_results_for_page():
     """Test building list of all possible test results"""
@@ -545,6 +635,77 @@ def test_get_next_platform_page_twelve_week_audit_with_no_errors():
     )
 
 
+def create_audit_with_failures() -> tuple[Audit, list[CheckResult]]:
+    """Create audit with the same WCAG definition failed on two pages"""
+    audit: Audit = create_audit_and_check_results()
+    wcag_definition: WcagDefinition = WcagDefinition.objects.get(
+        type=WcagDefinition.Type.MANUAL
+    )
+    check_results: list[CheckResult] = [
+        CheckResult.objects.create(
+            audit=audit,
+            page=Page.objects.create(
+                audit=audit,
+                page_type=Page.Type.EXTRA,
+                url=f"https://example.com/{count}",
+            ),
+            wcag_definition=wcag_definition,
+            type=wcag_definition.type,
+            check_result_state=CheckResult.Result.ERROR,
+            retest_notes=f"Retest note {count}",
+        )
+        for count in range(2)
+    ]
+    return audit, check_results
+
+
+@pytest.mark.django_db
+def test_get_audit_failures_cached(django_assert_num_queries):
+    """Test audit's failures are read from cache until a check result changes"""
+    audit, check_results = create_audit_with_failures()
+
+    assert get_audit_failures(audit=audit).check_results == check_results
+
+    with django_assert_num_queries(1):
+        audit_failures: AuditFailures = get_audit_failures(audit=audit)
+
+    assert audit_failures.check_results == check_results
+
+    check_results[0].check_result_state = CheckResult.Result.NO_ERROR
+    check_results[0].save()
+
+    assert get_audit_failures(audit=audit).check_results == [check_results[1]]
+
+
+@pytest.mark.django_db
+def test_get_audit_failures_updated_when_page_changes():
+    """Test audit's cached failures change when a page is marked as not found"""
+    audit, check_results = create_audit_with_failures()
+    get_audit_failures(audit=audit)
+    page: Page = check_results[1].page
+    page.not_found = Boolean.YES
+    page.save()
+
+    assert get_audit_failures(audit=audit).check_results == [check_results[0]]
+
+
+@pytest.mark.django_db
+def test_audit_failures_grouped_by_wcag_definition_and_page():
+    """Test audit failures are grouped and matched with those on other pages"""
+    audit, check_results = create_audit_with_failures()
+    audit_failures: AuditFailures = get_audit_failures(audit=audit)
+    wcag_definition: WcagDefinition = check_results[0].wcag_definition
+
+    assert audit_failures.by_wcag_definition == {wcag_definition: check_results}
+    assert audit_failures.by_page[check_results[0].page] == [check_results[0]]
+    assert audit_failures.other_pages_by_wcag_definition(
+        page=check_results[0].page
+    ) == {wcag_definition: [check_results[1]]}
+    assert audit_failures.matching_with_retest_notes(check_result=check_results[0]) == [
+        check_results[1]
+    ]
+
+
 @pytest.mark.django_db
 def test_other_page_failed_check_results():
     """
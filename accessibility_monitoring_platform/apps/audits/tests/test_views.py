@@ -6,8 +6,10 @@ from datetime import date, timedelta
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
 from django.db.models.query import QuerySet
 from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from pytest_django.asserts import assertContains, assertNotContains
@@ -2068,6 +2070,61 @@ def test_retest_page_checks_edit_saves_results(admin_client):
     )
 
 
+def post_retest_page_checks(
+    admin_client, audit: Audit, number_of_check_results: int
+) -> int:
+    """Retest all of a new page's failed check results; Return number of queries"""
+    page: Page = Page.objects.create(audit=audit)
+    wcag_definition: WcagDefinition = WcagDefinition.objects.get(
+        type=WcagDefinition.Type.AXE
+    )
+    data: dict[str, str | int] = {
+        "version": audit.version,
+        "save": "Button value",
+        "form-TOTAL_FORMS": number_of_check_results,
+        "form-INITIAL_FORMS": number_of_check_results,
+        "form-MIN_NUM_FORMS": "0",
+        "form-MAX_NUM_FORMS": "1000",
+    }
+    for count in range(number_of_check_results):
+        check_result: CheckResult = CheckResult.objects.create(
+            audit=audit,
+            page=page,
+            wcag_definition=wcag_definition,
+            check_result_state=CheckResult.Result.ERROR,
+        )
+        data[f"form-{count}-id"] = check_result.id
+        data[f"form-{count}-retest_state"] = "fixed"
+        data[f"form-{count}-retest_notes"] = CHECK_RESULT_NOTES
+
+    with CaptureQueriesContext(connection) as captured_queries:
+        response: HttpResponse = admin_client.post(
+            reverse("audits:edit-audit-retest-page-checks", kwargs={"pk": page.id}),
+            data,
+        )
+
+    assert response.status_code == 302
+    assert (
+        CheckResult.objects.filter(page=page, retest_state="fixed").count()
+        == number_of_check_results
+    )
+    assert (
+        Event.objects.filter(object_id__in=page.checkresult_page.values("id")).count()
+        == number_of_check_results
+    )
+    return len(captured_queries)
+
+
+def test_retest_page_checks_saved_in_constant_number_of_queries(admin_client):
+    """Test number of queries to save retest does not grow with check results"""
+    audit: Audit = create_audit_and_wcag()
+    post_retest_page_checks(admin_client, audit=audit, number_of_check_results=1)
+
+    assert post_retest_page_checks(
+        admin_client, audit=audit, number_of_check_results=2
+    ) == post_retest_page_checks(admin_client, audit=audit, number_of_check_results=10)
+
+
 def test_retest_pages_shows_location(admin_client):
     """Test page location is shown"""
     audit: Audit = create_audit_and_wcag()
@@ -7,20 +7,26 @@ from datetime import date, datetime
 from typing import Any, TypeVar
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
 from django.db.models.query import QuerySet
 from django.http import Http404, HttpRequest
 from django.utils import timezone
 
+from ..common.models import Event
 from ..common.sitemap import PlatformPage, get_platform_page_by_url_name
 from ..common.utils import (
+    build_model_create_event,
+    build_model_update_event,
+    get_model_fields,
     list_to_dictionary_of_lists,
-    record_model_create_event,
-    record_model_update_event,
 )
-from .forms import CheckResultForm
+from .forms import AuditRetestCheckResultForm, CheckResultForm
 from .models import (
     Audit,
     CheckResult,
+    CheckResultSequence,
     Page,
     Retest,
     RetestCheckResult,
@@ -56,6 +62,8 @@ STATEMENT_CONTENT_SUBSECTIONS: list[StatementContentSubsection] = [
     StatementContentSubsection("Custom statement issues", "custom", "custom"),
 ]
 
+AUDIT_FAILURES_CACHE_TIMEOUT: int = 24 * 60 * 60
+
 P = TypeVar("P", bound=Page | RetestPage)
 
 
@@ -80,41 +88,126 @@ def create_or_update_check_results_for_page(
 
     if a check result matching the WCAG definition does exist then apply the
     latest state and notes values.
+
+    Changes are compared with the page's check results loaded once and saved
+    in bulk, along with their events, and the audit is marked as having
+    changed report data once.
     """
+    check_results_by_wcag_definition: dict[WcagDefinition, CheckResult] = (
+        page.check_results_by_wcag_definition
+    )
+    now: datetime = timezone.now()
+    new_check_results: list[CheckResult] = []
+    updated_check_results: list[CheckResult] = []
+    events: list[Event] = []
     for check_result_form in check_result_forms:
         wcag_definition: WcagDefinition = check_result_form.cleaned_data[
             "wcag_definition"
         ]
         check_result_state: str = check_result_form.cleaned_data["check_result_state"]
         notes: str = check_result_form.cleaned_data["notes"]
-        if wcag_definition in page.check_results_by_wcag_definition:
-            check_result: CheckResult = page.check_results_by_wcag_definition[
+        if wcag_definition in check_results_by_wcag_definition:
+            check_result: CheckResult = check_results_by_wcag_definition[
                 wcag_definition
             ]
-            if (
-                check_result.check_result_state != check_result_state
-                or check_result.notes != notes
-            ):
-                check_result.check_result_state = check_result_state
-                check_result.notes = notes
-                record_model_update_event(user=user, model_object=check_result)
-                report_data_updated(audit=check_result.audit)
-                check_result.save()
+            old_check_result_fields: dict[str, Any] = get_model_fields(check_result)
+            check_result.check_result_state = check_result_state
+            check_result.notes = notes
+            event: Event | None = build_model_update_event(
+                user=user,
+                model_object=check_result,
+                old_model_fields=old_check_result_fields,
+            )
+            if event is not None:
+                events.append(event)
+                check_result.updated = now
+                updated_check_results.append(check_result)
         elif notes != "" or check_result_state != CheckResult.Result.NOT_TESTED:
-            check_result: CheckResult = CheckResult.objects.create(
-                audit=page.audit,
-                page=page,
-                wcag_definition=wcag_definition,
-                type=wcag_definition.type,
-                check_result_state=check_result_state,
-                notes=notes,
+            new_check_results.append(
+                CheckResult(
+                    audit=page.audit,
+                    page=page,
+                    wcag_definition=wcag_definition,
+                    type=wcag_definition.type,
+                    check_result_state=check_result_state,
+                    notes=notes,
+                    updated=now,
+                )
+            )
+
+    if not new_check_results and not updated_check_results:
+        return
+
+    with transaction.atomic():
+        if new_check_results:
+            ids_within_case: range = CheckResultSequence.reserve_ids_within_case(
+                audit_id=page.audit_id, number_of_ids=len(new_check_results)
+            )
+            for check_result, id_within_case in zip(new_check_results, ids_within_case):
+                check_result.id_within_case = id_within_case
+            CheckResult.objects.bulk_create(new_check_results)
+            events += [
+                build_model_create_event(user=user, model_object=check_result)
+                for check_result in new_check_results
+            ]
+        if updated_check_results:
+            CheckResult.objects.bulk_update(
+                updated_check_results, ["check_result_state", "notes", "updated"]
             )
-            record_model_create_event(user=user, model_object=check_result)
-            report_data_updated(audit=page.audit)
+        Event.objects.bulk_create(events)
+        report_data_updated(audit=page.audit)
+
+
+def update_check_results_for_retest(
+    user: User, page: Page, check_result_forms: list[AuditRetestCheckResultForm]
+) -> None:
+    """
+    Apply retest state and notes from changed forms to the page's check
+    results; Check results are loaded in one query and saved in bulk along
+    with their events.
+    """
+    changed_forms: list[AuditRetestCheckResultForm] = [
+        check_result_form
+        for check_result_form in check_result_forms
+        if check_result_form.changed_data
+    ]
+    if not changed_forms:
+        return
+    check_results_by_id: dict[int, CheckResult] = CheckResult.objects.filter(
+        page=page
+    ).in_bulk(
+        [check_result_form.cleaned_data["id"] for check_result_form in changed_forms]
+    )
+    now: datetime = timezone.now()
+    updated_check_results: list[CheckResult] = []
+    events: list[Event] = []
+    for check_result_form in changed_forms:
+        check_result: CheckResult | None = check_results_by_id.get(
+            check_result_form.cleaned_data["id"]
+        )
+        if check_result is None:
+            continue
+        old_check_result_fields: dict[str, Any] = get_model_fields(check_result)
+        check_result.retest_state = check_result_form.cleaned_data["retest_state"]
+        check_result.retest_notes = check_result_form.cleaned_data["retest_notes"]
+        event: Event | None = build_model_update_event(
+            user=user,
+            model_object=check_result,
+            old_model_fields=old_check_result_fields,
+        )
+        if event is not None:
+            events.append(event)
+        check_result.updated = now
+        updated_check_results.append(check_result)
+    with transaction.atomic():
+        CheckResult.objects.bulk_update(
+            updated_check_results, ["retest_state", "retest_notes", "updated"]
+        )
+        Event.objects.bulk_create(events)
 
 
 def get_all_possible_check_results_for_page(
-    page: Page, wcag_definitions: list[WcagDefinition]
+    page: Page, wcag_definitions: list[WcagDefinition] | tuple[WcagDefinition, ...]
 ) -> list[dict[str, str | WcagDefinition]]:
     """
     Combine existing check result with all the WCAG definitions
@@ -168,7 +261,7 @@ def create_statement_checks_for_new_audit(audit: Audit) -> None:
     Create statement check results for new audit.
     """
     today: date = date.today()
-    for statement_check in StatementCheck.objects.on_date(today):
+    for statement_check in StatementCheck.objects.catalogue_on_date(today):
         StatementCheckResult.objects.create(
             audit=audit,
             type=statement_check.type,
@@ -242,6 +335,85 @@ def get_next_platform_page_twelve_week(
     )
 
 
+class AuditFailures:
+    """Failed check results of an audit grouped by WCAG definition and page"""
+
+    def __init__(self, check_results: list[CheckResult]) -> None:
+        self.check_results: list[CheckResult] = check_results
+        self.by_wcag_definition: dict[WcagDefinition, list[CheckResult]] = (
+            list_to_dictionary_of_lists(
+                items=check_results, group_by_attr="wcag_definition"
+            )
+        )
+        self.by_page: dict[Page, list[CheckResult]] = list_to_dictionary_of_lists(
+            items=check_results, group_by_attr="page"
+        )
+
+    @property
+    def unfixed_check_results(self) -> list[CheckResult]:
+        return [
+            check_result
+            for check_result in self.check_results
+            if check_result.retest_state != CheckResult.RetestResult.FIXED
+        ]
+
+    def other_pages_by_wcag_definition(
+        self, page: Page
+    ) -> dict[WcagDefinition, list[CheckResult]]:
+        """Return failures on pages other than this one by WCAG definition"""
+        failures_by_wcag_definition: dict[WcagDefinition, list[CheckResult]] = {}
+        for wcag_definition, check_results in self.by_wcag_definition.items():
+            other_page_check_results: list[CheckResult] = [
+                check_result
+                for check_result in check_results
+                if check_result.page_id != page.id
+            ]
+            if other_page_check_results:
+                failures_by_wcag_definition[wcag_definition] = other_page_check_results
+        return failures_by_wcag_definition
+
+    def matching_with_retest_notes(
+        self, check_result: CheckResult
+    ) -> list[CheckResult]:
+        """Return failures of the same WCAG definition on other pages with retest notes"""
+        return [
+            other_check_result
+            for other_check_result in self.by_wcag_definition.get(
+                check_result.wcag_definition, []
+            )
+            if other_check_result.page_id != check_result.page_id
+            and other_check_result.retest_notes
+        ]
+
+
+def get_audit_failures_cache_key(audit: Audit) -> str:
+    """
+    Return cache key for audit's failed check results; The key changes
+    whenever a check result, or the page it is on, of the audit is saved.
+    """
+    latest_changes: dict[str, Any] = CheckResult.objects.filter(
+        audit_id=audit.id
+    ).aggregate(
+        number_of_check_results=Count("id"),
+        check_result_updated=Max("updated"),
+        page_updated=Max("page__updated"),
+    )
+    return (
+        f"audit_failures:{audit.id}:{latest_changes['number_of_check_results']}:"
+        f"{latest_changes['check_result_updated']}:{latest_changes['page_updated']}"
+    ).replace(" ", "_")
+
+
+def get_audit_failures(audit: Audit) -> AuditFailures:
+    """Return audit's failed check results, from cache if unchanged"""
+    cache_key: str = get_audit_failures_cache_key(audit=audit)
+    check_results: list[CheckResult] | None = cache.get(cache_key)
+    if check_results is None:
+        check_results = list(audit.failed_check_results)
+        cache.set(cache_key, check_results, AUDIT_FAILURES_CACHE_TIMEOUT)
+    return AuditFailures(check_results=check_results)
+
+
 def other_page_failed_check_results(
     page: Page,
 ) -> dict[WcagDefinition, list[CheckResult]]:
@@ -255,19 +427,9 @@ def other_page_failed_check_results(
     Returns:
         dict[WcagDefinition, list[CheckResult]]: Dictionary of failed check results
     """
-    failed_check_results_by_wcag_definition: dict[WcagDefinition, list[CheckResult]] = (
-        {}
+    return get_audit_failures(audit=page.audit).other_pages_by_wcag_definition(
+        page=page
     )
-    for check_result in page.audit.failed_check_results.exclude(page=page):
-        if check_result.wcag_definition in failed_check_results_by_wcag_definition:
-            failed_check_results_by_wcag_definition[
-                check_result.wcag_definition
-            ].append(check_result)
-        else:
-            failed_check_results_by_wcag_definition[check_result.wcag_definition] = [
-                check_result
-            ]
-    return failed_check_results_by_wcag_definition
 
 
 def report_data_updated(audit: Audit) -> None:
@@ -320,7 +482,7 @@ def create_checkresults_for_retest(retest: Retest) -> None:
             )
 
     today: date = date.today()
-    for statement_check in StatementCheck.objects.on_date(today):
+    for statement_check in StatementCheck.objects.catalogue_on_date(today):
         RetestStatementCheckResult.objects.create(
             retest=retest, statement_check=statement_check, type=statement_check.type
         )
@@ -375,8 +537,11 @@ def get_audit_summary_context(request: HttpRequest, audit: Audit) -> dict[str, A
     context["show_unfixed"] = show_unfixed
     context["enable_12_week_ui"] = audit.retest_date is not None
 
-    check_results: QuerySet[CheckResult] = (
-        audit.unfixed_check_results if show_unfixed else audit.failed_check_results
+    audit_failures: AuditFailures = get_audit_failures(audit=audit)
+    check_results: list[CheckResult] = (
+        audit_failures.unfixed_check_results
+        if show_unfixed
+        else audit_failures.check_results
     )
 
     context["audit_failures_by_page"] = list_to_dictionary_of_lists(
@@ -400,7 +565,7 @@ def get_audit_summary_context(request: HttpRequest, audit: Audit) -> dict[str, A
         items=statement_check_results, group_by_attr="type"
     )
 
-    context["number_of_wcag_issues"] = check_results.count()
+    context["number_of_wcag_issues"] = len(check_results)
     context["number_of_statement_issues"] = statement_check_results.count()
 
     return context
@@ -264,8 +264,8 @@ class AuditPageChecksFormView(NextPlatformPageMixin, FormView):
         other_pages_failed_check_results: dict[WcagDefinition, list[CheckResult]] = (
             other_page_failed_check_results(page=self.page)
         )
-        wcag_definitions: list[WcagDefinition] = list(
-            WcagDefinition.objects.on_date(self.page.audit.date_of_test)
+        wcag_definitions: tuple[WcagDefinition, ...] = (
+            WcagDefinition.objects.catalogue_on_date(self.page.audit.date_of_test)
         )
 
         if self.request.POST:
@@ -305,7 +305,6 @@ class AuditPageChecksFormView(NextPlatformPageMixin, FormView):
 
     def form_valid(self, form: ModelForm):
         """Process contents of valid form"""
-        context: dict[str, Any] = self.get_context_data()
         page: Page = self.page
         if form.changed_data:
             page.complete_date = form.cleaned_data["complete_date"]
@@ -313,7 +312,9 @@ class AuditPageChecksFormView(NextPlatformPageMixin, FormView):
             record_model_update_event(user=self.request.user, model_object=page)
             page.save()
 
-        check_results_formset: CheckResultFormset = context["check_results_formset"]
+        check_results_formset: CheckResultFormset = CheckResultFormset(
+            self.request.POST
+        )
         if check_results_formset.is_valid():
             create_or_update_check_results_for_page(
                 user=self.request.user,
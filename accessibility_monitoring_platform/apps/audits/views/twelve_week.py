@@ -46,9 +46,12 @@ from ..models import (
     StatementPage,
 )
 from ..utils import (
+    AuditFailures,
+    get_audit_failures,
     get_audit_summary_context,
     get_next_platform_page_twelve_week,
     get_other_pages_with_retest_notes,
+    update_check_results_for_retest,
 )
 from .base import (
     AuditCaseComplianceUpdateView,
@@ -113,7 +116,10 @@ class AuditRetestPageChecksFormView(AuditPageChecksFormView):
 
     def get_context_data(self, **kwargs: dict[str, Any]) -> dict[str, Any]:
         """Populate context data for template rendering"""
-        context: dict[str, Any] = super().get_context_data(**kwargs)
+        # Skip the initial test's check results formset and failures
+        context: dict[str, Any] = super(AuditPageChecksFormView, self).get_context_data(
+            **kwargs
+        )
         context["page"] = self.page
         context["filter_form"] = AuditRetestCheckResultFilterForm(
             initial={
@@ -122,6 +128,7 @@ class AuditRetestPageChecksFormView(AuditPageChecksFormView):
                 "not-tested": False,
             }
         )
+        failed_check_results: list[CheckResult] = list(self.page.failed_check_results)
         if self.request.POST:
             check_results_formset: AuditRetestCheckResultFormset = (
                 AuditRetestCheckResultFormset(self.request.POST)
@@ -131,13 +138,23 @@ class AuditRetestPageChecksFormView(AuditPageChecksFormView):
                 AuditRetestCheckResultFormset(
                     initial=[
                         check_result.dict_for_retest
-                        for check_result in self.page.failed_check_results
+                        for check_result in failed_check_results
                     ]
                 )
             )
+        audit_failures: AuditFailures = get_audit_failures(audit=self.page.audit)
         check_results_and_forms: list[
-            tuple[CheckResult, AuditRetestCheckResultForm]
-        ] = list(zip(self.page.failed_check_results, check_results_formset.forms))
+            tuple[CheckResult, AuditRetestCheckResultForm, list[CheckResult]]
+        ] = [
+            (
+                check_result,
+                check_results_form,
+                audit_failures.matching_with_retest_notes(check_result=check_result),
+            )
+            for check_result, check_results_form in zip(
+                failed_check_results, check_results_formset.forms
+            )
+        ]
 
         context["check_results_formset"] = check_results_formset
         context["check_results_and_forms"] = check_results_and_forms
@@ -149,7 +166,6 @@ class AuditRetestPageChecksFormView(AuditPageChecksFormView):
 
     def form_valid(self, form: ModelForm):
         """Process contents of valid form"""
-        context: dict[str, Any] = self.get_context_data()
         page: Page = self.page
         if form.changed_data:
             page.retest_complete_date = form.cleaned_data["retest_complete_date"]
@@ -160,21 +176,15 @@ class AuditRetestPageChecksFormView(AuditPageChecksFormView):
             record_model_update_event(user=self.request.user, model_object=page)
             page.save()
 
-        check_results_formset: AuditRetestCheckResultFormset = context[
-            "check_results_formset"
-        ]
+        check_results_formset: AuditRetestCheckResultFormset = (
+            AuditRetestCheckResultFormset(self.request.POST)
+        )
         if check_results_formset.is_valid():
-            for form in check_results_formset.forms:
-                if form.changed_data:
-                    check_result: CheckResult = CheckResult.objects.get(
-                        id=form.cleaned_data["id"]
-                    )
-                    check_result.retest_state = form.cleaned_data["retest_state"]
-                    check_result.retest_notes = form.cleaned_data["retest_notes"]
-                    record_model_update_event(
-                        user=self.request.user, model_object=check_result
-                    )
-                    check_result.save()
+            update_check_results_for_retest(
+                user=self.request.user,
+                page=page,
+                check_result_forms=check_results_formset.forms,
+            )
         else:
             return super().form_invalid(form)
 
@@ -1,10 +1,80 @@
 """Command to recalculate and recache statuses"""
+
 from django.core.management.base import BaseCommand
+from django.db.models import QuerySet
 
+from ....notifications.utils import invalidate_number_of_tasks
 from ...models import Case
+from ...utils import (
+    CaseStatusChange,
+    calculate_case_status_changes,
+    get_cases_for_status_calculation,
+    save_case_status_changes,
+)
+
+DEFAULT_CHUNK_SIZE: int = 500
 
 
 class Command(BaseCommand):
+    """
+    Django command to recalculate the status and QA status of every case in
+    chunks, writing only those which have changed. Case updated timestamps
+    and versions are left untouched.
+    """
+
+    help = "Recalculate and recache case statuses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report status changes without saving them",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of cases to recalculate per query",
+        )
+
     def handle(self, *args, **options):  # pylint: disable=unused-argument
-        for item in Case.objects.all():
-            item.save()
+        dry_run: bool = options["dry_run"]
+        chunk_size: int = max(options["chunk_size"], 1)
+        total_cases: int = Case.objects.count()
+        cases_processed: int = 0
+        number_of_changes: int = 0
+        last_case_id: int = 0
+
+        while True:
+            cases: QuerySet[Case] = get_cases_for_status_calculation(
+                Case.objects.filter(id__gt=last_case_id).order_by("id")
+            )[:chunk_size]
+            chunk: list[Case] = list(cases)
+            if not chunk:
+                break
+            last_case_id = chunk[-1].id
+            case_status_changes: list[CaseStatusChange] = calculate_case_status_changes(
+                chunk
+            )
+            if dry_run:
+                for case_status_change in case_status_changes:
+                    self.stdout.write(
+                        f"{case_status_change.case} (id {case_status_change.case.id}):"
+                        f" status {case_status_change.old_status}"
+                        f" -> {case_status_change.new_status},"
+                        f" QA status {case_status_change.old_qa_status}"
+                        f" -> {case_status_change.new_qa_status}"
+                    )
+            else:
+                save_case_status_changes(case_status_changes)
+            cases_processed += len(chunk)
+            number_of_changes += len(case_status_changes)
+            self.stdout.write(
+                f"Processed {cases_processed} of {total_cases} cases,"
+                f" {number_of_changes} changed"
+            )
+
+        if dry_run:
+            self.stdout.write(f"Dry run: {number_of_changes} cases would change")
+        elif number_of_changes:
+            invalidate_number_of_tasks()
@@ -11,6 +11,8 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 from django.urls import reverse
 from django.utils import timezone
@@ -571,7 +573,7 @@ class Case(VersionModel):
 
     def calulate_qa_status(self) -> str:
         if (
-            self.reviewer is None
+            self.reviewer_id is None
             and self.report_review_status == Boolean.YES
             and self.report_approved_status != Case.ReportApprovedStatus.APPROVED
         ):
@@ -1004,12 +1006,14 @@ class Case(VersionModel):
 
     @property
     def report_number_of_visits(self):
-        return self.reportvisitsmetrics_set.all().count()
+        return self.reportvisitsdaily_set.aggregate(
+            number_of_visits=Coalesce(Sum("number_of_visits"), 0)
+        )["number_of_visits"]
 
     @property
     def report_number_of_unique_visitors(self):
         return (
-            self.reportvisitsmetrics_set.values_list("fingerprint_hash")
+            self.reportvisitsdaily_set.values_list("fingerprint_hash")
             .distinct()
             .count()
         )
@@ -1180,7 +1184,7 @@ class CaseStatus(models.Model):
 
     case = models.OneToOneField(Case, on_delete=models.PROTECT, related_name="status")
     status = models.CharField(
-        max_length=200, choices=Status.choices, default=Status.UNASSIGNED
+        max_length=200, choices=Status.choices, default=Status.UNASSIGNED, db_index=True
     )
 
     class Meta:
@@ -1197,12 +1201,24 @@ class CaseStatus(models.Model):
         self.status = self.calculate_status()
         self.save()
 
-    def calculate_status(self) -> str:  # noqa: C901
+    def calculate_status(  # noqa: C901
+        self, statement_checks_still_initial: bool | None = None
+    ) -> str:
+        """
+        Calculate status from the case. Callers which have already worked out
+        whether the statement checks are still initial (e.g. when recalculating
+        many statuses at once) can pass that in to avoid querying the audit.
+        """
         try:
             compliance: CaseCompliance = self.case.compliance
         except CaseCompliance.DoesNotExist:
             compliance = None
 
+        def checks_still_initial() -> bool:
+            if statement_checks_still_initial is not None:
+                return statement_checks_still_initial
+            return self.case.statement_checks_still_initial
+
         if self.case.is_deactivated:
             return CaseStatus.Status.DEACTIVATED
         elif (
@@ -1226,19 +1242,19 @@ class CaseStatus(models.Model):
             return CaseStatus.Status.CASE_CLOSED_WAITING_TO_SEND
         elif self.case.no_psb_contact == Boolean.YES:
             return CaseStatus.Status.FINAL_DECISION_DUE
-        elif self.case.auditor is None:
+        elif self.case.auditor_id is None:
             return CaseStatus.Status.UNASSIGNED
         elif (
             compliance is None
             or self.case.compliance.website_compliance_state_initial
             == CaseCompliance.WebsiteCompliance.UNKNOWN
-            or self.case.statement_checks_still_initial
+            or checks_still_initial()
         ):
             return CaseStatus.Status.TEST_IN_PROGRESS
         elif (
             self.case.compliance.website_compliance_state_initial
             != CaseCompliance.WebsiteCompliance.UNKNOWN
-            and not self.case.statement_checks_still_initial
+            and not checks_still_initial()
             and self.case.report_review_status != Boolean.YES
         ):
             return CaseStatus.Status.REPORT_IN_PROGRESS
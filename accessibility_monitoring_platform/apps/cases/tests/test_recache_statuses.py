@@ -1,15 +1,100 @@
 """
 Test for recache_statuses command
 """
+
+from io import StringIO
+
 import pytest
+from django.contrib.auth.models import User
 from django.core.management import call_command
 
-from ..models import Case
+from ..models import Case, CaseStatus
+
+
+def create_case_with_stale_status(auditor: User | None = None) -> Case:
+    """Create case whose saved statuses no longer match its data"""
+    if auditor is None:
+        auditor = User.objects.create()
+    case: Case = Case.objects.create(auditor=auditor)
+    CaseStatus.objects.filter(case=case).update(status=CaseStatus.Status.UNKNOWN)
+    Case.objects.filter(id=case.id).update(qa_status=Case.QAStatus.IN_QA)
+    return Case.objects.get(id=case.id)
 
 
 @pytest.mark.django_db
 def test_recache_statuses_can_be_called():
     """Test recache_statuses can be called"""
     Case.objects.create()
-    call_command("recache_statuses")
+    call_command("recache_statuses", stdout=StringIO())
     assert Case.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_recache_statuses_updates_stale_statuses():
+    """Test recache_statuses saves recalculated statuses without other side effects"""
+    case: Case = create_case_with_stale_status()
+
+    call_command("recache_statuses", stdout=StringIO())
+
+    updated_case: Case = Case.objects.get(id=case.id)
+
+    assert updated_case.status.status == CaseStatus.Status.TEST_IN_PROGRESS
+    assert updated_case.qa_status == Case.QAStatus.UNKNOWN
+    assert updated_case.updated == case.updated
+    assert updated_case.version == case.version
+
+
+@pytest.mark.django_db
+def test_recache_statuses_creates_missing_status():
+    """Test recache_statuses creates status for case which has none"""
+    case: Case = Case.objects.create()
+    CaseStatus.objects.filter(case=case).delete()
+
+    call_command("recache_statuses", stdout=StringIO())
+
+    assert CaseStatus.objects.get(case=case).status == CaseStatus.Status.UNASSIGNED
+
+
+@pytest.mark.django_db
+def test_recache_statuses_dry_run():
+    """Test recache_statuses dry run reports changes without saving them"""
+    case: Case = create_case_with_stale_status()
+    out: StringIO = StringIO()
+
+    call_command("recache_statuses", "--dry-run", stdout=out)
+
+    assert f"(id {case.id}): status unknown -> test-in-progress" in out.getvalue()
+    assert "Dry run: 1 cases would change" in out.getvalue()
+    assert CaseStatus.objects.get(case=case).status == CaseStatus.Status.UNKNOWN
+    assert Case.objects.get(id=case.id).qa_status == Case.QAStatus.IN_QA
+
+
+@pytest.mark.django_db
+def test_recache_statuses_reports_progress_per_chunk():
+    """Test recache_statuses processes cases in chunks and reports progress"""
+    auditor: User = User.objects.create()
+    for _ in range(3):
+        create_case_with_stale_status(auditor=auditor)
+    out: StringIO = StringIO()
+
+    call_command("recache_statuses", "--chunk-size", "2", stdout=out)
+
+    assert "Processed 2 of 3 cases, 2 changed" in out.getvalue()
+    assert "Processed 3 of 3 cases, 3 changed" in out.getvalue()
+    assert (
+        CaseStatus.objects.filter(status=CaseStatus.Status.TEST_IN_PROGRESS).count()
+        == 3
+    )
+
+
+@pytest.mark.django_db
+def test_recache_statuses_query_count_does_not_grow_with_cases(
+    django_assert_max_num_queries,
+):
+    """Test each chunk of cases is recalculated using a fixed number of queries"""
+    auditor: User = User.objects.create()
+    for _ in range(10):
+        create_case_with_stale_status(auditor=auditor)
+
+    with django_assert_max_num_queries(8):
+        call_command("recache_statuses", stdout=StringIO())
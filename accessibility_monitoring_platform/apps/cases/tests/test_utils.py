@@ -5,6 +5,7 @@ Test utility functions of cases app
 import csv
 import io
 from dataclasses import dataclass
+from datetime import date
 from typing import Any
 
 import pytest
@@ -13,16 +14,20 @@ from django.db.models import QuerySet
 from django.http import HttpResponse
 from django.http.request import QueryDict
 
-from ...audits.models import Audit
+from ...audits.models import Audit, StatementCheck, StatementCheckResult
 from ...common.models import Boolean, Sector, SubCategory
-from ..models import Case, CaseCompliance, CaseEvent
+from ..models import Case, CaseCompliance, CaseEvent, CaseStatus
 from ..utils import (
+    annotate_next_action_due_date,
     build_edit_link_html,
+    calculate_case_status_changes,
     create_case_and_compliance,
     filter_cases,
+    get_cases_for_status_calculation,
     get_sent_date,
     record_case_event,
     replace_search_key_with_case_search,
+    save_case_status_changes,
 )
 
 ORGANISATION_NAME: str = "Organisation name one"
@@ -403,3 +408,161 @@ def test_create_case_and_compliance():
 
     assert case.organisation_name == ORGANISATION_NAME
     assert case.compliance.website_compliance_state_12_week == "compliant"
+
+
+@pytest.mark.parametrize(
+    "status, case_fields, expected_date",
+    [
+        (
+            CaseStatus.Status.REPORT_READY_TO_SEND,
+            {"no_contact_one_week_chaser_due_date": date(2024, 1, 8)},
+            date(2024, 1, 8),
+        ),
+        (
+            CaseStatus.Status.REPORT_READY_TO_SEND,
+            {
+                "no_contact_one_week_chaser_due_date": date(2024, 1, 8),
+                "no_contact_one_week_chaser_sent_date": date(2024, 1, 8),
+                "no_contact_four_week_chaser_due_date": date(2024, 1, 29),
+            },
+            date(2024, 1, 29),
+        ),
+        (
+            CaseStatus.Status.REPORT_READY_TO_SEND,
+            {"no_contact_four_week_chaser_sent_date": date(2024, 1, 29)},
+            date(2024, 2, 5),
+        ),
+        (
+            CaseStatus.Status.IN_REPORT_CORES,
+            {"report_followup_week_1_due_date": date(2024, 1, 8)},
+            date(2024, 1, 8),
+        ),
+        (
+            CaseStatus.Status.IN_REPORT_CORES,
+            {
+                "report_followup_week_1_sent_date": date(2024, 1, 8),
+                "report_followup_week_4_due_date": date(2024, 1, 29),
+            },
+            date(2024, 1, 29),
+        ),
+        (
+            CaseStatus.Status.IN_REPORT_CORES,
+            {
+                "report_followup_week_1_sent_date": date(2024, 1, 8),
+                "report_followup_week_4_sent_date": date(2024, 1, 29),
+            },
+            date(2024, 2, 5),
+        ),
+        (
+            CaseStatus.Status.AWAITING_12_WEEK_DEADLINE,
+            {"report_followup_week_12_due_date": date(2024, 3, 25)},
+            date(2024, 3, 25),
+        ),
+        (
+            CaseStatus.Status.IN_12_WEEK_CORES,
+            {"twelve_week_1_week_chaser_due_date": date(2024, 4, 1)},
+            date(2024, 4, 1),
+        ),
+        (
+            CaseStatus.Status.IN_12_WEEK_CORES,
+            {"twelve_week_1_week_chaser_sent_date": date(2024, 4, 1)},
+            date(2024, 4, 8),
+        ),
+        (CaseStatus.Status.TEST_IN_PROGRESS, {}, date(1970, 1, 1)),
+    ],
+)
+@pytest.mark.django_db
+def test_annotate_next_action_due_date(
+    status: str, case_fields: dict[str, date], expected_date: date
+):
+    """Test next action due date calculated in database matches the property"""
+    case: Case = Case.objects.create(**case_fields)
+    CaseStatus.objects.filter(case=case).update(status=status)
+
+    annotated_case: Case = annotate_next_action_due_date(
+        Case.objects.filter(id=case.id).select_related("status")
+    ).first()
+
+    assert annotated_case.annotated_next_action_due_date == expected_date
+    assert annotated_case.next_action_due_date == expected_date
+
+
+@pytest.mark.parametrize(
+    "statement_compliance_state_initial, overview_check_result_state, expected_status",
+    [
+        (CaseCompliance.StatementCompliance.UNKNOWN, None, "test-in-progress"),
+        (CaseCompliance.StatementCompliance.COMPLIANT, None, "report-in-progress"),
+        (
+            CaseCompliance.StatementCompliance.COMPLIANT,
+            StatementCheckResult.Result.NOT_TESTED,
+            "test-in-progress",
+        ),
+        (
+            CaseCompliance.StatementCompliance.UNKNOWN,
+            StatementCheckResult.Result.YES,
+            "report-in-progress",
+        ),
+    ],
+)
+@pytest.mark.django_db
+def test_calculate_case_status_changes_matches_calculate_status(
+    statement_compliance_state_initial: str,
+    overview_check_result_state: str | None,
+    expected_status: str,
+):
+    """Test statuses calculated in bulk match those calculated for one case"""
+    case: Case = create_case_and_compliance(
+        auditor=User.objects.create(),
+        website_compliance_state_initial=CaseCompliance.WebsiteCompliance.COMPLIANT,
+        statement_compliance_state_initial=statement_compliance_state_initial,
+    )
+    if overview_check_result_state is not None:
+        audit: Audit = Audit.objects.create(case=case)
+        StatementCheckResult.objects.create(
+            audit=audit,
+            type=StatementCheck.Type.OVERVIEW,
+            check_result_state=overview_check_result_state,
+        )
+    CaseStatus.objects.filter(case=case).update(status=CaseStatus.Status.UNKNOWN)
+
+    case_status_changes = calculate_case_status_changes(
+        get_cases_for_status_calculation(Case.objects.filter(id=case.id))
+    )
+
+    assert len(case_status_changes) == 1
+    assert case_status_changes[0].old_status == CaseStatus.Status.UNKNOWN
+    assert case_status_changes[0].new_status == expected_status
+    assert Case.objects.get(id=case.id).status.calculate_status() == expected_status
+
+
+@pytest.mark.django_db
+def test_calculate_case_status_changes_ignores_unchanged_cases():
+    """Test cases whose statuses are already up to date are not returned"""
+    Case.objects.create()
+
+    assert (
+        calculate_case_status_changes(
+            get_cases_for_status_calculation(Case.objects.all())
+        )
+        == []
+    )
+
+
+@pytest.mark.django_db
+def test_save_case_status_changes():
+    """Test recalculated statuses and QA statuses are saved in bulk"""
+    case: Case = Case.objects.create(reviewer=User.objects.create())
+    CaseStatus.objects.filter(case=case).update(status=CaseStatus.Status.UNKNOWN)
+    Case.objects.filter(id=case.id).update(qa_status=Case.QAStatus.IN_QA)
+
+    save_case_status_changes(
+        calculate_case_status_changes(
+            get_cases_for_status_calculation(Case.objects.all())
+        )
+    )
+
+    updated_case: Case = Case.objects.get(id=case.id)
+
+    assert updated_case.status.status == CaseStatus.Status.UNASSIGNED
+    assert updated_case.qa_status == Case.QAStatus.UNKNOWN
+    assert updated_case.version == case.version
@@ -3,27 +3,49 @@ Utility functions for cases app
 """
 
 import copy
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
 from functools import partial
 from typing import Any
 
 from django import forms
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.db.models import Case as DjangoCase
-from django.db.models import Q, QuerySet, When
+from django.db.models import (
+    DateField,
+    DateTimeField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
 from django.http.request import QueryDict
-from django.urls import reverse
 
-from ..audits.models import Audit
+from ..audits.models import Audit, StatementCheck, StatementCheckResult
 from ..common.form_extract_utils import (
     FieldLabelAndValue,
     extract_form_labels_and_values,
 )
 from ..common.sitemap import PlatformPage, Sitemap
+from ..common.url_utils import build_url
 from ..common.utils import build_filters
-from .models import COMPLIANCE_FIELDS, Case, CaseEvent, CaseStatus, Complaint, Sort
+from .models import (
+    COMPLIANCE_FIELDS,
+    ONE_WEEK_IN_DAYS,
+    Case,
+    CaseCompliance,
+    CaseEvent,
+    CaseStatus,
+    Complaint,
+    Sort,
+)
 
 CASE_FIELD_AND_FILTER_NAMES: list[tuple[str, str]] = [
     ("auditor", "auditor_id"),
@@ -34,6 +56,18 @@ CASE_FIELD_AND_FILTER_NAMES: list[tuple[str, str]] = [
 ]
 
 
+@dataclass
+class CaseStatusChange:
+    """Recalculated status and QA status of a case which differ from those saved"""
+
+    case: Case
+    case_status: CaseStatus
+    old_status: str | None
+    new_status: str
+    old_qa_status: str
+    new_qa_status: str
+
+
 @dataclass
 class CaseDetailPage:
     page: PlatformPage
@@ -181,6 +215,74 @@ def filter_cases(form) -> QuerySet[Case]:  # noqa: C901
     )
 
 
+def one_week_after(field_name: str) -> Cast:
+    """Return database expression for the date one week after a date field"""
+    return Cast(
+        ExpressionWrapper(
+            F(field_name) + timedelta(days=ONE_WEEK_IN_DAYS),
+            output_field=DateTimeField(),
+        ),
+        output_field=DateField(),
+    )
+
+
+def annotate_next_action_due_date(cases: QuerySet[Case]) -> QuerySet[Case]:
+    """
+    Annotate cases with annotated_next_action_due_date calculated in the
+    database using the same rules as Case.next_action_due_date
+    """
+    return cases.annotate(
+        annotated_next_action_due_date=DjangoCase(
+            When(
+                status__status=CaseStatus.Status.REPORT_READY_TO_SEND,
+                no_contact_one_week_chaser_due_date__isnull=False,
+                no_contact_one_week_chaser_sent_date=None,
+                then=F("no_contact_one_week_chaser_due_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.REPORT_READY_TO_SEND,
+                no_contact_four_week_chaser_due_date__isnull=False,
+                no_contact_four_week_chaser_sent_date=None,
+                then=F("no_contact_four_week_chaser_due_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.REPORT_READY_TO_SEND,
+                no_contact_four_week_chaser_sent_date__isnull=False,
+                then=one_week_after("no_contact_four_week_chaser_sent_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.IN_REPORT_CORES,
+                report_followup_week_1_sent_date=None,
+                then=F("report_followup_week_1_due_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.IN_REPORT_CORES,
+                report_followup_week_4_sent_date=None,
+                then=F("report_followup_week_4_due_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.IN_REPORT_CORES,
+                then=one_week_after("report_followup_week_4_sent_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.AWAITING_12_WEEK_DEADLINE,
+                then=F("report_followup_week_12_due_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.IN_12_WEEK_CORES,
+                twelve_week_1_week_chaser_sent_date=None,
+                then=F("twelve_week_1_week_chaser_due_date"),
+            ),
+            When(
+                status__status=CaseStatus.Status.IN_12_WEEK_CORES,
+                then=one_week_after("twelve_week_1_week_chaser_sent_date"),
+            ),
+            default=Value(date(1970, 1, 1)),
+            output_field=DateField(),
+        )
+    )
+
+
 def replace_search_key_with_case_search(request_get: QueryDict) -> dict[str, str]:
     """Convert QueryDict to dictionary and replace key 'search' with 'case_search'."""
     search_args: dict[str, str] = {key: value for key, value in request_get.items()}
@@ -274,7 +376,7 @@ def record_case_event(user: User, new_case: Case, old_case: Case | None = None)
 def build_edit_link_html(case: Case, url_name: str) -> str:
     """Return html of edit link for case"""
     case_pk: dict[str, int] = {"pk": case.id}
-    edit_url: str = reverse(url_name, kwargs=case_pk)
+    edit_url: str = build_url(url_name, kwargs=case_pk)
     return (
         f"<a href='{edit_url}' class='govuk-link govuk-link--no-visited-state'>Edit</a>"
     )
@@ -295,3 +397,94 @@ def create_case_and_compliance(**kwargs):
         case.compliance.save()
         case.save()
     return case
+
+
+def get_cases_for_status_calculation(cases: QuerySet[Case]) -> QuerySet[Case]:
+    """
+    Return cases with everything CaseStatus.calculate_status needs fetched in
+    the same query; Whether each case has an audit and whether that audit
+    still has untested overview statement checks are annotated.
+    """
+    return (
+        cases.select_related("status", "compliance")
+        .defer("archive")
+        .annotate(
+            has_audit=Exists(Audit.objects.filter(case=OuterRef("pk"))),
+            has_untested_overview_statement_checks=Exists(
+                StatementCheckResult.objects.filter(
+                    audit__case=OuterRef("pk"),
+                    is_deleted=False,
+                    type=StatementCheck.Type.OVERVIEW,
+                    check_result_state=StatementCheckResult.Result.NOT_TESTED,
+                )
+            ),
+        )
+    )
+
+
+def calculate_case_status_changes(cases: Iterable[Case]) -> list[CaseStatusChange]:
+    """
+    Recalculate status and QA status of cases without saving them and return
+    those which have changed. Cases must have been fetched using
+    get_cases_for_status_calculation.
+    """
+    case_status_changes: list[CaseStatusChange] = []
+    for case in cases:
+        try:
+            case_status: CaseStatus = case.status
+            old_status: str | None = case_status.status
+        except CaseStatus.DoesNotExist:
+            case_status = CaseStatus(case=case)
+            old_status = None
+        if case.has_audit:
+            statement_checks_still_initial: bool = (
+                case.has_untested_overview_statement_checks
+            )
+        else:
+            try:
+                statement_checks_still_initial = (
+                    case.compliance.statement_compliance_state_initial
+                    == CaseCompliance.StatementCompliance.UNKNOWN
+                )
+            except CaseCompliance.DoesNotExist:
+                statement_checks_still_initial = True
+        new_status: str = case_status.calculate_status(
+            statement_checks_still_initial=statement_checks_still_initial
+        )
+        new_qa_status: str = case.calulate_qa_status()
+        if new_status != old_status or new_qa_status != case.qa_status:
+            case_status_changes.append(
+                CaseStatusChange(
+                    case=case,
+                    case_status=case_status,
+                    old_status=old_status,
+                    new_status=new_status,
+                    old_qa_status=case.qa_status,
+                    new_qa_status=new_qa_status,
+                )
+            )
+    return case_status_changes
+
+
+def save_case_status_changes(case_status_changes: list[CaseStatusChange]) -> None:
+    """
+    Write recalculated statuses in bulk. Case.save is bypassed so neither the
+    updated timestamps nor the versions of the cases change.
+    """
+    new_case_statuses: list[CaseStatus] = []
+    changed_case_statuses: list[CaseStatus] = []
+    changed_qa_cases: list[Case] = []
+    for case_status_change in case_status_changes:
+        case_status: CaseStatus = case_status_change.case_status
+        case_status.status = case_status_change.new_status
+        if case_status.id is None:
+            new_case_statuses.append(case_status)
+        elif case_status_change.old_status != case_status_change.new_status:
+            changed_case_statuses.append(case_status)
+        if case_status_change.old_qa_status != case_status_change.new_qa_status:
+            case_status_change.case.qa_status = case_status_change.new_qa_status
+            changed_qa_cases.append(case_status_change.case)
+    with transaction.atomic():
+        CaseStatus.objects.bulk_create(new_case_statuses)
+        CaseStatus.objects.bulk_update(changed_case_statuses, ["status"])
+        Case.objects.bulk_update(changed_qa_cases, ["qa_status"])
@@ -6,10 +6,12 @@ from datetime import datetime, timedelta
 from datetime import timezone as datetime_timezone
 
 from django.contrib.humanize.templatetags.humanize import intcomma
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
 from django.db.models.query import QuerySet
 from django.utils import timezone
 
-from ..audits.models import Audit, CheckResult
+from ..audits.models import Audit, CheckResult, StatementCheckResult
 from ..cases.models import Case, CaseCompliance, CaseStatus
 from ..reports.models import ReportVisitsMetrics
 from ..s3_read_write.models import S3Report
@@ -85,26 +87,72 @@ class EqualityBodyCasesMetric:
     in_progress_count: int
 
 
-def count_statement_issues(audits: QuerySet[Audit]) -> tuple[int, int]:
-    """Count numbers of statement errors and how many were fixed"""
-    statement_issues_count: int = 0
-    fixed_statement_issues_count: int = 0
-    for audit in audits:
-        statement_issues_count += audit.failed_statement_check_results.count()
-        fixed_statement_issues_count += audit.fixed_statement_check_results.count()
-    return (fixed_statement_issues_count, statement_issues_count)
+def count_by_filters(queryset: QuerySet, filters: dict[str, Q]) -> dict[str, int]:
+    """
+    Count the rows matching each filter in a single aggregate query against
+    the queryset's table
+    """
+    count_names: dict[str, str] = {
+        label: f"count_{index}" for index, label in enumerate(filters)
+    }
+    counts: dict[str, int] = queryset.aggregate(
+        **{
+            count_names[label]: Count("pk", filter=count_filter)
+            for label, count_filter in filters.items()
+        }
+    )
+    return {label: counts[count_name] for label, count_name in count_names.items()}
 
 
-def group_timeseries_data_by_month(
-    queryset: QuerySet, date_column_name: str, start_date: datetime
-) -> list[TimeseriesDatapoint]:
+def build_thirty_day_metrics(
+    queryset: QuerySet, labels_and_date_column_names: list[tuple[str, str]]
+) -> list[ThirtyDayMetric]:
     """
-    Given a queryset containing a timestamp field return the numbers found
-    in each month.
+    Count rows in the last and previous 30 days for each date column in a
+    single aggregate query
     """
-    items_since_start_date: QuerySet = queryset.filter(
-        **{f"{date_column_name}__gte": start_date}
+    thirty_days_ago: datetime = get_days_ago_timestamp(days=30)
+    sixty_days_ago: datetime = get_days_ago_timestamp(days=60)
+    filters: dict[str, Q] = {}
+    for label, date_column_name in labels_and_date_column_names:
+        filters[f"{label} last 30 days"] = Q(
+            **{f"{date_column_name}__gte": thirty_days_ago}
+        )
+        filters[f"{label} previous 30 days"] = Q(
+            **{
+                f"{date_column_name}__gte": sixty_days_ago,
+                f"{date_column_name}__lt": thirty_days_ago,
+            }
+        )
+    counts: dict[str, int] = count_by_filters(queryset=queryset, filters=filters)
+    return [
+        ThirtyDayMetric(
+            label=label,
+            last_30_day_count=counts[f"{label} last 30 days"],
+            previous_30_day_count=counts[f"{label} previous 30 days"],
+        )
+        for label, _ in labels_and_date_column_names
+    ]
+
+
+def count_statement_issues(audits: QuerySet[Audit]) -> tuple[int, int]:
+    """Count numbers of statement errors and how many were fixed"""
+    counts: dict[str, int] = count_by_filters(
+        queryset=StatementCheckResult.objects.filter(
+            audit__in=audits,
+            is_deleted=False,
+            check_result_state=StatementCheckResult.Result.NO,
+        ),
+        filters={
+            "issues": Q(),
+            "fixed": Q(retest_state=StatementCheckResult.Result.YES),
+        },
     )
+    return (counts["fixed"], counts["issues"])
+
+
+def get_month_start_dates(start_date: datetime) -> list[datetime]:
+    """Return the first of the month for the 13 months from the start date"""
     current_year: int = start_date.year
     current_month: int = start_date.month
     month_dates: list[datetime] = []
@@ -117,18 +165,64 @@ def group_timeseries_data_by_month(
         else:
             current_month = 1
             current_year += 1
-    return [
-        TimeseriesDatapoint(
-            datetime=month_date,
-            value=items_since_start_date.filter(
-                **{
-                    f"{date_column_name}__year": month_date.year,
-                    f"{date_column_name}__month": month_date.month,
-                }
-            ).count(),
+    return month_dates
+
+
+def group_timeseries_by_month(
+    queryset: QuerySet,
+    date_column_name: str,
+    start_date: datetime,
+    filters: dict[str, Q | None],
+) -> dict[str, list[TimeseriesDatapoint]]:
+    """
+    Given a queryset containing a timestamp field return, for each filter,
+    the numbers found in each month. Every filter is counted in a single
+    query grouped by month. Months with nothing found have a value of zero.
+    """
+    count_names: dict[str, str] = {
+        label: f"count_{index}" for index, label in enumerate(filters)
+    }
+    month_counts: dict[tuple[int, int], dict[str, int]] = {
+        (row["month"].year, row["month"].month): row
+        for row in queryset.filter(**{f"{date_column_name}__gte": start_date})
+        .order_by()
+        .annotate(month=TruncMonth(date_column_name))
+        .values("month")
+        .annotate(
+            **{
+                count_names[label]: Count("pk", filter=month_filter)
+                for label, month_filter in filters.items()
+            }
         )
-        for month_date in month_dates
-    ]
+    }
+    month_dates: list[datetime] = get_month_start_dates(start_date=start_date)
+    return {
+        label: [
+            TimeseriesDatapoint(
+                datetime=month_date,
+                value=month_counts.get((month_date.year, month_date.month), {}).get(
+                    count_name, 0
+                ),
+            )
+            for month_date in month_dates
+        ]
+        for label, count_name in count_names.items()
+    }
+
+
+def group_timeseries_data_by_month(
+    queryset: QuerySet, date_column_name: str, start_date: datetime
+) -> list[TimeseriesDatapoint]:
+    """
+    Given a queryset containing a timestamp field return the numbers found
+    in each month.
+    """
+    return group_timeseries_by_month(
+        queryset=queryset,
+        date_column_name=date_column_name,
+        start_date=start_date,
+        filters={"": None},
+    )[""]
 
 
 def build_html_table(
@@ -206,50 +300,15 @@ def convert_timeseries_to_cumulative(timeseries: Timeseries) -> Timeseries:
 
 def get_case_progress_metrics() -> list[ThirtyDayMetric]:
     """Return case progress metrics"""
-    thirty_days_ago: datetime = get_days_ago_timestamp(days=30)
-    sixty_days_ago: datetime = get_days_ago_timestamp(days=60)
-    return [
-        ThirtyDayMetric(
-            label="Cases created",
-            last_30_day_count=Case.objects.filter(created__gte=thirty_days_ago).count(),
-            previous_30_day_count=Case.objects.filter(created__gte=sixty_days_ago)
-            .filter(created__lt=thirty_days_ago)
-            .count(),
-        ),
-        ThirtyDayMetric(
-            label="Tests completed",
-            last_30_day_count=Case.objects.filter(
-                testing_details_complete_date__gte=thirty_days_ago
-            ).count(),
-            previous_30_day_count=Case.objects.filter(
-                testing_details_complete_date__gte=sixty_days_ago
-            )
-            .filter(testing_details_complete_date__lt=thirty_days_ago)
-            .count(),
-        ),
-        ThirtyDayMetric(
-            label="Reports sent",
-            last_30_day_count=Case.objects.filter(
-                report_sent_date__gte=thirty_days_ago
-            ).count(),
-            previous_30_day_count=Case.objects.filter(
-                report_sent_date__gte=sixty_days_ago
-            )
-            .filter(report_sent_date__lt=thirty_days_ago)
-            .count(),
-        ),
-        ThirtyDayMetric(
-            label="Cases closed",
-            last_30_day_count=Case.objects.filter(
-                completed_date__gte=thirty_days_ago
-            ).count(),
-            previous_30_day_count=Case.objects.filter(
-                completed_date__gte=sixty_days_ago
-            )
-            .filter(completed_date__lt=thirty_days_ago)
-            .count(),
-        ),
-    ]
+    return build_thirty_day_metrics(
+        queryset=Case.objects.all(),
+        labels_and_date_column_names=[
+            ("Cases created", "created"),
+            ("Tests completed", "testing_details_complete_date"),
+            ("Reports sent", "report_sent_date"),
+            ("Cases closed", "completed_date"),
+        ],
+    )
 
 
 def get_case_yearly_metrics() -> list[YearlyMetric]:
@@ -282,28 +341,36 @@ def get_case_yearly_metrics() -> list[YearlyMetric]:
 
 def get_policy_total_metrics() -> list[TotalMetric]:
     """Return policy total metrics"""
+    case_counts: dict[str, int] = count_by_filters(
+        queryset=Case.objects.all(),
+        filters={
+            "reports_sent": Q(report_sent_date__isnull=False),
+            "cases_closed": Q(status__status__in=CaseStatus.CLOSED_CASE_STATUSES),
+        },
+    )
+    check_result_counts: dict[str, int] = count_by_filters(
+        queryset=CheckResult.objects.all(),
+        filters={
+            "issues_found": Q(check_result_state=CheckResult.Result.ERROR),
+            "issues_fixed": Q(retest_state=CheckResult.RetestResult.FIXED),
+        },
+    )
     return [
         TotalMetric(
             label="Total reports sent",
-            total=Case.objects.exclude(report_sent_date=None).count(),
+            total=case_counts["reports_sent"],
         ),
         TotalMetric(
             label="Total cases closed",
-            total=Case.objects.filter(
-                status__status__in=CaseStatus.CLOSED_CASE_STATUSES
-            ).count(),
+            total=case_counts["cases_closed"],
         ),
         TotalMetric(
             label="Total number of accessibility issues found",
-            total=CheckResult.objects.filter(
-                check_result_state=CheckResult.Result.ERROR
-            ).count(),
+            total=check_result_counts["issues_found"],
         ),
         TotalMetric(
             label="Total number of accessibility issues fixed",
-            total=CheckResult.objects.filter(
-                retest_state=CheckResult.RetestResult.FIXED
-            ).count(),
+            total=check_result_counts["issues_fixed"],
         ),
     ]
 
@@ -313,29 +380,29 @@ def get_policy_progress_metrics() -> list[ProgressMetric]:
     now: datetime = timezone.now()
     start_date: datetime = now - timedelta(days=90)
     retested_audits: QuerySet[Audit] = Audit.objects.filter(retest_date__gte=start_date)
-    retested_audits_count: int = retested_audits.count()
-    fixed_audits: QuerySet[Audit] = retested_audits.filter(
-        case__recommendation_for_enforcement=Case.RecommendationForEnforcement.NO_FURTHER_ACTION
-    )
-    fixed_audits_count: int = fixed_audits.count()
-    compliant_audits: QuerySet[Audit] = retested_audits.filter(
-        case__compliance__statement_compliance_state_12_week=CaseCompliance.StatementCompliance.COMPLIANT
-    )
-    compliant_audits_count: int = compliant_audits.count()
-    check_results_of_last_90_days: QuerySet[CheckResult] = CheckResult.objects.filter(
-        audit__retest_date__gte=start_date,
-        page__retest_page_missing_date=None,
-        page__is_deleted=False,
-    )
-    fixed_check_results_count: int = (
-        check_results_of_last_90_days.filter(check_result_state="error")
-        .filter(retest_state="fixed")
-        .count()
+    audit_counts: dict[str, int] = count_by_filters(
+        queryset=retested_audits,
+        filters={
+            "retested": Q(),
+            "fixed": Q(
+                case__recommendation_for_enforcement=Case.RecommendationForEnforcement.NO_FURTHER_ACTION
+            ),
+            "compliant": Q(
+                case__compliance__statement_compliance_state_12_week=CaseCompliance.StatementCompliance.COMPLIANT
+            ),
+        },
     )
-    total_check_results_count: int = (
-        check_results_of_last_90_days.filter(check_result_state="error")
-        .exclude(retest_state="not-retested")
-        .count()
+    check_result_counts: dict[str, int] = count_by_filters(
+        queryset=CheckResult.objects.filter(
+            audit__retest_date__gte=start_date,
+            page__retest_page_missing_date=None,
+            page__is_deleted=False,
+            check_result_state="error",
+        ),
+        filters={
+            "fixed": Q(retest_state="fixed"),
+            "total": ~Q(retest_state="not-retested"),
+        },
     )
 
     fixed_statement_issues_count, statement_issues_count = count_statement_issues(
@@ -345,18 +412,18 @@ def get_policy_progress_metrics() -> list[ProgressMetric]:
     return [
         ProgressMetric(
             label="Websites compliant after retest in the last 90 days",
-            partial_count=fixed_audits_count,
-            total_count=retested_audits_count,
+            partial_count=audit_counts["fixed"],
+            total_count=audit_counts["retested"],
         ),
         ProgressMetric(
             label="Statements compliant after retest in the last 90 days",
-            partial_count=compliant_audits_count,
-            total_count=retested_audits_count,
+            partial_count=audit_counts["compliant"],
+            total_count=audit_counts["retested"],
         ),
         ProgressMetric(
             label="Website accessibility issues fixed in the last 90 days",
-            partial_count=fixed_check_results_count,
-            total_count=total_check_results_count,
+            partial_count=check_result_counts["fixed"],
+            total_count=check_result_counts["total"],
         ),
         ProgressMetric(
             label="Statement issues fixed in the last 90 days",
@@ -369,17 +436,17 @@ def get_policy_progress_metrics() -> list[ProgressMetric]:
 def get_equality_body_cases_metric() -> EqualityBodyCasesMetric:
     """Return numbers of cases completed or in progress with equality body"""
     thirteen_month_start_date: datetime = get_first_of_this_month_last_year()
-    last_year_cases: QuerySet[Case] = Case.objects.filter(
-        created__gte=thirteen_month_start_date
+    counts: dict[str, int] = count_by_filters(
+        queryset=Case.objects.filter(created__gte=thirteen_month_start_date),
+        filters={
+            "completed": Q(enforcement_body_pursuing="yes-completed"),
+            "in_progress": Q(enforcement_body_pursuing="yes-in-progress"),
+        },
     )
     return EqualityBodyCasesMetric(
         label="Cases completed with equalities bodies in last year",
-        completed_count=last_year_cases.filter(
-            enforcement_body_pursuing="yes-completed"
-        ).count(),
-        in_progress_count=last_year_cases.filter(
-            enforcement_body_pursuing="yes-in-progress"
-        ).count(),
+        completed_count=counts["completed"],
+        in_progress_count=counts["in_progress"],
     )
 
 
@@ -390,66 +457,46 @@ def get_policy_yearly_metrics() -> list[YearlyMetric]:
     thirteen_month_retested_audits: QuerySet[Audit] = Audit.objects.filter(
         retest_date__gte=thirteen_month_start_date
     )
-    thirteen_month_website_initial_compliant: QuerySet[Audit] = (
-        thirteen_month_retested_audits.filter(
-            case__compliance__website_compliance_state_initial=CaseCompliance.WebsiteCompliance.COMPLIANT
-        )
-    )
-    thirteen_month_statement_initial_compliant: QuerySet[Audit] = (
-        thirteen_month_retested_audits.filter(
-            case__compliance__statement_compliance_state_initial=CaseCompliance.StatementCompliance.COMPLIANT
-        )
-    )
-    thirteen_month_final_no_action: QuerySet[Audit] = (
-        thirteen_month_retested_audits.filter(
-            case__recommendation_for_enforcement=Case.RecommendationForEnforcement.NO_FURTHER_ACTION
-        )
-    )
-    thirteen_month_statement_final_compliant: QuerySet[Audit] = (
-        thirteen_month_retested_audits.filter(
-            case__compliance__statement_compliance_state_12_week=CaseCompliance.StatementCompliance.COMPLIANT
-        )
-    )
-
-    retested_by_month: Timeseries = Timeseries(
-        label="Cases",
-        datapoints=group_timeseries_data_by_month(
+    datapoints_by_label: dict[str, list[TimeseriesDatapoint]] = (
+        group_timeseries_by_month(
             queryset=thirteen_month_retested_audits,
             date_column_name="retest_date",
             start_date=thirteen_month_start_date,
-        ),
+            filters={
+                "Cases": None,
+                "Initially acceptable": Q(
+                    case__compliance__website_compliance_state_initial=CaseCompliance.WebsiteCompliance.COMPLIANT
+                ),
+                "Initially compliant": Q(
+                    case__compliance__statement_compliance_state_initial=CaseCompliance.StatementCompliance.COMPLIANT
+                ),
+                "Finally acceptable": Q(
+                    case__recommendation_for_enforcement=Case.RecommendationForEnforcement.NO_FURTHER_ACTION
+                ),
+                "Finally compliant": Q(
+                    case__compliance__statement_compliance_state_12_week=CaseCompliance.StatementCompliance.COMPLIANT
+                ),
+            },
+        )
+    )
+    retested_by_month: Timeseries = Timeseries(
+        label="Cases", datapoints=datapoints_by_label["Cases"]
     )
     website_initial_compliant_by_month: Timeseries = Timeseries(
         label="Initially acceptable",
-        datapoints=group_timeseries_data_by_month(
-            queryset=thirteen_month_website_initial_compliant,
-            date_column_name="retest_date",
-            start_date=thirteen_month_start_date,
-        ),
+        datapoints=datapoints_by_label["Initially acceptable"],
     )
     statement_initial_compliant_by_month: Timeseries = Timeseries(
         label="Initially compliant",
-        datapoints=group_timeseries_data_by_month(
-            queryset=thirteen_month_statement_initial_compliant,
-            date_column_name="retest_date",
-            start_date=thirteen_month_start_date,
-        ),
+        datapoints=datapoints_by_label["Initially compliant"],
     )
     final_no_action_by_month: Timeseries = Timeseries(
         label="Finally acceptable",
-        datapoints=group_timeseries_data_by_month(
-            queryset=thirteen_month_final_no_action,
-            date_column_name="retest_date",
-            start_date=thirteen_month_start_date,
-        ),
+        datapoints=datapoints_by_label["Finally acceptable"],
     )
     statement_final_compliant_by_month: Timeseries = Timeseries(
         label="Finally compliant",
-        datapoints=group_timeseries_data_by_month(
-            queryset=thirteen_month_statement_final_compliant,
-            date_column_name="retest_date",
-            start_date=thirteen_month_start_date,
-        ),
+        datapoints=datapoints_by_label["Finally compliant"],
     )
 
     website_initial_ratio: Timeseries = convert_timeseries_pair_to_ratio(
@@ -507,45 +554,22 @@ def get_policy_yearly_metrics() -> list[YearlyMetric]:
 
 def get_report_progress_metrics() -> list[ThirtyDayMetric]:
     """Return report progress metrics"""
-    thirty_days_ago: datetime = get_days_ago_timestamp(days=30)
-    sixty_days_ago: datetime = get_days_ago_timestamp(days=60)
-
-    return [
-        ThirtyDayMetric(
-            label="Published reports",
-            last_30_day_count=S3Report.objects.filter(created__gte=thirty_days_ago)
-            .filter(latest_published=True)
-            .count(),
-            previous_30_day_count=S3Report.objects.filter(
-                created__gte=sixty_days_ago,
-            )
-            .filter(created__lt=thirty_days_ago)
-            .filter(latest_published=True)
-            .count(),
-        ),
-        ThirtyDayMetric(
-            label="Report views",
-            last_30_day_count=ReportVisitsMetrics.objects.filter(
-                created__gte=thirty_days_ago
-            ).count(),
-            previous_30_day_count=ReportVisitsMetrics.objects.filter(
-                created__gte=sixty_days_ago,
-            )
-            .filter(created__lt=thirty_days_ago)
-            .count(),
-        ),
-        ThirtyDayMetric(
-            label="Reports acknowledged",
-            last_30_day_count=Case.objects.filter(
-                report_acknowledged_date__gte=thirty_days_ago
-            ).count(),
-            previous_30_day_count=Case.objects.filter(
-                report_acknowledged_date__gte=sixty_days_ago,
-            )
-            .filter(report_acknowledged_date__lt=thirty_days_ago)
-            .count(),
-        ),
-    ]
+    return (
+        build_thirty_day_metrics(
+            queryset=S3Report.objects.filter(latest_published=True),
+            labels_and_date_column_names=[("Published reports", "created")],
+        )
+        + build_thirty_day_metrics(
+            queryset=ReportVisitsMetrics.objects.all(),
+            labels_and_date_column_names=[("Report views", "created")],
+        )
+        + build_thirty_day_metrics(
+            queryset=Case.objects.all(),
+            labels_and_date_column_names=[
+                ("Reports acknowledged", "report_acknowledged_date")
+            ],
+        )
+    )
 
 
 def get_report_yearly_metrics() -> list[YearlyMetric]:
@@ -2,13 +2,18 @@
 Models for common data used across project
 """
 
+import os
+import threading
+import time
+from bisect import bisect_right
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
 
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.template import Context, Template
 from django.urls import reverse
 
@@ -21,6 +26,7 @@ Placeholder for platform."""
 MORE_INFORMATION_ABOUT_MONITORING_DEFAULT: str = """# More Information
 
 More information about monitoring placeholder"""
+CATALOGUE_CACHE_TIMEOUT: int = int(os.getenv("CATALOGUE_CACHE_TIMEOUT", "300"))
 
 
 class Boolean(models.TextChoices):
@@ -34,6 +40,74 @@ class Link:
     url: str
 
 
+class DateRangeCatalogue:
+    """
+    In-process cache of the rows of a model with date_start and date_end in
+    effect on a date.
+
+    The start and end dates split time into ranges over which the rows in
+    effect do not change. Rows are cached, as tuples, per range so every date
+    in a range is served from one entry. The cache is cleared whenever a row
+    is saved or deleted and, so changes made by other processes are picked
+    up, after CATALOGUE_CACHE_TIMEOUT seconds.
+    """
+
+    def __init__(self, model: type[models.Model]) -> None:
+        self.model: type[models.Model] = model
+        self.lock: threading.Lock = threading.Lock()
+        self.boundaries: list[date] | None = None
+        self.rows_by_range: dict[int, tuple[models.Model, ...]] = {}
+        self.loaded_at: float = 0
+        post_save.connect(self.clear_on_change, sender=model, weak=False)
+        post_delete.connect(self.clear_on_change, sender=model, weak=False)
+
+    def get_boundaries(self) -> list[date]:
+        """Return first dates of the ranges over which the rows do not change"""
+        boundaries: set[date] = set()
+        for date_start, date_end in self.model.objects.values_list(
+            "date_start", "date_end"
+        ):
+            if date_start is not None:
+                boundaries.add(date_start)
+            if date_end is not None:
+                boundaries.add(date_end + timedelta(days=1))
+        return sorted(boundaries)
+
+    def on_date(self, target_date: date) -> tuple[models.Model, ...]:
+        """Return rows in effect on date"""
+        with self.lock:
+            if time.monotonic() - self.loaded_at > CATALOGUE_CACHE_TIMEOUT:
+                self.boundaries = None
+                self.rows_by_range = {}
+            if self.boundaries is None:
+                self.boundaries = self.get_boundaries()
+                self.loaded_at = time.monotonic()
+            date_range: int = bisect_right(self.boundaries, target_date)
+            rows: tuple[models.Model, ...] | None = self.rows_by_range.get(date_range)
+            if rows is None:
+                rows = tuple(self.model.objects.on_date(target_date))
+                self.rows_by_range[date_range] = rows
+            return rows
+
+    def clear(self) -> None:
+        with self.lock:
+            self.boundaries = None
+            self.rows_by_range = {}
+
+    def clear_on_change(self, **kwargs) -> None:
+        self.clear()
+
+
+date_range_catalogues: dict[type[models.Model], DateRangeCatalogue] = {}
+date_range_catalogues_lock: threading.Lock = threading.Lock()
+
+
+def clear_date_range_catalogues() -> None:
+    """Discard every cached catalogue"""
+    for catalogue in list(date_range_catalogues.values()):
+        catalogue.clear()
+
+
 class StartEndDateManager(models.Manager):
     """Model manager which filters by date"""
 
@@ -45,6 +119,13 @@ class StartEndDateManager(models.Manager):
             .exclude(date_end__lt=target_date)
         )
 
+    def catalogue_on_date(self, target_date: date) -> tuple[models.Model, ...]:
+        """Return rows in effect on date from the in-process catalogue cache"""
+        with date_range_catalogues_lock:
+            if self.model not in date_range_catalogues:
+                date_range_catalogues[self.model] = DateRangeCatalogue(model=self.model)
+        return date_range_catalogues[self.model].on_date(target_date)
+
 
 class Sector(models.Model):
     """
@@ -6,13 +6,14 @@ import copy
 import logging
 from dataclasses import dataclass
 from enum import StrEnum, auto
-from typing import ClassVar
+from typing import Any, ClassVar
 
 from django import forms
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Exists, OuterRef, Prefetch
 from django.http import HttpRequest
-from django.urls import URLResolver, resolve, reverse
+from django.urls import URLResolver, resolve
 
 from ..audits.forms import (
     AuditMetadataUpdateForm,
@@ -20,7 +21,7 @@ from ..audits.forms import (
     InitialDisproportionateBurdenUpdateForm,
     TwelveWeekDisproportionateBurdenUpdateForm,
 )
-from ..audits.models import Audit, Page, Retest, RetestPage
+from ..audits.models import Audit, CheckResult, Page, Retest, RetestPage
 from ..cases.forms import (
     CaseCloseUpdateForm,
     CaseEnforcementRecommendationUpdateForm,
@@ -46,14 +47,62 @@ from ..cases.forms import (
 )
 from ..cases.models import Case, Contact, EqualityBodyCorrespondence, ZendeskTicket
 from ..comments.models import Comment
-from ..exports.models import Export
+from ..exports.models import Export, ExportJob
 from ..notifications.models import Task
 from ..reports.models import Report
 from .models import EmailTemplate
+from .url_utils import build_url
 
 logger = logging.getLogger(__name__)
 
 
+class CaseNavigationSnapshot:
+    """
+    Rows used to build the case navigation fetched in a fixed number of
+    queries; Each show and complete flag is evaluated at most once per
+    instance and then read from the snapshot.
+    """
+
+    def __init__(self, case: Case):
+        self.case: Case = case
+        self.audit: Audit | None = case.audit
+        self.report: Report | None = case.report
+        self.contacts: list[Contact] = list(case.contacts)
+        self.qa_comments: list[Comment] = list(case.qa_comments)
+        self.testable_pages: list[Page] = []
+        if self.audit is not None:
+            self.testable_pages = list(
+                self.audit.testable_pages.annotate(
+                    has_failed_check_results=Exists(
+                        CheckResult.objects.filter(
+                            page=OuterRef("pk"),
+                            is_deleted=False,
+                            check_result_state=CheckResult.Result.ERROR,
+                        )
+                    )
+                )
+            )
+        self.retests: list[Retest] = list(
+            case.retests.filter(id_within_case__gt=0).prefetch_related(
+                Prefetch(
+                    "retestpage_set", queryset=RetestPage.objects.select_related("page")
+                )
+            )
+        )
+        self.flags: dict[tuple[type[models.Model], int, str], Any] = {}
+
+    def get_flag(self, instance: models.Model, flag_name: str) -> Any:
+        """Return value of flag on instance, evaluating it only once"""
+        key: tuple[type[models.Model], int, str] = (
+            type(instance),
+            instance.pk,
+            flag_name,
+        )
+        if key not in self.flags:
+            self.flags[key] = getattr(instance, flag_name)
+        return self.flags[key]
+
+
 def populate_subpages_with_instance(
     platform_page: PlatformPage, instance=models.Model
 ) -> list[PlatformPage]:
@@ -98,6 +147,7 @@ class PlatformPage:
     case_details_template_name: str = ""
     next_page_url_name: str | None = None
     next_page: PlatformPage | None = None
+    snapshot: CaseNavigationSnapshot | None = None
 
     def __init__(
         self,
@@ -149,7 +199,9 @@ class PlatformPage:
         if self.name.startswith("Page not found for "):
             return ""
         if self.instance is not None and self.url_kwarg_key is not None:
-            return reverse(self.url_name, kwargs={self.url_kwarg_key: self.instance.id})
+            return build_url(
+                self.url_name, kwargs={self.url_kwarg_key: self.instance.id}
+            )
         if self.instance_required_for_url and self.instance is None:
             logger.warning(
                 "Expected instance missing; Url cannot be calculated %s %s",
@@ -157,18 +209,43 @@ class PlatformPage:
                 self,
             )
             return ""
-        return reverse(self.url_name)
+        return build_url(self.url_name)
 
     @property
     def show(self):
         if self.instance is not None and self.show_flag_name is not None:
-            return getattr(self.instance, self.show_flag_name)
+            return self.get_flag(self.show_flag_name)
         return True
 
     @property
     def complete(self):
         if self.instance is not None and self.complete_flag_name is not None:
-            return getattr(self.instance, self.complete_flag_name)
+            return self.get_flag(self.complete_flag_name)
+
+    def get_flag(self, flag_name: str) -> Any:
+        """Read flag from instance, or from snapshot if bound to one"""
+        if self.snapshot is not None:
+            return self.snapshot.get_flag(instance=self.instance, flag_name=flag_name)
+        return getattr(self.instance, flag_name)
+
+    def get_snapshot(self, case: Case) -> CaseNavigationSnapshot:
+        """Return snapshot of case the page is bound to, fetching it if needed"""
+        if self.snapshot is None or self.snapshot.case is not case:
+            self.snapshot = CaseNavigationSnapshot(case=case)
+        return self.snapshot
+
+    def bind(self, snapshot: CaseNavigationSnapshot | None = None) -> PlatformPage:
+        """
+        Return copy of page and its subpages onto which per-request state
+        (e.g. instance) can be set while leaving the sitemap unchanged
+        """
+        bound_page: PlatformPage = copy.copy(self)
+        bound_page.snapshot = snapshot
+        if self.subpages is not None:
+            bound_page.subpages = [
+                subpage.bind(snapshot=snapshot) for subpage in self.subpages
+            ]
+        return bound_page
 
     def set_instance(self, instance: models.Model | None):
         if self.instance_class is not None and instance is not None:
@@ -267,7 +344,7 @@ class CaseContactsPlatformPage(CasePlatformPage):
                 bound_subpages: list[PlatformPage] = populate_subpages_with_instance(
                     platform_page=self, instance=case
                 )
-                for contact in case.contacts:
+                for contact in self.get_snapshot(case=case).contacts:
                     bound_subpages += populate_subpages_with_instance(
                         platform_page=self, instance=contact
                     )
@@ -280,7 +357,7 @@ class CaseCommentsPlatformPage(CasePlatformPage):
             self.set_instance(instance=case)
             if self.subpages is not None:
                 bound_subpages: list[PlatformPage] = []
-                for comment in case.qa_comments:
+                for comment in self.get_snapshot(case=case).qa_comments:
                     bound_subpages += populate_subpages_with_instance(
                         platform_page=self, instance=comment
                     )
@@ -312,7 +389,7 @@ class AuditPagesPlatformPage(AuditPlatformPage):
             self.set_instance(instance=case.audit)
             if self.subpages is not None:
                 bound_subpages: list[PlatformPage] = []
-                for page in case.audit.testable_pages:
+                for page in self.get_snapshot(case=case).testable_pages:
                     bound_subpages += populate_subpages_with_instance(
                         platform_page=self, instance=page
                     )
@@ -347,7 +424,7 @@ class CaseEmailTemplatePreviewPlatformPage(PlatformPage):
     def url(self) -> str | None:
         if self.case is None or self.instance is None:
             return ""
-        return reverse(
+        return build_url(
             self.url_name,
             kwargs={"case_id": self.case.id, self.url_kwarg_key: self.instance.id},
         )
@@ -363,8 +440,8 @@ class AuditRetestPagesPlatformPage(AuditPlatformPage):
             self.set_instance(instance=case.audit)
             if self.subpages is not None:
                 bound_subpages: list[PlatformPage] = []
-                for page in case.audit.testable_pages:
-                    if page.failed_check_results.count() > 0:
+                for page in self.get_snapshot(case=case).testable_pages:
+                    if page.has_failed_check_results:
                         bound_subpages += populate_subpages_with_instance(
                             platform_page=self, instance=page
                         )
@@ -389,11 +466,10 @@ class RetestOverviewPlatformPage(CasePlatformPage):
         self.set_instance(instance=case)
         if self.subpages is not None:
             bound_subpages: list[PlatformPage] = []
-            for retest in case.retests:
-                if retest.id_within_case > 0:
-                    bound_subpages += populate_subpages_with_instance(
-                        platform_page=self, instance=retest
-                    )
+            for retest in self.get_snapshot(case=case).retests:
+                bound_subpages += populate_subpages_with_instance(
+                    platform_page=self, instance=retest
+                )
             self.subpages = bound_subpages
 
 
@@ -418,11 +494,20 @@ class PlatformPageGroup:
     type: Type = Type.DEFAULT
     show_flag_name: str | None = None
     pages: list[PlatformPage] | None = None
+    snapshot: ClassVar[CaseNavigationSnapshot | None] = None
 
     @property
     def show(self):
         return True
 
+    def bind(self, snapshot: CaseNavigationSnapshot | None = None) -> PlatformPageGroup:
+        """Return copy of group and its pages for per-request population"""
+        bound_group: PlatformPageGroup = copy.copy(self)
+        bound_group.snapshot = snapshot
+        if self.pages is not None:
+            bound_group.pages = [page.bind(snapshot=snapshot) for page in self.pages]
+        return bound_group
+
     def populate_from_case(self, case: Case):
         for page in self.pages:
             page.populate_from_case(case=case)
@@ -487,6 +572,10 @@ class CasePlatformPageGroup(PlatformPageGroup):
     @property
     def show(self):
         if self.case is not None and self.show_flag_name is not None:
+            if self.snapshot is not None:
+                return self.snapshot.get_flag(
+                    instance=self.case, flag_name=self.show_flag_name
+                )
             return getattr(self.case, self.show_flag_name)
         return True
 
@@ -1266,6 +1355,12 @@ SITE_MAP: list[PlatformPageGroup] = [
                 instance_required_for_url=True,
                 instance_class=Export,
             ),
+            PlatformPage(
+                name="{instance}",
+                url_name="exports:export-job-detail",
+                instance_required_for_url=True,
+                instance_class=ExportJob,
+            ),
         ],
     ),
     # Settings
@@ -1416,6 +1511,11 @@ def build_sitemap_by_url_name(
 SITEMAP_BY_URL_NAME: dict[str, PlatformPage] = build_sitemap_by_url_name(
     site_map=SITE_MAP
 )
+CASE_NAVIGATION: tuple[PlatformPageGroup, ...] = tuple(
+    platform_page_group
+    for platform_page_group in SITE_MAP
+    if platform_page_group.type == PlatformPageGroup.Type.CASE_NAV
+)
 
 
 def get_requested_platform_page(request: HttpRequest) -> PlatformPage:
@@ -1455,11 +1555,10 @@ def build_sitemap_for_current_page(
             url_name=current_platform_page.next_page_url_name, instance=case
         )
     if case is not None:
-        site_map = copy.deepcopy(SITE_MAP)
+        snapshot: CaseNavigationSnapshot = CaseNavigationSnapshot(case=case)
         case_navigation: list[PlatformPageGroup] = [
-            platform_page_group
-            for platform_page_group in site_map
-            if platform_page_group.type == PlatformPageGroup.Type.CASE_NAV
+            platform_page_group.bind(snapshot=snapshot)
+            for platform_page_group in CASE_NAVIGATION
         ]
         for platform_page_group in case_navigation:
             platform_page_group.populate_from_case(case=case)
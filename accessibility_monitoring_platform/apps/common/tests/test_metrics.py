@@ -6,6 +6,7 @@ from datetime import date, datetime, timezone
 from unittest.mock import patch
 
 import pytest
+from django.db.models import Q
 
 from ...audits.models import (
     Audit,
@@ -31,6 +32,7 @@ from ..metrics import (
     build_html_table,
     convert_timeseries_pair_to_ratio,
     convert_timeseries_to_cumulative,
+    count_by_filters,
     count_statement_issues,
     get_case_progress_metrics,
     get_case_yearly_metrics,
@@ -40,6 +42,7 @@ from ..metrics import (
     get_policy_yearly_metrics,
     get_report_progress_metrics,
     get_report_yearly_metrics,
+    group_timeseries_by_month,
     group_timeseries_data_by_month,
 )
 
@@ -130,6 +133,26 @@ def test_count_statement_issues(
     )
 
 
+@pytest.mark.django_db
+def test_count_by_filters(django_assert_num_queries):
+    """Test counts for several filters are made in a single query"""
+    Case.objects.create(organisation_name="A")
+    Case.objects.create(organisation_name="A")
+    Case.objects.create(organisation_name="B")
+
+    with django_assert_num_queries(1):
+        counts: dict[str, int] = count_by_filters(
+            queryset=Case.objects.all(),
+            filters={
+                "all": Q(),
+                "a": Q(organisation_name="A"),
+                "c": Q(organisation_name="C"),
+            },
+        )
+
+    assert counts == {"all": 3, "a": 2, "c": 0}
+
+
 @pytest.mark.django_db
 def test_group_timeseries_data_by_month():
     """
@@ -190,6 +213,68 @@ def test_group_timeseries_data_by_month():
     ]
 
 
+@pytest.mark.django_db
+def test_group_timeseries_by_month(django_assert_num_queries):
+    """
+    Test counting objects matching several filters and grouping them by
+    month in a single query
+    """
+    Case.objects.create(
+        case_details_complete_date=date(2022, 1, 1), organisation_name="A"
+    )
+    Case.objects.create(
+        case_details_complete_date=date(2022, 1, 2), organisation_name="B"
+    )
+    Case.objects.create(
+        case_details_complete_date=date(2022, 3, 3), organisation_name="A"
+    )
+    Case.objects.create(
+        case_details_complete_date=date(2021, 12, 31), organisation_name="A"
+    )
+
+    with django_assert_num_queries(1):
+        datapoints_by_label: dict[str, list[TimeseriesDatapoint]] = (
+            group_timeseries_by_month(
+                queryset=Case.objects,
+                date_column_name="case_details_complete_date",
+                start_date=datetime(2022, 1, 1),
+                filters={"All": None, "A": Q(organisation_name="A")},
+            )
+        )
+
+    assert list(datapoints_by_label.keys()) == ["All", "A"]
+    assert [datapoint.value for datapoint in datapoints_by_label["All"]] == [
+        2,
+        0,
+        1,
+    ] + [0] * 10
+    assert [datapoint.value for datapoint in datapoints_by_label["A"]] == [
+        1,
+        0,
+        1,
+    ] + [0] * 10
+    assert datapoints_by_label["A"][2].datetime == datetime(
+        2022, 3, 1, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.parametrize(
+    "yearly_metrics_function, expected_number_of_queries",
+    [
+        (get_case_yearly_metrics, 4),
+        (get_policy_yearly_metrics, 1),
+        (get_report_yearly_metrics, 2),
+    ],
+)
+@pytest.mark.django_db
+def test_yearly_metrics_number_of_queries(
+    yearly_metrics_function, expected_number_of_queries, django_assert_num_queries
+):
+    """Test yearly metrics are counted with one query per date column"""
+    with django_assert_num_queries(expected_number_of_queries):
+        yearly_metrics_function()
+
+
 @pytest.mark.parametrize(
     "columns, expected_result",
     [
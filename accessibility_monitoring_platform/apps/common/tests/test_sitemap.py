@@ -2,7 +2,9 @@
 Test utility functions of cases app
 """
 
+import copy
 from datetime import date
+from unittest.mock import patch
 
 import pytest
 from django.contrib.auth.models import User
@@ -25,6 +27,7 @@ from ...exports.models import Export
 from ...notifications.models import Task
 from ...reports.models import Report
 from ..sitemap import (
+    CASE_NAVIGATION,
     SITE_MAP,
     SITEMAP_BY_URL_NAME,
     AuditPagesPlatformPage,
@@ -32,6 +35,7 @@ from ..sitemap import (
     AuditRetestPagesPlatformPage,
     CaseCommentsPlatformPage,
     CaseContactsPlatformPage,
+    CaseNavigationSnapshot,
     CasePlatformPage,
     EqualityBodyRetestPagesPlatformPage,
     EqualityBodyRetestPlatformPage,
@@ -800,6 +804,176 @@ def test_build_sitemap_for_case_related_current_page():
     assert platform_page.get_case() == case
 
 
+@pytest.mark.django_db
+def test_build_sitemap_for_case_leaves_case_navigation_unchanged():
+    """Test populating the case navigation for a case does not alter the sitemap"""
+    case: Case = Case.objects.create()
+    audit: Audit = Audit.objects.create(case=case)
+    Page.objects.create(audit=audit)
+    platform_page: PlatformPage = PlatformPage(
+        name="Test", url_name="cases:case-metadata", instance_class=Case, instance=case
+    )
+
+    platform_page_groups: list[PlatformPageGroup] = build_sitemap_for_current_page(
+        current_platform_page=platform_page
+    )
+
+    assert len(platform_page_groups) == len(CASE_NAVIGATION)
+    for bound_group, template_group in zip(platform_page_groups, CASE_NAVIGATION):
+        assert bound_group is not template_group
+        assert bound_group.case == case
+        assert template_group.case is None
+        for bound_page, template_page in zip(bound_group.pages, template_group.pages):
+            assert bound_page is not template_page
+            assert template_page.instance is None
+
+    add_pages_page: PlatformPage = SITEMAP_BY_URL_NAME["audits:edit-audit-pages"]
+
+    assert len(add_pages_page.subpages) == 1
+    assert add_pages_page.subpages[0].instance is None
+
+
+@pytest.mark.parametrize("number_of_pages", [1, 8])
+@pytest.mark.django_db
+def test_case_navigation_uses_fixed_number_of_queries(
+    number_of_pages, django_assert_max_num_queries
+):
+    """
+    Test building the case navigation and reading its flags and counts uses
+    the same number of queries however many pages and retest pages there are
+    """
+    case: Case = Case.objects.create(auditor=User.objects.create())
+    audit: Audit = Audit.objects.create(case=case, retest_date=FIRST_SEPTEMBER_2024)
+    wcag_definition: WcagDefinition = WcagDefinition.objects.create()
+    for count in range(number_of_pages):
+        page: Page = Page.objects.create(
+            audit=audit, url=f"https://example.com/{count}"
+        )
+        CheckResult.objects.create(
+            audit=audit,
+            page=page,
+            wcag_definition=wcag_definition,
+            check_result_state=CheckResult.Result.ERROR,
+        )
+    for id_within_case in [1, 2]:
+        retest: Retest = Retest.objects.create(case=case, id_within_case=id_within_case)
+        for page in audit.testable_pages:
+            RetestPage.objects.create(retest=retest, page=page)
+    case = Case.objects.get(id=case.id)
+    current_platform_page: PlatformPage = PlatformPage(
+        name="Test", url_name="cases:case-detail", instance_class=Case, instance=case
+    )
+
+    with django_assert_max_num_queries(9):
+        platform_page_groups: list[PlatformPageGroup] = build_sitemap_for_current_page(
+            current_platform_page=current_platform_page
+        )
+        for platform_page_group in platform_page_groups:
+            platform_page_group.number_complete()
+            platform_page_group.number_pages_and_subpages()
+            for platform_page in platform_page_group.pages:
+                platform_page.show
+                for subpage in platform_page.subpages or []:
+                    subpage.show
+                    subpage.complete
+                    subpage.get_name()
+
+    retest_pages_page: PlatformPage = [
+        platform_page
+        for platform_page_group in platform_page_groups
+        for platform_page in platform_page_group.pages
+        if platform_page.url_name == "audits:edit-audit-retest-pages"
+    ][0]
+
+    assert len(retest_pages_page.subpages) == number_of_pages
+
+
+@pytest.mark.django_db
+def test_case_navigation_snapshot_get_flag():
+    """Test flags are read from instance once and then from the snapshot"""
+    case: Case = Case.objects.create()
+    snapshot: CaseNavigationSnapshot = CaseNavigationSnapshot(case=case)
+
+    assert snapshot.get_flag(instance=case, flag_name="not_archived") is True
+
+    case.archive = "archived"
+
+    assert snapshot.get_flag(instance=case, flag_name="not_archived") is True
+    assert case.not_archived is False
+
+
+def test_platform_page_bind():
+    """Test PlatformPage.bind copies page and subpages"""
+    subpage: PlatformPage = PlatformPage(name="Subpage")
+    platform_page: PlatformPage = PlatformPage(name="Page", subpages=[subpage])
+
+    bound_page: PlatformPage = platform_page.bind()
+
+    assert bound_page is not platform_page
+    assert bound_page.name == "Page"
+    assert bound_page.subpages is not platform_page.subpages
+    assert bound_page.subpages[0] is not subpage
+    assert bound_page.subpages[0].name == "Subpage"
+
+
+def describe_platform_pages(platform_pages: list[PlatformPage] | None) -> list:
+    """Return nested list of page types, names and url names"""
+    if platform_pages is None:
+        return []
+    return [
+        (
+            type(platform_page),
+            platform_page.name,
+            platform_page.url_name,
+            describe_platform_pages(platform_pages=platform_page.subpages),
+        )
+        for platform_page in platform_pages
+    ]
+
+
+def test_platform_page_group_bind_matches_case_navigation():
+    """Test binding case navigation copies its structure without deepcopy"""
+    with patch("copy.deepcopy", wraps=copy.deepcopy) as mock_deepcopy:
+        bound_groups: list[PlatformPageGroup] = [
+            platform_page_group.bind() for platform_page_group in CASE_NAVIGATION
+        ]
+
+    mock_deepcopy.assert_not_called()
+
+    assert len(bound_groups) == len(CASE_NAVIGATION)
+    for bound_group, template_group in zip(bound_groups, CASE_NAVIGATION):
+        assert bound_group is not template_group
+        assert bound_group.name == template_group.name
+        assert bound_group.type == template_group.type
+        assert describe_platform_pages(
+            platform_pages=bound_group.pages
+        ) == describe_platform_pages(platform_pages=template_group.pages)
+        for bound_page, template_page in zip(bound_group.pages, template_group.pages):
+            assert bound_page is not template_page
+            assert (
+                bound_page.case_details_form_class
+                is template_page.case_details_form_class
+            )
+
+
+@pytest.mark.django_db
+def test_build_sitemap_for_case_does_not_deepcopy_sitemap():
+    """Test case navigation is built without deep-copying sitemap pages"""
+    case: Case = Case.objects.create()
+    audit: Audit = Audit.objects.create(case=case)
+    Page.objects.create(audit=audit)
+    platform_page: PlatformPage = PlatformPage(
+        name="Test", url_name="cases:case-metadata", instance_class=Case, instance=case
+    )
+
+    with patch("copy.deepcopy", wraps=copy.deepcopy) as mock_deepcopy:
+        build_sitemap_for_current_page(current_platform_page=platform_page)
+
+    for call in mock_deepcopy.call_args_list:
+        assert call.args[0] is not SITE_MAP
+        assert not isinstance(call.args[0], (PlatformPage, PlatformPageGroup))
+
+
 def test_non_case_sitemap(rf):
     """Test non-Case sitemap creation"""
     request: HttpRequest = rf.get("/")
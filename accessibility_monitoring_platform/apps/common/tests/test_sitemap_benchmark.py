@@ -0,0 +1,117 @@
+"""
+Benchmark of building the case navigation sitemap
+
+Compares the per-request cost of deep-copying the whole sitemap with binding
+copies of the precompiled case navigation. Run with -s to see the figures.
+"""
+
+import copy
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import pytest
+from django.contrib.auth.models import User
+
+from ...audits.models import Audit, Page, Retest, RetestPage
+from ...cases.models import Case, Contact
+from ..sitemap import (
+    CASE_NAVIGATION,
+    SITE_MAP,
+    PlatformPage,
+    PlatformPageGroup,
+    build_sitemap_for_current_page,
+)
+
+NUMBER_OF_PAGES: int = 20
+NUMBER_OF_RETESTS: int = 3
+NUMBER_OF_ITERATIONS: int = 20
+
+
+def deep_copy_case_navigation() -> list[PlatformPageGroup]:
+    """Previous implementation: Copy entire sitemap to get case navigation"""
+    site_map: list[PlatformPageGroup] = copy.deepcopy(SITE_MAP)
+    return [
+        platform_page_group
+        for platform_page_group in site_map
+        if platform_page_group.type == PlatformPageGroup.Type.CASE_NAV
+    ]
+
+
+def bind_case_navigation() -> list[PlatformPageGroup]:
+    """Current implementation: Bind copies of precompiled case navigation"""
+    return [platform_page_group.bind() for platform_page_group in CASE_NAVIGATION]
+
+
+def measure(function: Callable) -> tuple[int, float]:
+    """Return peak memory allocated in bytes and wall time in seconds"""
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    for _ in range(NUMBER_OF_ITERATIONS):
+        function()
+    elapsed: float = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+@pytest.fixture
+def case_with_many_pages_and_retests() -> Case:
+    """Create case with audit, many pages, contacts and retests"""
+    case: Case = Case.objects.create(auditor=User.objects.create())
+    audit: Audit = Audit.objects.create(case=case)
+    pages: list[Page] = [
+        Page.objects.create(audit=audit, url=f"https://example.com/{count}")
+        for count in range(NUMBER_OF_PAGES)
+    ]
+    Contact.objects.create(case=case)
+    for retest_number in range(1, NUMBER_OF_RETESTS + 1):
+        retest: Retest = Retest.objects.create(case=case, id_within_case=retest_number)
+        for page in pages:
+            RetestPage.objects.create(retest=retest, page=page)
+    return case
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark_case_navigation_structure():
+    """Report cost of binding case navigation and of deep-copying sitemap"""
+    deep_copy_peak, deep_copy_time = measure(deep_copy_case_navigation)
+    bind_peak, bind_time = measure(bind_case_navigation)
+
+    print(
+        f"\nCase navigation x{NUMBER_OF_ITERATIONS}:"
+        f" deepcopy {deep_copy_peak} bytes {deep_copy_time:.4f}s,"
+        f" bind {bind_peak} bytes {bind_time:.4f}s"
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark_build_sitemap_for_case(case_with_many_pages_and_retests):
+    """Report cost of building case navigation for case with many pages"""
+    current_platform_page: PlatformPage = PlatformPage(
+        name="Test",
+        url_name="cases:case-metadata",
+        instance_class=Case,
+        instance=case_with_many_pages_and_retests,
+    )
+
+    def build_with_deep_copy():
+        for platform_page_group in deep_copy_case_navigation():
+            platform_page_group.populate_from_case(
+                case=case_with_many_pages_and_retests
+            )
+
+    def build_with_bind():
+        build_sitemap_for_current_page(current_platform_page=current_platform_page)
+
+    deep_copy_peak, deep_copy_time = measure(build_with_deep_copy)
+    bind_peak, bind_time = measure(build_with_bind)
+
+    print(
+        f"\nCase sitemap with {NUMBER_OF_PAGES} pages and {NUMBER_OF_RETESTS} retests"
+        f" x{NUMBER_OF_ITERATIONS}:"
+        f" deepcopy {deep_copy_peak} bytes {deep_copy_time:.4f}s,"
+        f" bind {bind_peak} bytes {bind_time:.4f}s"
+    )
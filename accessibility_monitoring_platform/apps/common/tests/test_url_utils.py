@@ -0,0 +1,57 @@
+"""
+Test url utility functions
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.urls import NoReverseMatch, reverse
+
+from ..url_utils import build_url, compile_url
+
+
+@pytest.mark.parametrize(
+    "url_name, kwargs",
+    [
+        ("dashboard:home", None),
+        ("cases:edit-case-metadata", {"pk": 7}),
+        ("audits:edit-audit-page-checks", {"pk": 12345}),
+        ("cases:email-template-preview", {"case_id": 3, "pk": 21}),
+        ("cases:email-template-preview", {"pk": 21, "case_id": 3}),
+    ],
+)
+def test_build_url_matches_reverse(url_name, kwargs):
+    """Test build_url returns the same url as reverse"""
+    assert build_url(url_name, kwargs=kwargs) == reverse(url_name, kwargs=kwargs)
+
+
+def test_build_url_reverses_url_name_only_once():
+    """Test url is compiled on first use and reverse not called again"""
+    compile_url.cache_clear()
+
+    with patch(
+        "accessibility_monitoring_platform.apps.common.url_utils.reverse", wraps=reverse
+    ) as mock_reverse:
+        assert (
+            build_url("cases:edit-case-metadata", kwargs={"pk": 1})
+            == "/cases/1/edit-case-metadata/"
+        )
+        assert (
+            build_url("cases:edit-case-metadata", kwargs={"pk": 2})
+            == "/cases/2/edit-case-metadata/"
+        )
+
+    mock_reverse.assert_called_once()
+
+
+def test_build_url_unknown_url_name():
+    """Test unknown url names fall back to reverse and raise the same exception"""
+    with pytest.raises(NoReverseMatch):
+        build_url("cases:no-such-url", kwargs={"pk": 1})
+
+
+def test_build_url_non_id_kwarg():
+    """Test keyword argument values which are not ids fall back to reverse"""
+    assert build_url("cases:edit-case-metadata", kwargs={"pk": "7"}) == reverse(
+        "cases:edit-case-metadata", kwargs={"pk": "7"}
+    )
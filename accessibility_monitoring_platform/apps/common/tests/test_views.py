@@ -937,6 +937,44 @@ def test_report_viewed_yearly_metric(mock_timezone, admin_client):
     )
 
 
+@pytest.mark.parametrize(
+    "url_name, expected_number_of_queries",
+    [
+        ("common:metrics-case", 10),
+        ("common:metrics-policy", 12),
+        ("common:metrics-report", 10),
+    ],
+)
+@pytest.mark.django_db
+def test_metrics_views_number_of_queries(
+    url_name, expected_number_of_queries, admin_client, django_assert_num_queries
+):
+    """Test number of queries used by metrics views does not depend on data"""
+    wcag_definition: WcagDefinition = WcagDefinition.objects.create()
+    for _ in range(3):
+        case: Case = Case.objects.create(report_sent_date=date.today())
+        audit: Audit = Audit.objects.create(case=case, retest_date=date.today())
+        page: Page = Page.objects.create(audit=audit)
+        CheckResult.objects.create(
+            audit=audit,
+            page=page,
+            wcag_definition=wcag_definition,
+            check_result_state=CheckResult.Result.ERROR,
+        )
+        StatementCheckResult.objects.create(
+            audit=audit,
+            check_result_state=StatementCheckResult.Result.NO,
+        )
+        S3Report.objects.create(case=case, version=1, latest_published=True)
+        ReportVisitsMetrics.objects.create(case=case)
+    admin_client.get(reverse(url_name))
+
+    with django_assert_num_queries(expected_number_of_queries):
+        response: HttpResponse = admin_client.get(reverse(url_name))
+
+    assert response.status_code == 200
+
+
 @pytest.mark.django_db
 def test_frequently_used_link_shown(admin_client):
     """Test custom frequently used link is displayed"""
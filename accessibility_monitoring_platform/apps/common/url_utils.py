@@ -0,0 +1,65 @@
+"""
+Build urls from url names without calling reverse on every request
+
+Each url name (with its set of keyword arguments) is reversed once, using
+placeholder ids, and compiled into the literal parts of the path between
+those ids. Subsequent urls are built by joining those parts with the ids.
+Unknown url names, and keyword argument values which are not ids, fall
+back to reverse.
+"""
+
+from functools import lru_cache
+
+from django.urls import NoReverseMatch, get_script_prefix, get_urlconf, reverse
+
+PLACEHOLDER_ID_START: int = 918273645000
+
+
+@lru_cache(maxsize=None)
+def compile_url(
+    url_name: str,
+    kwarg_keys: tuple[str, ...],
+    script_prefix: str,  # pylint: disable=unused-argument
+    urlconf: str | None,  # pylint: disable=unused-argument
+) -> tuple[tuple[str, ...], tuple[str, ...]] | None:
+    """
+    Return the literal parts of the path and the keyword argument keys in the
+    order they appear between those parts, or None if the url cannot be
+    compiled. Script prefix and urlconf are only used as part of the cache key.
+    """
+    placeholders: dict[str, str] = {
+        key: str(PLACEHOLDER_ID_START + position)
+        for position, key in enumerate(kwarg_keys)
+    }
+    try:
+        path: str = reverse(url_name, kwargs=placeholders if kwarg_keys else None)
+    except NoReverseMatch:
+        return None
+    if any(path.count(placeholder) != 1 for placeholder in placeholders.values()):
+        return None
+    keys_in_path_order: list[str] = sorted(
+        kwarg_keys, key=lambda key: path.index(placeholders[key])
+    )
+    url_parts: list[str] = []
+    for key in keys_in_path_order:
+        url_part, path = path.split(placeholders[key])
+        url_parts.append(url_part)
+    url_parts.append(path)
+    return tuple(url_parts), tuple(keys_in_path_order)
+
+
+def build_url(url_name: str, kwargs: dict[str, int] | None = None) -> str:
+    """Return path for url name and ids; Equivalent to reverse"""
+    if kwargs is None:
+        kwargs = {}
+    if all(type(value) is int for value in kwargs.values()):
+        compiled_url: tuple[tuple[str, ...], tuple[str, ...]] | None = compile_url(
+            url_name, tuple(sorted(kwargs)), get_script_prefix(), get_urlconf()
+        )
+        if compiled_url is not None:
+            url_parts, keys_in_path_order = compiled_url
+            url: str = url_parts[0]
+            for key, url_part in zip(keys_in_path_order, url_parts[1:]):
+                url += f"{kwargs[key]}{url_part}"
+            return url
+    return reverse(url_name, kwargs=kwargs if kwargs else None)
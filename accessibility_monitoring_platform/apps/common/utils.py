@@ -193,36 +193,56 @@ def diff_model_fields(
     return diff_fields
 
 
-def record_model_update_event(user: User, model_object: models.Model) -> None:
-    """Record model update event"""
-    old_model = model_object.__class__.objects.get(pk=model_object.id)
-    old_model_fields = copy.copy(vars(old_model))
-    del old_model_fields["_state"]
-    new_model_fields = copy.copy(vars(model_object))
-    del new_model_fields["_state"]
+def get_model_fields(model_object: models.Model) -> dict[str, Any]:
+    """Return copy of the field values of a model instance"""
+    model_fields: dict[str, Any] = copy.copy(vars(model_object))
+    del model_fields["_state"]
+    return model_fields
+
+
+def build_model_update_event(
+    user: User, model_object: models.Model, old_model_fields: dict[str, Any]
+) -> Event | None:
+    """Return unsaved model update event or None if nothing has changed"""
     diff_fields: dict[str, Any] = diff_model_fields(
-        old_fields=old_model_fields, new_fields=new_model_fields
+        old_fields=old_model_fields, new_fields=get_model_fields(model_object)
+    )
+    if not diff_fields:
+        return None
+    return Event(
+        created_by=user,
+        parent=model_object,
+        value=json.dumps(diff_fields, default=str),
     )
-    if diff_fields:
-        Event.objects.create(
-            created_by=user,
-            parent=model_object,
-            value=json.dumps(diff_fields, default=str),
-        )
 
 
-def record_model_create_event(user: User, model_object: models.Model) -> None:
-    """Record model create event"""
-    new_model_fields = copy.copy(vars(model_object))
-    del new_model_fields["_state"]
-    Event.objects.create(
+def build_model_create_event(user: User, model_object: models.Model) -> Event:
+    """Return unsaved model create event"""
+    return Event(
         created_by=user,
         parent=model_object,
         type=Event.Type.CREATE,
-        value=json.dumps(new_model_fields, default=str),
+        value=json.dumps(get_model_fields(model_object), default=str),
     )
 
 
+def record_model_update_event(user: User, model_object: models.Model) -> None:
+    """Record model update event"""
+    old_model = model_object.__class__.objects.get(pk=model_object.id)
+    event: Event | None = build_model_update_event(
+        user=user,
+        model_object=model_object,
+        old_model_fields=get_model_fields(old_model),
+    )
+    if event is not None:
+        event.save()
+
+
+def record_model_create_event(user: User, model_object: models.Model) -> None:
+    """Record model create event"""
+    build_model_create_event(user=user, model_object=model_object).save()
+
+
 def list_to_dictionary_of_lists(items: list, group_by_attr: str) -> dict[Any, list]:
     """
     Group a list of items by an attribute of those items and return a dictionary
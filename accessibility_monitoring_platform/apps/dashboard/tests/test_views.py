@@ -5,6 +5,7 @@ Tests for view - dashboard
 from datetime import date, datetime, timedelta
 
 import pytest
+from django.core.cache import cache
 from django.http import HttpResponse
 from django.urls import reverse
 from pytest_django.asserts import assertContains, assertNotContains
@@ -15,6 +16,7 @@ from ...cases.models import Case, CaseCompliance, CaseStatus
 from ...cases.utils import create_case_and_compliance
 from ...common.models import Boolean
 from ...notifications.models import Task
+from ..utils import DASHBOARD_STATUS_PARAMETERS
 
 
 def test_dashboard_loads_correctly_when_user_logged_in(admin_client):
@@ -380,3 +382,36 @@ def test_dashboard_shows_link_to_reminder_final(admin_client, admin_user):
         response,
         reverse("notifications:edit-reminder-task", kwargs={"pk": task.id}),
     )
+
+
+def test_dashboard_number_of_queries_does_not_grow_with_cases(
+    admin_client, admin_user, django_assert_max_num_queries
+):
+    """Check dashboard queries do not increase with the number of cases"""
+
+    def create_case_for_each_status():
+        for _, status, _ in DASHBOARD_STATUS_PARAMETERS:
+            case: Case = Case.objects.create(auditor=admin_user, reviewer=admin_user)
+            CaseStatus.objects.filter(case=case).update(status=status)
+            Task.objects.create(
+                type=Task.Type.REMINDER, user=admin_user, case=case, date=date.today()
+            )
+        Case.objects.create()
+
+    create_case_for_each_status()
+
+    for view in ["View your cases", "View all cases"]:
+        url: str = f"{reverse('dashboard:home')}?view={view}"
+        cache.clear()
+        with django_assert_max_num_queries(100) as captured:
+            response: HttpResponse = admin_client.get(url)
+        assert response.status_code == 200
+        number_of_queries: int = len(captured)
+
+        for _ in range(5):
+            create_case_for_each_status()
+
+        cache.clear()
+        with django_assert_max_num_queries(number_of_queries):
+            response: HttpResponse = admin_client.get(url)
+        assert response.status_code == 200
@@ -3,119 +3,219 @@ Utility functions used in dashboard
 """
 
 from django.contrib.auth.models import User
+from django.db.models import Count, F, OuterRef, QuerySet, Subquery
 
 from ..cases.models import Case, CaseStatus
+from ..cases.utils import annotate_next_action_due_date
+from ..notifications.models import Task
 
+DASHBOARD_CASES_PER_STATUS: int = 50
+INACTIVE_CASE_STATUSES: list[str] = [
+    CaseStatus.Status.COMPLETE,
+    CaseStatus.Status.CASE_CLOSED_SENT_TO_ENFORCEMENT_BODY,
+    "deleted",
+    CaseStatus.Status.DEACTIVATED,
+]
+DASHBOARD_CASE_FIELDS: list[str] = [
+    "id",
+    "created",
+    "organisation_name",
+    "domain",
+    "auditor",
+    "reviewer",
+    "qa_status",
+    "report_approved_status",
+    "seven_day_no_contact_email_sent_date",
+    "no_contact_one_week_chaser_due_date",
+    "no_contact_one_week_chaser_sent_date",
+    "no_contact_four_week_chaser_due_date",
+    "no_contact_four_week_chaser_sent_date",
+    "report_followup_week_1_due_date",
+    "report_followup_week_1_sent_date",
+    "report_followup_week_4_due_date",
+    "report_followup_week_4_sent_date",
+    "report_followup_week_12_due_date",
+    "twelve_week_update_requested_date",
+    "twelve_week_1_week_chaser_due_date",
+    "twelve_week_1_week_chaser_sent_date",
+    "twelve_week_correspondence_acknowledged_date",
+    "case_close_complete_date",
+    "sent_to_enforcement_body_sent_date",
+    "completed_date",
+    "status__status",
+    "auditor__first_name",
+    "auditor__last_name",
+    "reviewer__first_name",
+    "reviewer__last_name",
+]
+DASHBOARD_COUNT_ONLY_STATUS_KEYS: list[str] = [  # Sections which link to search
+    "case_closed_sent_to_equalities_body",
+    "completed",
+]
+DASHBOARD_STATUS_PARAMETERS: list[tuple[str, str, str]] = (
+    [  # final dict key, status, and sort
+        (
+            "unknown",
+            CaseStatus.Status.UNKNOWN,
+            "id",
+        ),
+        (
+            "test_in_progress",
+            CaseStatus.Status.TEST_IN_PROGRESS,
+            "id",
+        ),
+        (
+            "reports_in_progress",
+            CaseStatus.Status.REPORT_IN_PROGRESS,
+            "id",
+        ),
+        (
+            "report_ready_to_send",
+            CaseStatus.Status.REPORT_READY_TO_SEND,
+            "id",
+        ),
+        (
+            "qa_in_progress",
+            CaseStatus.Status.QA_IN_PROGRESS,
+            "id",
+        ),
+        (
+            "in_report_correspondence",
+            CaseStatus.Status.IN_REPORT_CORES,
+            "annotated_next_action_due_date",
+        ),
+        (
+            "in_probation_period",
+            CaseStatus.Status.AWAITING_12_WEEK_DEADLINE,
+            "annotated_next_action_due_date",
+        ),
+        (
+            "in_12_week_correspondence",
+            CaseStatus.Status.IN_12_WEEK_CORES,
+            "annotated_next_action_due_date",
+        ),
+        (
+            "reviewing_changes",
+            CaseStatus.Status.REVIEWING_CHANGES,
+            "twelve_week_correspondence_acknowledged_date",
+        ),
+        (
+            "final_decision_due",
+            CaseStatus.Status.FINAL_DECISION_DUE,
+            "report_followup_week_12_due_date",
+        ),
+        (
+            "case_closed_waiting_to_be_sent",
+            CaseStatus.Status.CASE_CLOSED_WAITING_TO_SEND,
+            "case_close_complete_date",
+        ),
+        (
+            "case_closed_sent_to_equalities_body",
+            CaseStatus.Status.CASE_CLOSED_SENT_TO_ENFORCEMENT_BODY,
+            "sent_to_enforcement_body_sent_date",
+        ),
+        (
+            "in_correspondence_with_equalities_body",
+            CaseStatus.Status.IN_CORES_WITH_ENFORCEMENT_BODY,
+            "report_followup_week_12_due_date",
+        ),
+        (
+            "completed",
+            CaseStatus.Status.COMPLETE,
+            "completed_date",
+        ),
+    ]
+)
 
-def group_cases_by_status(cases: list[Case]) -> dict[str, list[Case]]:
-    """Group cases by status values; Sort by a specific column"""
-    cases_by_status: dict[str, list[Case]] = {}
 
-    status_parametres: list[tuple[str, str, str]] = (
-        [  # final dict key, status, and sort
-            (
-                "unknown",
-                CaseStatus.Status.UNKNOWN,
-                "id",
-            ),
-            (
-                "test_in_progress",
-                CaseStatus.Status.TEST_IN_PROGRESS,
-                "id",
-            ),
-            (
-                "reports_in_progress",
-                CaseStatus.Status.REPORT_IN_PROGRESS,
-                "id",
-            ),
-            (
-                "report_ready_to_send",
-                CaseStatus.Status.REPORT_READY_TO_SEND,
-                "id",
-            ),
-            (
-                "qa_in_progress",
-                CaseStatus.Status.QA_IN_PROGRESS,
-                "id",
-            ),
-            (
-                "in_report_correspondence",
-                CaseStatus.Status.IN_REPORT_CORES,
-                "next_action_due_date",
-            ),
-            (
-                "in_probation_period",
-                CaseStatus.Status.AWAITING_12_WEEK_DEADLINE,
-                "next_action_due_date",
-            ),
-            (
-                "in_12_week_correspondence",
-                CaseStatus.Status.IN_12_WEEK_CORES,
-                "next_action_due_date",
-            ),
-            (
-                "reviewing_changes",
-                CaseStatus.Status.REVIEWING_CHANGES,
-                "twelve_week_correspondence_acknowledged_date",
-            ),
-            (
-                "final_decision_due",
-                CaseStatus.Status.FINAL_DECISION_DUE,
-                "report_followup_week_12_due_date",
-            ),
-            (
-                "case_closed_waiting_to_be_sent",
-                CaseStatus.Status.CASE_CLOSED_WAITING_TO_SEND,
-                "case_close_complete_date",
-            ),
-            (
-                "case_closed_sent_to_equalities_body",
-                CaseStatus.Status.CASE_CLOSED_SENT_TO_ENFORCEMENT_BODY,
-                "sent_to_enforcement_body_sent_date",
-            ),
-            (
-                "in_correspondence_with_equalities_body",
-                CaseStatus.Status.IN_CORES_WITH_ENFORCEMENT_BODY,
-                "report_followup_week_12_due_date",
-            ),
-            (
-                "completed",
-                CaseStatus.Status.COMPLETE,
-                "completed_date",
-            ),
-        ]
+def get_dashboard_cases(cases: QuerySet[Case]) -> QuerySet[Case]:
+    """Return cases with only the columns used by the dashboard and status joined"""
+    return cases.select_related("status", "auditor", "reviewer").only(
+        *DASHBOARD_CASE_FIELDS
+    )
+
+
+def count_cases_by_status(cases: QuerySet[Case]) -> dict[str, int]:
+    """Count cases for each status value in a single grouped query"""
+    return {
+        row["status__status"]: row["number_of_cases"]
+        for row in cases.order_by()
+        .values("status__status")
+        .annotate(number_of_cases=Count("id"))
+    }
+
+
+def count_active_cases(case_counts_by_status: dict[str, int]) -> int:
+    """Return number of cases which are not complete, closed or deactivated"""
+    return sum(
+        number_of_cases
+        for status, number_of_cases in case_counts_by_status.items()
+        if status not in INACTIVE_CASE_STATUSES
     )
 
-    for status_key, status, field_to_sort_by in status_parametres:
-        cases_by_status[status_key] = sorted(
-            [case for case in cases if case.status.status == status],
-            key=lambda case, sort_key=field_to_sort_by: (
-                getattr(case, sort_key) is None,
-                getattr(case, sort_key),
-            ),
+
+def group_cases_by_status(
+    cases: QuerySet[Case], limit: int = DASHBOARD_CASES_PER_STATUS
+) -> dict[str, list[Case]]:
+    """
+    Group cases by status values; Sort by a specific column (cases without
+    a value last, ties broken by newest first as in Case.Meta.ordering).
+    Each group is capped at limit cases and groups which are only counted on
+    the dashboard are not fetched.
+    """
+    cases_by_status: dict[str, list[Case]] = {}
+    dashboard_cases: QuerySet[Case] = get_dashboard_cases(cases).annotate(
+        unread_reminder_id=Subquery(
+            Task.objects.filter(
+                case=OuterRef("pk"), type=Task.Type.REMINDER, read=False
+            ).values("id")[:1]
         )
+    )
+
+    for status_key, status, field_to_sort_by in DASHBOARD_STATUS_PARAMETERS:
+        if status_key in DASHBOARD_COUNT_ONLY_STATUS_KEYS:
+            continue
+        status_cases: QuerySet[Case] = dashboard_cases.filter(status__status=status)
+        if field_to_sort_by == "id":
+            status_cases = status_cases.order_by("id")
+        else:
+            if field_to_sort_by == "annotated_next_action_due_date":
+                status_cases = annotate_next_action_due_date(status_cases)
+            status_cases = status_cases.order_by(
+                F(field_to_sort_by).asc(nulls_last=True), "-id"
+            )
+        cases_by_status[status_key] = list(status_cases[:limit])
     return cases_by_status
 
 
-def get_all_cases_in_qa(all_cases: list[Case]) -> list[Case]:
+def get_all_cases_in_qa(
+    all_cases: QuerySet[Case], limit: int = DASHBOARD_CASES_PER_STATUS
+) -> list[Case]:
     """Return all cases in QA"""
-    cases_in_qa = sorted(
-        [
-            case
-            for case in all_cases
-            if case.status.status == CaseStatus.Status.QA_IN_PROGRESS
-        ],
-        key=lambda case, sort_key="id": getattr(case, sort_key),
+    return list(
+        get_dashboard_cases(all_cases)
+        .filter(status__status=CaseStatus.Status.QA_IN_PROGRESS)
+        .order_by("id")[:limit]
     )
-    return cases_in_qa
 
 
-def return_cases_requiring_user_review(cases: list[Case], user: User) -> list[Case]:
+def return_cases_requiring_user_review(
+    cases: QuerySet[Case], user: User, limit: int = DASHBOARD_CASES_PER_STATUS
+) -> list[Case]:
     """Find all cases where the user is the reviewer and return those in QA"""
-    cases_requiring_user_review: list[Case] = [
-        case for case in cases if case.reviewer == user and case.qa_status == "in-qa"
-    ]
-    return sorted(  # sort by case ID
-        cases_requiring_user_review,
-        key=lambda case: case.id,  # type: ignore
+    return list(
+        get_dashboard_cases(cases)
+        .filter(reviewer=user, qa_status=Case.QAStatus.IN_QA)
+        .order_by("id")[:limit]
+    )
+
+
+def get_unassigned_cases(
+    all_cases: QuerySet[Case], limit: int = DASHBOARD_CASES_PER_STATUS
+) -> list[Case]:
+    """Return unassigned cases, oldest first"""
+    return list(
+        get_dashboard_cases(all_cases)
+        .filter(status__status=CaseStatus.Status.UNASSIGNED)
+        .order_by("created", "-id")[:limit]
     )
@@ -8,13 +8,20 @@ from datetime import date
 from typing import Any
 
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
 from django.views.generic import TemplateView
 
-from ..cases.models import Case
+from ..cases.models import Case, CaseStatus
 from ..common.utils import checks_if_2fa_is_enabled, get_recent_changes_to_platform
 from .utils import (
+    DASHBOARD_CASES_PER_STATUS,
+    DASHBOARD_COUNT_ONLY_STATUS_KEYS,
+    DASHBOARD_STATUS_PARAMETERS,
+    count_active_cases,
+    count_cases_by_status,
     get_all_cases_in_qa,
+    get_unassigned_cases,
     group_cases_by_status,
     return_cases_requiring_user_review,
 )
@@ -28,55 +35,65 @@ class DashboardView(TemplateView):
     def get_context_data(self, *args, **kwargs) -> dict[str, Any]:
         context: dict[str, Any] = super().get_context_data(*args, **kwargs)
         user: User = get_object_or_404(User, id=self.request.user.id)  # type: ignore
-        all_cases: list[Case] = list(
-            Case.objects.all().select_related("auditor", "reviewer").all()
-        )
+        all_cases: QuerySet[Case] = Case.objects.all()
+        your_cases: QuerySet[Case] = all_cases.filter(auditor=user)
 
         view_url_param: str | None = self.request.GET.get("view")
         show_all_cases = view_url_param == "View all cases"
 
+        all_case_counts: dict[str, int] = count_cases_by_status(cases=all_cases)
+        your_case_counts: dict[str, int] = count_cases_by_status(cases=your_cases)
+
         if show_all_cases:
-            cases: list[Case] = all_cases
+            cases: QuerySet[Case] = all_cases
+            case_counts: dict[str, int] = all_case_counts
         else:
-            cases: list[Case] = [case for case in all_cases if case.auditor == user]
+            cases: QuerySet[Case] = your_cases
+            case_counts: dict[str, int] = your_case_counts
 
         cases_by_status: dict[str, list[Case]] = group_cases_by_status(cases=cases)
+        case_counts_by_status: dict[str, int] = {
+            status_key: case_counts.get(status, 0)
+            for status_key, status, _ in DASHBOARD_STATUS_PARAMETERS
+        }
 
         cases_by_status["requires_your_review"] = return_cases_requiring_user_review(
             cases=all_cases,
             user=user,
         )
 
-        incomplete_cases: list[Case] = [
-            case
-            for case in all_cases
-            if (
-                case.status.status != "complete"
-                and case.status.status != "case-closed-sent-to-equalities-body"
-                and case.status.status != "deleted"
-                and case.status.status != "deactivated"
-            )
-        ]
-        unassigned_cases: list[Case] = sorted(
-            [case for case in all_cases if case.status.status == "unassigned-case"],
-            key=lambda case: (case.created),  # type: ignore
+        cases_by_status["unassigned_cases"] = get_unassigned_cases(all_cases=all_cases)
+        total_unassigned_cases: int = all_case_counts.get(
+            CaseStatus.Status.UNASSIGNED, 0
         )
-        cases_by_status["unassigned_cases"] = unassigned_cases
+        case_counts_by_status["unassigned_cases"] = total_unassigned_cases
 
         context.update(
             {
                 "cases_by_status": cases_by_status,
-                "total_incomplete_cases": len(incomplete_cases),
-                "total_your_active_cases": len(
-                    [case for case in incomplete_cases if case.auditor == user]
+                "case_counts_by_status": case_counts_by_status,
+                "total_incomplete_cases": count_active_cases(
+                    case_counts_by_status=all_case_counts
+                ),
+                "total_your_active_cases": count_active_cases(
+                    case_counts_by_status=your_case_counts
                 ),
-                "total_unassigned_cases": len(unassigned_cases),
+                "total_unassigned_cases": total_unassigned_cases,
                 "today": date.today(),
                 "show_all_cases": show_all_cases,
                 "page_title": "All cases" if show_all_cases else "Your cases",
                 "mfa_disabled": not checks_if_2fa_is_enabled(user=user),
                 "recent_changes_to_platform": get_recent_changes_to_platform(),
                 "all_cases_in_qa": get_all_cases_in_qa(all_cases=all_cases),
+                "total_cases_in_qa": all_case_counts.get(
+                    CaseStatus.Status.QA_IN_PROGRESS, 0
+                ),
+                "cases_per_status_limit": DASHBOARD_CASES_PER_STATUS,
+                "cases_truncated": any(
+                    number_of_cases > DASHBOARD_CASES_PER_STATUS
+                    for status_key, number_of_cases in case_counts_by_status.items()
+                    if status_key not in DASHBOARD_COUNT_ONLY_STATUS_KEYS
+                ),
             }
         )
         return context
@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import Export, ExportCase
+from .models import Export, ExportCase, ExportJob
 
 
 class ExportAdmin(admin.ModelAdmin):
@@ -40,5 +40,24 @@ class ExportCaseAdmin(admin.ModelAdmin):
     show_facets = admin.ShowFacets.ALWAYS
 
 
+class ExportJobAdmin(admin.ModelAdmin):
+    """Django admin configuration for ExportJob model"""
+
+    readonly_fields = ["created", "updated"]
+    search_fields = ["created_by__username", "filename"]
+    list_display = [
+        "__str__",
+        "type",
+        "status",
+        "created_by",
+        "rows_written",
+        "attempts",
+        "created",
+    ]
+    list_filter = ["type", "status", "storage"]
+    show_facets = admin.ShowFacets.ALWAYS
+
+
 admin.site.register(Export, ExportAdmin)
 admin.site.register(ExportCase, ExportCaseAdmin)
+admin.site.register(ExportJob, ExportJobAdmin)
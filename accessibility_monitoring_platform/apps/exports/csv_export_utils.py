@@ -4,17 +4,34 @@ Utility functions for cases app
 
 import copy
 import csv
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Any, Literal
 
-from django.db.models import QuerySet
-from django.http import HttpResponse
-from django.urls import reverse
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import (
+    Count,
+    DateField,
+    Exists,
+    Field,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils.encoding import force_str
+from django.utils.hashable import make_hashable
 
-from ..audits.models import Audit
+from ..audits.models import Audit, CheckResult, StatementCheck, StatementCheckResult
 from ..cases.models import Case, CaseCompliance, CaseStatus, Contact
+from ..common.models import Boolean
+from ..common.url_utils import build_url
 from ..reports.models import Report
+from ..s3_read_write.models import S3Report
 
 
 @dataclass
@@ -48,6 +65,19 @@ class EqualityBodyCSVColumn(CSVColumn):
         )
 
 
+CSVCellFormatter = Callable[[dict], Any]
+CSVCellFormatterCompiler = Callable[[CSVColumn, type, Field | None], CSVCellFormatter]
+
+
+@dataclass(frozen=True)
+class CSVExportPlan:
+    """Column headers and ready-made cell formatters for an export CSV"""
+
+    column_headers: tuple[str, ...]
+    cell_formatters: tuple[CSVCellFormatter, ...]
+
+
+EXPORT_CHUNK_SIZE: int = 500
 CONTACT_DETAILS_COLUMN_HEADER: str = "Contact details"
 ORGANISATION_RESPONDED_COLUMN_HEADER: str = "Organisation responded to report?"
 
@@ -829,7 +859,7 @@ def populate_equality_body_columns(
                 source_instance=source_instance, column=column
             )
         if column.edit_url_name is not None and edit_url_instance is not None:
-            column.edit_url = reverse(
+            column.edit_url = build_url(
                 column.edit_url_name, kwargs={"pk": edit_url_instance.id}
             )
             if column.edit_url_anchor:
@@ -837,93 +867,384 @@ def populate_equality_body_columns(
     return columns
 
 
-def download_equality_body_cases(
-    cases: QuerySet[Case],
-    filename: str = "enforcement_body_cases.csv",
-) -> HttpResponse:
-    """Given a Case queryset, download the data in csv format for equality body"""
-    response: HttpResponse = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f"attachment; filename={filename}"
+class Echo:
+    """Pseudo-buffer for csv.writer which returns each row instead of storing it"""
 
-    writer: Any = csv.writer(response)
-    writer.writerow(
-        [column.column_header for column in EQUALITY_BODY_COLUMNS_FOR_EXPORT]
-    )
+    def write(self, value: str) -> str:
+        return value
 
-    output: list[list[str]] = []
-    for case in cases:
-        case_columns: list[EqualityBodyCSVColumn] = populate_equality_body_columns(
-            case=case
-        )
-        row = [column.formatted_data for column in case_columns]
-        output.append(row)
-    writer.writerows(output)
 
-    return response
+class CaseExportValues:
+    """
+    Case as read by the exports; Values Case derives from its audit, report
+    and contacts are taken from the annotations added by get_cases_for_export
+    """
+
+    def __init__(self, case: Case):
+        self.case: Case = case
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.case, name)
+
+    @property
+    def contacts(self) -> list[Contact]:
+        return self.case.export_contacts
+
+    @property
+    def total_website_issues(self) -> int:
+        if self.case.audit is None:
+            return 0
+        return self.case.export_failed_check_results_count
+
+    @property
+    def total_website_issues_fixed(self) -> int:
+        if self.case.audit is None:
+            return 0
+        return self.case.export_fixed_check_results_count
+
+    @property
+    def total_website_issues_unfixed(self) -> int:
+        if self.total_website_issues == 0:
+            return 0
+        return self.total_website_issues - self.total_website_issues_fixed
+
+    @property
+    def percentage_website_issues_fixed(self) -> int | str:
+        if self.total_website_issues == 0:
+            return "n/a"
+        return int(self.total_website_issues_fixed * 100 / self.total_website_issues)
+
+    @property
+    def csv_export_statement_found_at_12_week_retest(self) -> str:
+        if self.case.audit is None:
+            return "unknown"
+        if self.case.export_statement_missing_at_12_week_retest:
+            return "No"
+        return "Yes"
+
+    @property
+    def published_report_url(self) -> str:
+        if self.case.report and self.case.export_latest_s3_report_guid:
+            return f"{settings.AMP_PROTOCOL}{settings.AMP_VIEWER_DOMAIN}/reports/{self.case.export_latest_s3_report_guid}"
+        return ""
 
 
-def populate_csv_columns(
-    case: Case, column_definitions: list[CSVColumn]
-) -> list[CSVColumn]:
+def count_check_results(check_results: QuerySet[CheckResult]) -> Coalesce:
+    """Annotation counting the check results of each case's audit"""
+    return Coalesce(
+        Subquery(
+            check_results.order_by()
+            .values("audit")
+            .annotate(number_of_check_results=Count("id"))
+            .values("number_of_check_results")
+        ),
+        0,
+    )
+
+
+def get_cases_for_export(cases: QuerySet[Case]) -> QuerySet[Case]:
     """
-    Collect data for a case to export
+    Join, prefetch and annotate everything the exports read from each case
+    so every chunk of cases is exported using a fixed number of queries
     """
-    source_instances: dict = {
+    failed_check_results: QuerySet[CheckResult] = CheckResult.objects.filter(
+        audit=OuterRef("audit_case"),
+        is_deleted=False,
+        check_result_state=CheckResult.Result.ERROR,
+        page__is_deleted=False,
+        page__not_found=Boolean.NO,
+        page__retest_page_missing_date=None,
+        page__is_contact_page=Boolean.NO,
+    )
+    return (
+        cases.select_related(
+            "compliance",
+            "status",
+            "created_by",
+            "auditor",
+            "reviewer",
+            "audit_case",
+            "report_case",
+        )
+        .prefetch_related(
+            Prefetch(
+                "contact_set",
+                queryset=Contact.objects.filter(is_deleted=False),
+                to_attr="export_contacts",
+            )
+        )
+        .annotate(
+            export_failed_check_results_count=count_check_results(failed_check_results),
+            export_fixed_check_results_count=count_check_results(
+                failed_check_results.filter(retest_state=CheckResult.RetestResult.FIXED)
+            ),
+            export_statement_missing_at_12_week_retest=Exists(
+                StatementCheckResult.objects.filter(
+                    audit=OuterRef("audit_case"),
+                    is_deleted=False,
+                    type=StatementCheck.Type.OVERVIEW,
+                ).exclude(retest_state=StatementCheckResult.Result.YES)
+            ),
+            export_latest_s3_report_guid=Subquery(
+                S3Report.objects.filter(case=OuterRef("pk"), latest_published=True)
+                .order_by("-id")
+                .values("guid")[:1]
+            ),
+        )
+    )
+
+
+def get_export_source_instances(case: Case) -> dict:
+    """Return the instances the export columns read their values from"""
+    if hasattr(case, "export_contacts"):
+        contacts: list[Contact] = case.export_contacts
+        case_export_values: Case | CaseExportValues = CaseExportValues(case)
+    else:
+        contacts: list[Contact] = list(case.contacts)
+        case_export_values: Case | CaseExportValues = case
+    return {
         Case: case,
+        CaseExportValues: case_export_values,
+        Audit: case.audit,
         CaseCompliance: case.compliance,
         CaseStatus: case.status,
-        Contact: case.contact_set.filter(is_deleted=False).first(),
+        Report: case.report,
+        Contact: contacts[0] if contacts else None,
     }
-    columns: list[CSVColumn] = copy.deepcopy(column_definitions)
-    for column in columns:
-        source_instance: Case | CaseCompliance | CaseStatus | Contact | None = (
-            source_instances.get(column.source_class)
-        )
-        column.formatted_data = format_model_field(
-            source_instance=source_instance, column=column
+
+
+def compile_contact_details_formatter(
+    column: CSVColumn, source_class: type, field: Field | None
+) -> CSVCellFormatter:
+    """Return formatter listing the details of every contact"""
+
+    def format_cell(source_instances: dict) -> str:
+        return format_contacts(contacts=source_instances[CaseExportValues].contacts)
+
+    return format_cell
+
+
+def compile_yes_no_formatter(
+    column: CSVColumn, source_class: type, field: Field | None
+) -> CSVCellFormatter:
+    """Return formatter showing whether the case value is set as Yes or No"""
+    source_attr: str = column.source_attr
+
+    def format_cell(source_instances: dict) -> str:
+        return "Yes" if getattr(source_instances[Case], source_attr) else "No"
+
+    return format_cell
+
+
+def compile_model_attribute_formatter(
+    column: CSVColumn, source_class: type, field: Field | None
+) -> CSVCellFormatter:
+    """Return formatter for properties and other values which are not fields"""
+
+    def format_cell(source_instances: dict) -> str:
+        return format_model_field(
+            source_instance=source_instances.get(source_class), column=column
         )
-    return columns
 
+    return format_cell
 
-def download_cases(cases: QuerySet[Case], filename: str = "cases.csv") -> HttpResponse:
-    """Given a Case queryset, download the data in csv format"""
-    response: HttpResponse = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f"attachment; filename={filename}"
 
-    writer: Any = csv.writer(response)
-    writer.writerow([column.column_header for column in CASE_COLUMNS_FOR_EXPORT])
+def compile_date_formatter(
+    column: CSVColumn, source_class: type, field: Field | None
+) -> CSVCellFormatter:
+    """Return formatter for date and datetime fields"""
+    source_attr: str = column.source_attr
+
+    def format_cell(source_instances: dict) -> str:
+        source_instance: Any = source_instances.get(source_class)
+        if source_instance is None:
+            return ""
+        value: date | datetime | None = getattr(source_instance, source_attr)
+        return "" if value is None else value.strftime("%d/%m/%Y")
+
+    return format_cell
+
 
-    output: list[list[str]] = []
-    for case in cases:
-        case_columns: list[CSVColumn] = populate_csv_columns(
-            case=case, column_definitions=CASE_COLUMNS_FOR_EXPORT
+def compile_upper_case_formatter(
+    column: CSVColumn, source_class: type, field: Field | None
+) -> CSVCellFormatter:
+    """Return formatter for fields shown in upper case"""
+    source_attr: str = column.source_attr
+
+    def format_cell(source_instances: dict) -> str:
+        source_instance: Any = source_instances.get(source_class)
+        if source_instance is None:
+            return ""
+        return getattr(source_instance, source_attr).upper()
+
+    return format_cell
+
+
+def compile_choice_formatter(
+    column: CSVColumn, source_class: type, field: Field | None
+) -> CSVCellFormatter:
+    """
+    Return formatter for fields with choices; As get_<source_attr>_display
+    but without rebuilding the choices for each cell
+    """
+    source_attr: str = column.source_attr
+    choice_labels: dict[Any, str] = dict(make_hashable(field.flatchoices))
+
+    def format_cell(source_instances: dict) -> str:
+        source_instance: Any = source_instances.get(source_class)
+        if source_instance is None:
+            return ""
+        value: Any = getattr(source_instance, source_attr)
+        return force_str(
+            choice_labels.get(make_hashable(value), value), strings_only=True
         )
-        row = [column.formatted_data for column in case_columns]
-        output.append(row)
-    writer.writerows(output)
 
-    return response
+    return format_cell
 
 
-def download_feedback_survey_cases(
-    cases: QuerySet[Case], filename: str = "feedback_survey_cases.csv"
-) -> HttpResponse:
-    """Given a Case queryset, download the feedback survey data in csv format"""
-    response: HttpResponse = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f"attachment; filename={filename}"
+def compile_value_formatter(
+    column: CSVColumn, source_class: type, field: Field | None
+) -> CSVCellFormatter:
+    """Return formatter for fields exported as they are"""
+    source_attr: str = column.source_attr
+
+    def format_cell(source_instances: dict) -> Any:
+        source_instance: Any = source_instances.get(source_class)
+        if source_instance is None:
+            return ""
+        return getattr(source_instance, source_attr)
+
+    return format_cell
+
+
+CELL_FORMATTER_COMPILERS: dict[str, CSVCellFormatterCompiler] = {
+    "contact_details": compile_contact_details_formatter,
+    "yes_no": compile_yes_no_formatter,
+    "model_attribute": compile_model_attribute_formatter,
+    "date": compile_date_formatter,
+    "upper_case": compile_upper_case_formatter,
+    "choice": compile_choice_formatter,
+    "value": compile_value_formatter,
+}
 
-    writer: Any = csv.writer(response)
-    writer.writerow(
-        [column.column_header for column in FEEDBACK_SURVEY_COLUMNS_FOR_EXPORT]
+
+def get_export_field(source_class: type, source_attr: str) -> Field | None:
+    """Return the model field a column reads, if it reads one"""
+    try:
+        return source_class._meta.get_field(source_attr)
+    except (AttributeError, FieldDoesNotExist):
+        return None
+
+
+def get_cell_formatter_kind(column: CSVColumn, field: Field | None) -> str:
+    """Return which kind of cell formatter a column needs"""
+    if column.column_header == CONTACT_DETAILS_COLUMN_HEADER:
+        return "contact_details"
+    if column.column_header == ORGANISATION_RESPONDED_COLUMN_HEADER:
+        return "yes_no"
+    if field is None or not field.concrete:
+        return "model_attribute"
+    if isinstance(field, DateField):
+        return "date"
+    if column.source_attr == "enforcement_body":
+        return "upper_case"
+    if field.choices:
+        return "choice"
+    return "value"
+
+
+def compile_cell_formatter(column: CSVColumn) -> CSVCellFormatter:
+    """
+    Work out once how a column is read and formatted and return a function
+    which formats its cell given the source instances for a case
+    """
+    source_class: type = column.source_class
+    if source_class is Case and column.source_attr in vars(CaseExportValues):
+        source_class = CaseExportValues
+    field: Field | None = get_export_field(
+        source_class=source_class, source_attr=column.source_attr
     )
+    compile_formatter: CSVCellFormatterCompiler = CELL_FORMATTER_COMPILERS[
+        get_cell_formatter_kind(column=column, field=field)
+    ]
+    return compile_formatter(column, source_class, field)
 
-    output: list[list[str]] = []
-    for case in cases:
-        case_columns: list[CSVColumn] = populate_csv_columns(
-            case=case, column_definitions=FEEDBACK_SURVEY_COLUMNS_FOR_EXPORT
+
+def compile_csv_export_plan(columns: list[CSVColumn]) -> CSVExportPlan:
+    """Resolve the headers and cell formatters for a list of columns"""
+    return CSVExportPlan(
+        column_headers=tuple(column.column_header for column in columns),
+        cell_formatters=tuple(compile_cell_formatter(column) for column in columns),
+    )
+
+
+EQUALITY_BODY_EXPORT_PLAN: CSVExportPlan = compile_csv_export_plan(
+    EQUALITY_BODY_COLUMNS_FOR_EXPORT
+)
+CASE_EXPORT_PLAN: CSVExportPlan = compile_csv_export_plan(CASE_COLUMNS_FOR_EXPORT)
+FEEDBACK_SURVEY_EXPORT_PLAN: CSVExportPlan = compile_csv_export_plan(
+    FEEDBACK_SURVEY_COLUMNS_FOR_EXPORT
+)
+
+
+def iterate_cases_for_export(
+    cases: Iterable[Case], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[Case]:
+    """Iterate over querysets in chunks fetched with their related data"""
+    if isinstance(cases, QuerySet):
+        return get_cases_for_export(cases).iterator(chunk_size=chunk_size)
+    return iter(cases)
+
+
+def stream_csv_rows(
+    cases: Iterable[Case], export_plan: CSVExportPlan, include_header: bool = True
+) -> Iterator[str]:
+    """Yield the export CSV a row at a time"""
+    writer: Any = csv.writer(Echo())
+    cell_formatters: tuple[CSVCellFormatter, ...] = export_plan.cell_formatters
+    if include_header:
+        yield writer.writerow(export_plan.column_headers)
+    for case in iterate_cases_for_export(cases):
+        source_instances: dict = get_export_source_instances(case)
+        yield writer.writerow(
+            [format_cell(source_instances) for format_cell in cell_formatters]
         )
-        row = [column.formatted_data for column in case_columns]
-        output.append(row)
-    writer.writerows(output)
 
+
+def stream_csv_response(
+    cases: Iterable[Case], export_plan: CSVExportPlan, filename: str
+) -> StreamingHttpResponse:
+    """Return response which streams the export CSV for the cases"""
+    response: StreamingHttpResponse = StreamingHttpResponse(
+        stream_csv_rows(cases=cases, export_plan=export_plan), content_type="text/csv"
+    )
+    response["Content-Disposition"] = f"attachment; filename={filename}"
     return response
+
+
+def download_equality_body_cases(
+    cases: QuerySet[Case],
+    filename: str = "enforcement_body_cases.csv",
+) -> StreamingHttpResponse:
+    """Given a Case queryset, download the data in csv format for equality body"""
+    return stream_csv_response(
+        cases=cases, export_plan=EQUALITY_BODY_EXPORT_PLAN, filename=filename
+    )
+
+
+def download_cases(
+    cases: QuerySet[Case], filename: str = "cases.csv"
+) -> StreamingHttpResponse:
+    """Given a Case queryset, download the data in csv format"""
+    return stream_csv_response(
+        cases=cases, export_plan=CASE_EXPORT_PLAN, filename=filename
+    )
+
+
+def download_feedback_survey_cases(
+    cases: QuerySet[Case], filename: str = "feedback_survey_cases.csv"
+) -> StreamingHttpResponse:
+    """Given a Case queryset, download the feedback survey data in csv format"""
+    return stream_csv_response(
+        cases=cases, export_plan=FEEDBACK_SURVEY_EXPORT_PLAN, filename=filename
+    )
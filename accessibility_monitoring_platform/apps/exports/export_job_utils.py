@@ -0,0 +1,266 @@
+"""
+Utilities for rendering CSV exports to storage in a background worker
+
+Each export job is written as numbered chunks of rows, the first of which
+includes the header row. Cases are written in id order. The number of chunks
+and rows written and the id of the last case written are saved after each
+chunk so a failed or interrupted job resumes after the last chunk written.
+A finished export is downloaded by streaming its chunks in order.
+"""
+
+import logging
+from collections.abc import Iterator
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import F, Q, QuerySet
+from django.http import QueryDict
+from django.utils import timezone
+
+from ..cases.forms import CaseSearchForm
+from ..cases.models import Case
+from ..cases.utils import filter_cases, replace_search_key_with_case_search
+from ..s3_read_write.utils import S3_BUCKET, get_s3_client
+from .csv_export_utils import (
+    CASE_EXPORT_PLAN,
+    EQUALITY_BODY_EXPORT_PLAN,
+    EXPORT_CHUNK_SIZE,
+    FEEDBACK_SURVEY_EXPORT_PLAN,
+    CSVExportPlan,
+    get_cases_for_export,
+    stream_csv_rows,
+)
+from .models import Export, ExportCase, ExportJob
+
+logger = logging.getLogger(__name__)
+
+EXPORT_JOB_MAX_ATTEMPTS: int = 3
+EXPORT_JOB_STALE_AFTER: timedelta = timedelta(minutes=10)
+EXPORT_JOB_PLANS: dict[str, CSVExportPlan] = {
+    ExportJob.Type.CASES: CASE_EXPORT_PLAN,
+    ExportJob.Type.FEEDBACK_SURVEY: FEEDBACK_SURVEY_EXPORT_PLAN,
+    ExportJob.Type.EQUALITY_BODY_ALL: EQUALITY_BODY_EXPORT_PLAN,
+    ExportJob.Type.EQUALITY_BODY_READY: EQUALITY_BODY_EXPORT_PLAN,
+}
+
+
+def get_chunk_key(export_job: ExportJob, chunk_number: int) -> str:
+    """Return path of chunk within storage"""
+    return f"export_jobs/{export_job.id}/chunk_{chunk_number:06d}.csv"
+
+
+class LocalExportJobStorage:
+    """Read and write export job chunks on the local filesystem"""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory: Path = (
+            settings.EXPORT_JOB_DIRECTORY if directory is None else directory
+        )
+
+    def write_chunk(self, export_job: ExportJob, chunk_number: int, content: str):
+        path: Path = self.directory / get_chunk_key(export_job, chunk_number)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def read_chunk(self, export_job: ExportJob, chunk_number: int) -> bytes:
+        return (self.directory / get_chunk_key(export_job, chunk_number)).read_bytes()
+
+
+class S3ExportJobStorage:
+    """Read and write export job chunks in the reports S3 bucket"""
+
+    def __init__(self) -> None:
+        self.s3_client = get_s3_client()
+        self.bucket: str = S3_BUCKET
+
+    def write_chunk(self, export_job: ExportJob, chunk_number: int, content: str):
+        self.s3_client.put_object(
+            Body=content.encode("utf-8"),
+            Bucket=self.bucket,
+            Key=get_chunk_key(export_job, chunk_number),
+        )
+
+    def read_chunk(self, export_job: ExportJob, chunk_number: int) -> bytes:
+        return self.s3_client.get_object(
+            Bucket=self.bucket, Key=get_chunk_key(export_job, chunk_number)
+        )["Body"].read()
+
+
+def get_export_job_storage(
+    export_job: ExportJob,
+) -> LocalExportJobStorage | S3ExportJobStorage:
+    """Return storage the export job is written to"""
+    if export_job.storage == ExportJob.Storage.S3:
+        return S3ExportJobStorage()
+    return LocalExportJobStorage()
+
+
+def get_export_job_filename(export_job_type: str, export: Export | None = None) -> str:
+    """Return name of file to download"""
+    if export_job_type == ExportJob.Type.CASES:
+        return "cases.csv"
+    if export_job_type == ExportJob.Type.FEEDBACK_SURVEY:
+        return "feedback_survey_cases.csv"
+    filename: str = f"{export.enforcement_body.upper()}_cases_{export.cutoff_date}.csv"
+    if export_job_type == ExportJob.Type.EQUALITY_BODY_ALL:
+        return f"DRAFT_{filename}"
+    return filename
+
+
+def enqueue_export_job(
+    user: User,
+    export_job_type: str,
+    export: Export | None = None,
+    search_parameters: str = "",
+) -> ExportJob:
+    """Queue export job to be rendered by the worker"""
+    return ExportJob.objects.create(
+        type=export_job_type,
+        storage=settings.EXPORT_JOB_STORAGE,
+        created_by=user,
+        export=export,
+        search_parameters=search_parameters,
+        filename=get_export_job_filename(
+            export_job_type=export_job_type, export=export
+        ),
+        chunk_size=EXPORT_CHUNK_SIZE,
+    )
+
+
+def get_export_job_cases(export_job: ExportJob) -> QuerySet[Case]:
+    """Return cases to export"""
+    if export_job.type in [
+        ExportJob.Type.EQUALITY_BODY_ALL,
+        ExportJob.Type.EQUALITY_BODY_READY,
+    ]:
+        filters: dict[str, Export | str] = {"exportcase__export": export_job.export}
+        if export_job.type == ExportJob.Type.EQUALITY_BODY_READY:
+            filters["exportcase__status"] = ExportCase.Status.READY
+        return Case.objects.filter(**filters)
+    case_search_form: CaseSearchForm = CaseSearchForm(
+        replace_search_key_with_case_search(QueryDict(export_job.search_parameters))
+    )
+    case_search_form.is_valid()
+    return filter_cases(form=case_search_form)
+
+
+def render_export_job_chunk(
+    export_job: ExportJob, storage: LocalExportJobStorage | S3ExportJobStorage
+) -> bool:
+    """
+    Write the next chunk of the export; Return True if it was the last.
+
+    Cases are exported in id order and each chunk starts after the last case
+    id written so chunks neither rescan earlier cases nor skip or repeat cases
+    when cases are added or removed between chunks.
+    """
+    cases: list[Case] = list(
+        get_cases_for_export(
+            get_export_job_cases(export_job).filter(id__gt=export_job.last_case_id)
+        ).order_by("id")[: export_job.chunk_size]
+    )
+    if cases or export_job.chunks_written == 0:
+        storage.write_chunk(
+            export_job=export_job,
+            chunk_number=export_job.chunks_written,
+            content="".join(
+                stream_csv_rows(
+                    cases=cases,
+                    export_plan=EXPORT_JOB_PLANS[export_job.type],
+                    include_header=export_job.chunks_written == 0,
+                )
+            ),
+        )
+        export_job.chunks_written += 1
+        export_job.rows_written += len(cases)
+        if cases:
+            export_job.last_case_id = cases[-1].id
+        export_job.save(
+            update_fields=["chunks_written", "rows_written", "last_case_id", "updated"]
+        )
+    return len(cases) < export_job.chunk_size
+
+
+def run_export_job(
+    export_job: ExportJob,
+    storage: LocalExportJobStorage | S3ExportJobStorage | None = None,
+) -> None:
+    """Render the remaining chunks of the export job and record the outcome"""
+    if storage is None:
+        storage = get_export_job_storage(export_job)
+    try:
+        finished: bool = False
+        while not finished:
+            finished = render_export_job_chunk(export_job=export_job, storage=storage)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Export job %s failed", export_job.id)
+        export_job.status = ExportJob.Status.FAILED
+        export_job.error = str(error)
+        export_job.save(update_fields=["status", "error", "updated"])
+        return
+    export_job.status = ExportJob.Status.COMPLETE
+    export_job.error = ""
+    export_job.completed = timezone.now()
+    export_job.save(update_fields=["status", "error", "completed", "updated"])
+
+
+def claim_next_export_job(
+    max_attempts: int = EXPORT_JOB_MAX_ATTEMPTS,
+    stale_after: timedelta = EXPORT_JOB_STALE_AFTER,
+) -> ExportJob | None:
+    """
+    Mark the oldest export job waiting to run (queued, failed with attempts
+    remaining or abandoned by a worker which stopped) as running and return
+    it. Jobs are claimed by conditional update so concurrent workers never
+    claim the same job.
+    """
+    stale_cutoff = timezone.now() - stale_after
+    ExportJob.objects.filter(
+        status=ExportJob.Status.RUNNING,
+        updated__lt=stale_cutoff,
+        attempts__gte=max_attempts,
+    ).update(
+        status=ExportJob.Status.FAILED,
+        error="Export stopped without finishing",
+        updated=timezone.now(),
+    )
+    waiting_export_jobs: QuerySet[ExportJob] = ExportJob.objects.filter(
+        Q(status=ExportJob.Status.QUEUED)
+        | Q(status=ExportJob.Status.FAILED, attempts__lt=max_attempts)
+        | Q(
+            status=ExportJob.Status.RUNNING,
+            updated__lt=stale_cutoff,
+            attempts__lt=max_attempts,
+        )
+    ).order_by("id")
+    for export_job in waiting_export_jobs[:10]:
+        if ExportJob.objects.filter(
+            id=export_job.id, status=export_job.status, updated=export_job.updated
+        ).update(
+            status=ExportJob.Status.RUNNING,
+            attempts=F("attempts") + 1,
+            updated=timezone.now(),
+        ):
+            export_job.refresh_from_db()
+            return export_job
+    return None
+
+
+def retry_export_job(export_job: ExportJob) -> None:
+    """Queue failed export job to resume from its last chunk"""
+    if export_job.status == ExportJob.Status.FAILED:
+        export_job.status = ExportJob.Status.QUEUED
+        export_job.attempts = 0
+        export_job.error = ""
+        export_job.save(update_fields=["status", "attempts", "error", "updated"])
+
+
+def read_export_job_csv(export_job: ExportJob) -> Iterator[bytes]:
+    """Yield the chunks of a finished export in order"""
+    storage: LocalExportJobStorage | S3ExportJobStorage = get_export_job_storage(
+        export_job
+    )
+    for chunk_number in range(export_job.chunks_written):
+        yield storage.read_chunk(export_job=export_job, chunk_number=chunk_number)
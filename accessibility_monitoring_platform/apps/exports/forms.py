@@ -8,7 +8,7 @@ from django.core.exceptions import ValidationError
 from ..cases.models import Case
 from ..common.forms import AMPBooleanCheckboxWidget, AMPDateField
 from .models import Export
-from .utils import get_exportable_cases
+from .utils import get_exportable_cases_queryset
 
 
 class ExportCreateForm(forms.ModelForm):
@@ -30,10 +30,10 @@ class ExportCreateForm(forms.ModelForm):
             cutoff_date=cutoff_date, enforcement_body=enforcement_body, is_deleted=False
         ).exists():
             raise ValidationError("Export for this date already exists")
-        if not get_exportable_cases(
+        if not get_exportable_cases_queryset(
             cutoff_date=cutoff_date,
             enforcement_body=self.cleaned_data["enforcement_body"],
-        ):
+        ).exists():
             raise ValidationError("There are no cases to export")
         return cutoff_date
 
@@ -0,0 +1,60 @@
+"""Command to render queued CSV export jobs"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...export_job_utils import (
+    EXPORT_JOB_MAX_ATTEMPTS,
+    claim_next_export_job,
+    run_export_job,
+)
+from ...models import ExportJob
+
+DEFAULT_POLL_INTERVAL: float = 5.0
+
+
+class Command(BaseCommand):
+    """
+    Django command which polls the export job table and renders each job
+    waiting to run. Failed jobs are retried, resuming after the last chunk
+    written, until they have been attempted max-attempts times.
+    """
+
+    help = "Render queued CSV export jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when there are no more export jobs waiting to run",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=DEFAULT_POLL_INTERVAL,
+            help="Seconds to wait between checks for new export jobs",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=EXPORT_JOB_MAX_ATTEMPTS,
+            help="Number of times to attempt each export job",
+        )
+
+    def handle(self, *args, **options):  # pylint: disable=unused-argument
+        while True:
+            export_job: ExportJob | None = claim_next_export_job(
+                max_attempts=options["max_attempts"]
+            )
+            if export_job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+            self.stdout.write(f"Running {export_job} (attempt {export_job.attempts})")
+            run_export_job(export_job)
+            self.stdout.write(
+                f"{export_job}: {export_job.get_status_display()},"
+                f" {export_job.rows_written} rows in {export_job.chunks_written} chunks"
+            )
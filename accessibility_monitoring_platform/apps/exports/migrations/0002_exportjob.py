@@ -0,0 +1,94 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exports", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("cases", "Cases"),
+                            ("feedback-survey", "Feedback survey cases"),
+                            ("equality-body-all", "Equality body (all cases)"),
+                            ("equality-body-ready", "Equality body (ready cases)"),
+                        ],
+                        default="cases",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("complete", "Complete"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "storage",
+                    models.CharField(
+                        choices=[("local", "Local filesystem"), ("s3", "S3")],
+                        default="local",
+                        max_length=20,
+                    ),
+                ),
+                ("search_parameters", models.TextField(blank=True, default="")),
+                ("filename", models.CharField(blank=True, default="", max_length=200)),
+                ("chunk_size", models.IntegerField(default=500)),
+                ("chunks_written", models.IntegerField(default=0)),
+                ("rows_written", models.IntegerField(default=0)),
+                ("attempts", models.IntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                ("completed", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="export_job_created_by_user",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "export",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="exports.export",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-id"],
+            },
+        ),
+    ]
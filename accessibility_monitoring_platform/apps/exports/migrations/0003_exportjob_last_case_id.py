@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exports", "0002_exportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="last_case_id",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="exportjob",
+            name="storage",
+            field=models.CharField(
+                choices=[("local", "Local filesystem"), ("s3", "S3")],
+                default="s3",
+                max_length=20,
+            ),
+        ),
+    ]
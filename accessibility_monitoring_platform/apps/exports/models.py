@@ -1,11 +1,14 @@
 """Models for comment and comment history"""
 
+from functools import cached_property
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count
 
 from ..cases.models import Case
 from ..common.utils import amp_format_date
-from .utils import get_exportable_cases
+from .utils import get_exportable_case_ids
 
 
 class Export(models.Model):
@@ -39,16 +42,26 @@ class Export(models.Model):
 
     def save(self, *args, **kwargs) -> None:
         new_export: bool = not self.id
-        super().save(*args, **kwargs)
-        if new_export:
-            for case in get_exportable_cases(
-                cutoff_date=self.cutoff_date, enforcement_body=self.enforcement_body
-            ):
-                ExportCase.objects.create(
-                    export=self,
-                    case=case,
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if new_export:
+                ExportCase.objects.bulk_create(
+                    [
+                        ExportCase(export=self, case_id=case_id)
+                        for case_id in get_exportable_case_ids(
+                            cutoff_date=self.cutoff_date,
+                            enforcement_body=self.enforcement_body,
+                        )
+                    ]
                 )
 
+    def mark_all_cases_as_ready(self) -> int:
+        """Mark every case in export as ready; Return number updated"""
+        self.__dict__.pop("case_counts", None)
+        return self.exportcase_set.exclude(status=ExportCase.Status.READY).update(
+            status=ExportCase.Status.READY
+        )
+
     @property
     def all_cases(self) -> list[Case]:
         return [export_case.case for export_case in self.exportcase_set.all()]
@@ -62,17 +75,27 @@ class Export(models.Model):
             )
         ]
 
+    @cached_property
+    def case_counts(self) -> dict[str, int]:
+        """Return number of cases in export by status, counted once in one query"""
+        case_counts: dict[str, int] = {status.value: 0 for status in ExportCase.Status}
+        for status_count in (
+            self.exportcase_set.order_by().values("status").annotate(count=Count("id"))
+        ):
+            case_counts[status_count["status"]] = status_count["count"]
+        return case_counts
+
     @property
     def ready_cases_count(self):
-        return self.exportcase_set.filter(status=ExportCase.Status.READY).count()
+        return self.case_counts[ExportCase.Status.READY]
 
     @property
     def excluded_cases_count(self):
-        return self.exportcase_set.filter(status=ExportCase.Status.EXCLUDED).count()
+        return self.case_counts[ExportCase.Status.EXCLUDED]
 
     @property
     def unready_cases_count(self):
-        return self.exportcase_set.filter(status=ExportCase.Status.UNREADY).count()
+        return self.case_counts[ExportCase.Status.UNREADY]
 
 
 class ExportCase(models.Model):
@@ -92,3 +115,52 @@ class ExportCase(models.Model):
 
     def __str__(self) -> str:
         return f"{self.export}: {self.case}"
+
+
+class ExportJob(models.Model):
+    """Model for CSV export rendered to storage in chunks by a worker"""
+
+    class Type(models.TextChoices):
+        CASES = "cases", "Cases"
+        FEEDBACK_SURVEY = "feedback-survey", "Feedback survey cases"
+        EQUALITY_BODY_ALL = "equality-body-all", "Equality body (all cases)"
+        EQUALITY_BODY_READY = "equality-body-ready", "Equality body (ready cases)"
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETE = "complete", "Complete"
+        FAILED = "failed", "Failed"
+
+    class Storage(models.TextChoices):
+        LOCAL = "local", "Local filesystem"
+        S3 = "s3", "S3"
+
+    type = models.CharField(max_length=20, choices=Type, default=Type.CASES)
+    status = models.CharField(max_length=20, choices=Status, default=Status.QUEUED)
+    storage = models.CharField(max_length=20, choices=Storage, default=Storage.S3)
+    created_by = models.ForeignKey(
+        User, on_delete=models.PROTECT, related_name="export_job_created_by_user"
+    )
+    export = models.ForeignKey(Export, on_delete=models.PROTECT, null=True, blank=True)
+    search_parameters = models.TextField(default="", blank=True)
+    filename = models.CharField(max_length=200, default="", blank=True)
+    chunk_size = models.IntegerField(default=500)
+    chunks_written = models.IntegerField(default=0)
+    rows_written = models.IntegerField(default=0)
+    last_case_id = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    error = models.TextField(default="", blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+    completed = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering: list[str] = ["-id"]
+
+    def __str__(self) -> str:
+        return f"{self.get_type_display()} CSV export #{self.id}"
+
+    @property
+    def in_progress(self) -> bool:
+        return self.status in [ExportJob.Status.QUEUED, ExportJob.Status.RUNNING]
@@ -0,0 +1,187 @@
+"""
+Benchmark of exporting cases to CSV
+
+Compares formatting every cell by inspecting the column and value at runtime
+with the export plans compiled at import. The default test run checks both
+produce the same rows for a few cases; the 10k case benchmarks only run when
+selected with pytest -m benchmark -s.
+"""
+
+import csv
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from ...cases.models import Case, CaseCompliance, CaseStatus, Contact
+from ..csv_export_utils import (
+    CASE_COLUMNS_FOR_EXPORT,
+    CASE_EXPORT_PLAN,
+    CONTACT_DETAILS_COLUMN_HEADER,
+    EQUALITY_BODY_COLUMNS_FOR_EXPORT,
+    EQUALITY_BODY_EXPORT_PLAN,
+    ORGANISATION_RESPONDED_COLUMN_HEADER,
+    CaseExportValues,
+    CSVColumn,
+    CSVExportPlan,
+    Echo,
+    download_cases,
+    format_contacts,
+    format_field_as_yes_no,
+    format_model_field,
+    get_export_source_instances,
+    iterate_cases_for_export,
+)
+
+NUMBER_OF_CASES: int = 10_000
+NUMBER_OF_CASES_TO_COMPARE: int = 3
+CREATED: datetime = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def format_row_per_cell(source_instances: dict, columns: list[CSVColumn]) -> list:
+    """Previous implementation: Inspect each column and value for every cell"""
+    row: list = []
+    for column in columns:
+        if column.column_header == CONTACT_DETAILS_COLUMN_HEADER:
+            row.append(
+                format_contacts(contacts=source_instances[CaseExportValues].contacts)
+            )
+        elif column.column_header == ORGANISATION_RESPONDED_COLUMN_HEADER:
+            row.append(
+                format_field_as_yes_no(
+                    source_instance=source_instances[Case], column=column
+                )
+            )
+        else:
+            source_class: type = (
+                CaseExportValues if column.source_class is Case else column.source_class
+            )
+            row.append(
+                format_model_field(
+                    source_instance=source_instances.get(source_class),
+                    column=column,
+                )
+            )
+    return row
+
+
+def format_row_with_plan(source_instances: dict, export_plan: CSVExportPlan) -> list:
+    """Current implementation: Call the compiled cell formatters"""
+    return [
+        format_cell(source_instances) for format_cell in export_plan.cell_formatters
+    ]
+
+
+def measure(function: Callable) -> float:
+    """Return wall time in seconds"""
+    start: float = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def create_synthetic_cases(number_of_cases: int) -> None:
+    """Bulk create cases with status, compliance and a contact"""
+    cases: list[Case] = Case.objects.bulk_create(
+        [
+            Case(
+                created=CREATED,
+                case_number=count,
+                organisation_name=f"Organisation {count}",
+                home_page_url=f"https://example{count}.com",
+                domain=f"example{count}.com",
+                enforcement_body=Case.EnforcementBody.EHRC,
+            )
+            for count in range(number_of_cases)
+        ]
+    )
+    CaseStatus.objects.bulk_create([CaseStatus(case=case) for case in cases])
+    CaseCompliance.objects.bulk_create([CaseCompliance(case=case) for case in cases])
+    Contact.objects.bulk_create(
+        [
+            Contact(case=case, email=f"contact@example{case.id}.com", created=CREATED)
+            for case in cases
+        ]
+    )
+
+
+@pytest.fixture
+def synthetic_cases() -> None:
+    """Create many cases to benchmark exporting"""
+    create_synthetic_cases(number_of_cases=NUMBER_OF_CASES)
+
+
+@pytest.mark.parametrize(
+    "columns, export_plan",
+    [
+        (CASE_COLUMNS_FOR_EXPORT, CASE_EXPORT_PLAN),
+        (EQUALITY_BODY_COLUMNS_FOR_EXPORT, EQUALITY_BODY_EXPORT_PLAN),
+    ],
+)
+@pytest.mark.django_db
+def test_format_row_with_plan_matches_per_cell(columns, export_plan):
+    """Test compiled export plan writes the same CSV rows as per-cell inspection"""
+    create_synthetic_cases(number_of_cases=NUMBER_OF_CASES_TO_COMPARE)
+    writer: Any = csv.writer(Echo())
+
+    for case in iterate_cases_for_export(Case.objects.all()):
+        source_instances: dict = get_export_source_instances(case)
+
+        assert writer.writerow(
+            format_row_with_plan(
+                source_instances=source_instances, export_plan=export_plan
+            )
+        ) == writer.writerow(
+            format_row_per_cell(source_instances=source_instances, columns=columns)
+        )
+
+
+@pytest.mark.parametrize(
+    "columns, export_plan",
+    [
+        (CASE_COLUMNS_FOR_EXPORT, CASE_EXPORT_PLAN),
+        (EQUALITY_BODY_COLUMNS_FOR_EXPORT, EQUALITY_BODY_EXPORT_PLAN),
+    ],
+)
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark_format_rows(columns, export_plan, synthetic_cases):
+    """Report cost of formatting rows per cell and with compiled export plan"""
+    all_source_instances: list[dict] = [
+        get_export_source_instances(case)
+        for case in iterate_cases_for_export(Case.objects.all())
+    ]
+
+    assert len(all_source_instances) == NUMBER_OF_CASES
+
+    per_cell_time: float = measure(
+        lambda: [
+            format_row_per_cell(source_instances=source_instances, columns=columns)
+            for source_instances in all_source_instances
+        ]
+    )
+    plan_time: float = measure(
+        lambda: [
+            format_row_with_plan(
+                source_instances=source_instances, export_plan=export_plan
+            )
+            for source_instances in all_source_instances
+        ]
+    )
+
+    print(
+        f"\nFormat {NUMBER_OF_CASES} cases x {len(columns)} columns:"
+        f" per cell {per_cell_time:.4f}s, compiled plan {plan_time:.4f}s"
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark_stream_case_export(synthetic_cases):
+    """Report cost of streaming the case export end to end"""
+    export_time: float = measure(
+        lambda: b"".join(download_cases(cases=Case.objects.all()).streaming_content)
+    )
+
+    print(f"\nStream case export of {NUMBER_OF_CASES} cases: {export_time:.4f}s")
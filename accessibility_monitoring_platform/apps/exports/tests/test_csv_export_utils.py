@@ -10,22 +10,39 @@ from typing import Any
 import pytest
 from django.http import HttpResponse
 
-from ...audits.models import Audit
+from ...audits.models import (
+    Audit,
+    CheckResult,
+    Page,
+    StatementCheck,
+    StatementCheckResult,
+    WcagDefinition,
+)
 from ...cases.models import Case, Contact
+from ...reports.models import Report
+from ...s3_read_write.models import S3Report
 from ..csv_export_utils import (
     CASE_COLUMNS_FOR_EXPORT,
+    CASE_EXPORT_PLAN,
     EQUALITY_BODY_COLUMNS_FOR_EXPORT,
+    EQUALITY_BODY_EXPORT_PLAN,
     FEEDBACK_SURVEY_COLUMNS_FOR_EXPORT,
+    FEEDBACK_SURVEY_EXPORT_PLAN,
     CSVColumn,
+    CSVExportPlan,
     EqualityBodyCSVColumn,
+    compile_csv_export_plan,
     download_cases,
     download_equality_body_cases,
     download_feedback_survey_cases,
     format_contacts,
     format_field_as_yes_no,
     format_model_field,
-    populate_csv_columns,
+    get_cell_formatter_kind,
+    get_export_field,
+    get_export_source_instances,
     populate_equality_body_columns,
+    stream_csv_rows,
 )
 
 CONTACTS: list[Contact] = [
@@ -54,9 +71,44 @@ CONTACT_NOTES: str = "Contact notes"
 CONTACT_EMAIL: str = "example@example.com"
 
 
+def create_case_for_export(organisation_name: str) -> Case:
+    """Create case with all the related data read by the exports"""
+    case: Case = Case.objects.create(organisation_name=organisation_name)
+    Contact.objects.create(case=case, email=CONTACT_EMAIL)
+    Contact.objects.create(case=case, email="deleted@example.com", is_deleted=True)
+    audit: Audit = Audit.objects.create(case=case)
+    page: Page = Page.objects.create(audit=audit, page_type=Page.Type.HOME)
+    wcag_definition: WcagDefinition = WcagDefinition.objects.create(
+        type=WcagDefinition.Type.AXE
+    )
+    for retest_state in [
+        CheckResult.RetestResult.FIXED,
+        CheckResult.RetestResult.NOT_FIXED,
+        CheckResult.RetestResult.NOT_FIXED,
+    ]:
+        CheckResult.objects.create(
+            audit=audit,
+            page=page,
+            type=wcag_definition.type,
+            wcag_definition=wcag_definition,
+            check_result_state=CheckResult.Result.ERROR,
+            retest_state=retest_state,
+        )
+    StatementCheckResult.objects.create(
+        audit=audit,
+        type=StatementCheck.Type.OVERVIEW,
+        retest_state=StatementCheckResult.Result.NO,
+    )
+    Report.objects.create(case=case)
+    S3Report.objects.create(
+        case=case, version=0, latest_published=True, guid=f"guid-{case.id}"
+    )
+    return case
+
+
 def decode_csv_response(response: HttpResponse) -> tuple[list[str], list[list[str]]]:
     """Decode CSV HTTP response and break into column names and data"""
-    content: str = response.content.decode("utf-8")
+    content: str = b"".join(response.streaming_content).decode("utf-8")
     csv_reader: Any = csv.reader(io.StringIO(content))
     csv_body: list[list[str]] = list(csv_reader)
     csv_header: list[str] = csv_body.pop(0)
@@ -449,35 +501,160 @@ def test_populate_equality_body_columns():
     )
 
 
+@pytest.mark.parametrize(
+    "export_plan",
+    [EQUALITY_BODY_EXPORT_PLAN, CASE_EXPORT_PLAN, FEEDBACK_SURVEY_EXPORT_PLAN],
+)
 @pytest.mark.django_db
-def test_populate_csv_columns():
-    """Test collection of case data for CSV export"""
-    case: Case = Case.objects.create()
-    Contact.objects.create(case=case, email=CONTACT_EMAIL)
-    row: list[CSVColumn] = populate_csv_columns(
-        case=case, column_definitions=CASE_COLUMNS_FOR_EXPORT
+def test_stream_csv_rows_from_queryset_matches_case_values(export_plan):
+    """
+    Test rows streamed from a queryset, using prefetched and annotated data,
+    match those built from the related objects of each case
+    """
+    create_case_for_export(organisation_name="Org 1")
+    create_case_for_export(organisation_name="Org 2")
+    Case.objects.create(organisation_name="Org 3")
+    cases: list[Case] = list(Case.objects.all())
+
+    assert list(
+        stream_csv_rows(cases=Case.objects.all(), export_plan=export_plan)
+    ) == list(stream_csv_rows(cases=cases, export_plan=export_plan))
+
+
+@pytest.mark.django_db
+def test_stream_csv_rows_derived_values():
+    """Test values derived from audit, report and contacts are streamed"""
+    case: Case = create_case_for_export(organisation_name="Org 1")
+
+    rows: list[list[str]] = list(
+        csv.reader(
+            stream_csv_rows(
+                cases=Case.objects.all(), export_plan=EQUALITY_BODY_EXPORT_PLAN
+            )
+        )
+    )
+    row: dict[str, str] = dict(zip(rows[0], rows[1]))
+
+    assert row["Published report"].endswith(f"/reports/guid-{case.id}")
+    assert row["Contact details"] == f"{CONTACT_EMAIL}\n"
+    assert row["Total number of accessibility issues"] == "3"
+    assert row["Number of issues fixed"] == "1"
+    assert row["Number of issues unfixed"] == "2"
+    assert row["Issues fixed as a percentage"] == "33"
+    assert (
+        row["Was an accessibility statement found during the 12-week assessment"]
+        == "No"
     )
 
-    assert len(row) == 91
 
-    contact_email: list[CSVColumn] = [
-        cell for cell in row if cell.column_header == "Contact email"
-    ]
+@pytest.mark.parametrize(
+    "download_function",
+    [download_cases, download_equality_body_cases, download_feedback_survey_cases],
+)
+@pytest.mark.django_db
+def test_download_cases_uses_fixed_number_of_queries(
+    download_function, django_assert_num_queries
+):
+    """Test number of queries used to stream a chunk does not grow with cases"""
+    create_case_for_export(organisation_name="Org 1")
 
-    assert len(contact_email) == 1
+    with django_assert_num_queries(2):
+        b"".join(download_function(cases=Case.objects.all()).streaming_content)
 
-    contact_email_cell: CSVColumn = contact_email[0]
+    for organisation_name in ["Org 2", "Org 3", "Org 4"]:
+        create_case_for_export(organisation_name=organisation_name)
 
-    assert contact_email_cell.formatted_data == CONTACT_EMAIL
+    with django_assert_num_queries(2):
+        b"".join(download_function(cases=Case.objects.all()).streaming_content)
 
 
-@pytest.mark.django_db
-def test_populate_feedback_survey_columns():
-    """Test collection of case data for feedback survey export"""
-    case: Case = Case.objects.create()
-    Contact.objects.create(case=case, email=CONTACT_EMAIL)
-    row: list[CSVColumn] = populate_csv_columns(
-        case=case, column_definitions=FEEDBACK_SURVEY_COLUMNS_FOR_EXPORT
+@pytest.mark.parametrize(
+    "columns, export_plan",
+    [
+        (EQUALITY_BODY_COLUMNS_FOR_EXPORT, EQUALITY_BODY_EXPORT_PLAN),
+        (CASE_COLUMNS_FOR_EXPORT, CASE_EXPORT_PLAN),
+        (FEEDBACK_SURVEY_COLUMNS_FOR_EXPORT, FEEDBACK_SURVEY_EXPORT_PLAN),
+    ],
+)
+def test_export_plans_compiled_from_columns(columns, export_plan):
+    """Test export plans have a header and cell formatter for each column"""
+    assert export_plan.column_headers == tuple(
+        column.column_header for column in columns
     )
+    assert len(export_plan.cell_formatters) == len(columns)
 
-    assert len(row) == 8
+
+@pytest.mark.parametrize(
+    "column, expected_kind",
+    [
+        (CSVColumn("Contact details", Case, "contacts"), "contact_details"),
+        (
+            CSVColumn(
+                "Organisation responded to report?", Case, "report_acknowledged_date"
+            ),
+            "yes_no",
+        ),
+        (CSVColumn("Total issues", Case, "total_website_issues"), "model_attribute"),
+        (CSVColumn("Report sent on", Case, "report_sent_date"), "date"),
+        (CSVColumn("Enforcement body", Case, "enforcement_body"), "upper_case"),
+        (CSVColumn("Test type", Case, "test_type"), "choice"),
+        (CSVColumn("Organisation name", Case, "organisation_name"), "value"),
+    ],
+)
+def test_get_cell_formatter_kind(column, expected_kind):
+    """Test the kind of cell formatter compiled for each type of column"""
+    assert (
+        get_cell_formatter_kind(
+            column=column,
+            field=get_export_field(source_class=Case, source_attr=column.source_attr),
+        )
+        == expected_kind
+    )
+
+
+@pytest.mark.parametrize(
+    "columns",
+    [
+        EQUALITY_BODY_COLUMNS_FOR_EXPORT,
+        CASE_COLUMNS_FOR_EXPORT,
+        FEEDBACK_SURVEY_COLUMNS_FOR_EXPORT,
+    ],
+)
+@pytest.mark.django_db
+def test_compiled_cell_formatters_match_format_model_field(columns):
+    """Test compiled cell formatters format values as populating columns does"""
+    case: Case = create_case_for_export(organisation_name="Org 1")
+    case.created = datetime(2022, 12, 16, tzinfo=timezone.utc)
+    case.report_sent_date = date(2023, 1, 2)
+    case.enforcement_body = Case.EnforcementBody.ECNI
+    case.is_complaint = "yes"
+    case.save()
+    case = Case.objects.get(id=case.id)
+    export_plan: CSVExportPlan = compile_csv_export_plan(columns)
+    source_instances: dict = get_export_source_instances(case)
+
+    formatted_cells: list[str] = [
+        format_cell(source_instances) for format_cell in export_plan.cell_formatters
+    ]
+    if columns is EQUALITY_BODY_COLUMNS_FOR_EXPORT:
+        expected_cells: list[str] = [
+            column.formatted_data
+            for column in populate_equality_body_columns(
+                case=case, column_definitions=columns
+            )
+        ]
+    else:
+        expected_cells: list[str] = [
+            format_model_field(
+                source_instance=source_instances.get(column.source_class),
+                column=column,
+            )
+            for column in columns
+        ]
+
+    for formatted_cell, expected_cell, column in zip(
+        formatted_cells, expected_cells, columns
+    ):
+        assert ("" if formatted_cell is None else formatted_cell) == (
+            "" if expected_cell is None else expected_cell
+        ), column.column_header
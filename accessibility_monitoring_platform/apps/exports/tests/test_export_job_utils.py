@@ -0,0 +1,358 @@
+"""
+Test export job utility functions and worker command
+"""
+
+import csv
+import io
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from moto import mock_aws
+
+from ...cases.models import Case
+from ..csv_export_utils import CASE_EXPORT_PLAN, EQUALITY_BODY_EXPORT_PLAN
+from ..export_job_utils import (
+    LocalExportJobStorage,
+    S3ExportJobStorage,
+    claim_next_export_job,
+    enqueue_export_job,
+    get_export_job_cases,
+    read_export_job_csv,
+    render_export_job_chunk,
+    retry_export_job,
+    run_export_job,
+)
+from ..models import Export, ExportCase, ExportJob
+from .test_views import ORGANISATION_NAME, create_cases_and_export
+
+
+class FailingExportJobStorage(LocalExportJobStorage):
+    """Storage which fails after writing a number of chunks"""
+
+    def __init__(self, directory: Path, chunks_to_write: int) -> None:
+        super().__init__(directory=directory)
+        self.chunks_to_write: int = chunks_to_write
+
+    def write_chunk(self, export_job: ExportJob, chunk_number: int, content: str):
+        if chunk_number >= self.chunks_to_write:
+            raise OSError("Disk full")
+        super().write_chunk(export_job, chunk_number, content)
+
+
+@pytest.fixture(autouse=True)
+def export_job_directory(tmp_path, settings) -> Path:
+    """Write export job chunks to a temporary directory"""
+    settings.EXPORT_JOB_DIRECTORY = tmp_path
+    settings.EXPORT_JOB_STORAGE = ExportJob.Storage.LOCAL
+    return tmp_path
+
+
+def create_cases_export_job(number_of_cases: int, chunk_size: int) -> ExportJob:
+    """Create cases and job to export them in chunks"""
+    for count in range(number_of_cases):
+        Case.objects.create(organisation_name=f"Organisation {count}")
+    export_job: ExportJob = enqueue_export_job(
+        user=User.objects.create(), export_job_type=ExportJob.Type.CASES
+    )
+    export_job.chunk_size = chunk_size
+    export_job.save()
+    return export_job
+
+
+def read_csv_rows(export_job: ExportJob) -> list[list[str]]:
+    """Return rows of the CSV rendered by export job"""
+    content: str = b"".join(read_export_job_csv(export_job)).decode("utf-8")
+    return list(csv.reader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_enqueue_export_job():
+    """Test export job is queued with filename and storage"""
+    export: Export = create_cases_and_export()
+
+    export_job: ExportJob = enqueue_export_job(
+        user=export.exporter,
+        export_job_type=ExportJob.Type.EQUALITY_BODY_ALL,
+        export=export,
+    )
+
+    assert export_job.status == ExportJob.Status.QUEUED
+    assert export_job.storage == ExportJob.Storage.LOCAL
+    assert export_job.filename == f"DRAFT_EHRC_cases_{export.cutoff_date}.csv"
+
+
+@pytest.mark.django_db
+def test_get_export_job_cases_for_ready_cases():
+    """Test equality body export job of ready cases only includes ready cases"""
+    export: Export = create_cases_and_export()
+    export_case: ExportCase = export.exportcase_set.first()
+    export_case.status = ExportCase.Status.READY
+    export_case.save()
+    export_job: ExportJob = enqueue_export_job(
+        user=export.exporter,
+        export_job_type=ExportJob.Type.EQUALITY_BODY_READY,
+        export=export,
+    )
+
+    assert list(get_export_job_cases(export_job)) == [export_case.case]
+
+
+@pytest.mark.django_db
+def test_get_export_job_cases_applies_search():
+    """Test case export job only includes cases matching its search"""
+    Case.objects.create(organisation_name="Included")
+    Case.objects.create(organisation_name="Excluded")
+    export_job: ExportJob = enqueue_export_job(
+        user=User.objects.create(),
+        export_job_type=ExportJob.Type.CASES,
+        search_parameters="search=Included",
+    )
+
+    assert [case.organisation_name for case in get_export_job_cases(export_job)] == [
+        "Included"
+    ]
+
+
+@pytest.mark.django_db
+def test_run_export_job_writes_chunks():
+    """Test export job is rendered in chunks and header written once"""
+    export_job: ExportJob = create_cases_export_job(number_of_cases=5, chunk_size=2)
+
+    run_export_job(export_job)
+
+    assert export_job.status == ExportJob.Status.COMPLETE
+    assert export_job.completed is not None
+    assert export_job.chunks_written == 3
+    assert export_job.rows_written == 5
+
+    rows: list[list[str]] = read_csv_rows(export_job)
+
+    assert rows[0] == list(CASE_EXPORT_PLAN.column_headers)
+    assert len(rows) == 6
+
+
+@pytest.mark.django_db
+def test_run_export_job_with_no_cases_writes_header():
+    """Test export job with no cases renders CSV with only a header"""
+    export: Export = create_cases_and_export()
+    export_job: ExportJob = enqueue_export_job(
+        user=export.exporter,
+        export_job_type=ExportJob.Type.EQUALITY_BODY_READY,
+        export=export,
+    )
+
+    run_export_job(export_job)
+
+    assert export_job.chunks_written == 1
+    assert read_csv_rows(export_job) == [list(EQUALITY_BODY_EXPORT_PLAN.column_headers)]
+
+
+@pytest.mark.django_db
+def test_failed_export_job_resumes_from_last_chunk(export_job_directory):
+    """Test failed export job is retried starting after the last chunk written"""
+    export_job: ExportJob = create_cases_export_job(number_of_cases=5, chunk_size=2)
+
+    run_export_job(
+        export_job,
+        storage=FailingExportJobStorage(
+            directory=export_job_directory, chunks_to_write=2
+        ),
+    )
+
+    assert export_job.status == ExportJob.Status.FAILED
+    assert export_job.error == "Disk full"
+    assert export_job.chunks_written == 2
+    assert export_job.rows_written == 4
+
+    first_chunk_modified: float = (
+        (export_job_directory / f"export_jobs/{export_job.id}/chunk_000000.csv")
+        .stat()
+        .st_mtime_ns
+    )
+
+    run_export_job(export_job)
+
+    assert export_job.status == ExportJob.Status.COMPLETE
+    assert export_job.chunks_written == 3
+    assert (
+        export_job_directory / f"export_jobs/{export_job.id}/chunk_000000.csv"
+    ).stat().st_mtime_ns == first_chunk_modified
+
+    rows: list[list[str]] = read_csv_rows(export_job)
+
+    assert len(rows) == 6
+    assert sorted(row[9] for row in rows[1:]) == [
+        f"Organisation {count}" for count in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_render_export_job_chunk_continues_after_last_case_id():
+    """
+    Test each chunk starts after the last case written so cases added to or
+    removed from the search results between chunks are neither skipped nor
+    repeated
+    """
+    export_job: ExportJob = create_cases_export_job(number_of_cases=4, chunk_size=2)
+    export_job.search_parameters = "search=Organisation"
+    export_job.save()
+    storage: LocalExportJobStorage = LocalExportJobStorage()
+    first_case, second_case, third_case, _ = Case.objects.order_by("id")
+
+    render_export_job_chunk(export_job=export_job, storage=storage)
+
+    assert export_job.last_case_id == second_case.id
+    assert ExportJob.objects.get(id=export_job.id).last_case_id == second_case.id
+
+    Case.objects.filter(id__in=[first_case.id, third_case.id]).update(
+        organisation_name="Removed from search"
+    )
+    Case.objects.create(organisation_name="Organisation 4")
+    run_export_job(export_job, storage=storage)
+
+    assert [row[9] for row in read_csv_rows(export_job)[1:]] == [
+        "Organisation 0",
+        "Organisation 1",
+        "Organisation 3",
+        "Organisation 4",
+    ]
+
+
+@pytest.mark.django_db
+def test_render_export_job_chunk_returns_true_for_last_chunk():
+    """Test rendering chunks reports when the last has been written"""
+    export_job: ExportJob = create_cases_export_job(number_of_cases=2, chunk_size=2)
+    storage: LocalExportJobStorage = LocalExportJobStorage()
+
+    assert render_export_job_chunk(export_job=export_job, storage=storage) is False
+    assert render_export_job_chunk(export_job=export_job, storage=storage) is True
+    assert export_job.chunks_written == 1
+
+
+@pytest.mark.django_db
+def test_claim_next_export_job():
+    """Test oldest waiting job is claimed and marked as running"""
+    user: User = User.objects.create()
+    first_export_job: ExportJob = enqueue_export_job(
+        user=user, export_job_type=ExportJob.Type.CASES
+    )
+    second_export_job: ExportJob = enqueue_export_job(
+        user=user, export_job_type=ExportJob.Type.CASES
+    )
+
+    assert claim_next_export_job() == first_export_job
+    assert claim_next_export_job() == second_export_job
+    assert claim_next_export_job() is None
+
+    first_export_job.refresh_from_db()
+
+    assert first_export_job.status == ExportJob.Status.RUNNING
+    assert first_export_job.attempts == 1
+
+
+@pytest.mark.django_db
+def test_claim_next_export_job_retries_failed_jobs():
+    """Test failed jobs are claimed until they run out of attempts"""
+    export_job: ExportJob = enqueue_export_job(
+        user=User.objects.create(), export_job_type=ExportJob.Type.CASES
+    )
+    ExportJob.objects.filter(id=export_job.id).update(
+        status=ExportJob.Status.FAILED, attempts=1
+    )
+
+    assert claim_next_export_job(max_attempts=2) == export_job
+
+    ExportJob.objects.filter(id=export_job.id).update(status=ExportJob.Status.FAILED)
+
+    assert claim_next_export_job(max_attempts=2) is None
+
+
+@pytest.mark.django_db
+def test_claim_next_export_job_reclaims_stale_running_jobs():
+    """Test jobs abandoned by a worker are claimed or marked as failed"""
+    user: User = User.objects.create()
+    stale_export_job: ExportJob = enqueue_export_job(
+        user=user, export_job_type=ExportJob.Type.CASES
+    )
+    exhausted_export_job: ExportJob = enqueue_export_job(
+        user=user, export_job_type=ExportJob.Type.CASES
+    )
+    running_export_job: ExportJob = enqueue_export_job(
+        user=user, export_job_type=ExportJob.Type.CASES
+    )
+    an_hour_ago = timezone.now() - timedelta(hours=1)
+    ExportJob.objects.filter(id=stale_export_job.id).update(
+        status=ExportJob.Status.RUNNING, attempts=1, updated=an_hour_ago
+    )
+    ExportJob.objects.filter(id=exhausted_export_job.id).update(
+        status=ExportJob.Status.RUNNING, attempts=3, updated=an_hour_ago
+    )
+    ExportJob.objects.filter(id=running_export_job.id).update(
+        status=ExportJob.Status.RUNNING, attempts=1
+    )
+
+    assert claim_next_export_job() == stale_export_job
+    assert claim_next_export_job() is None
+
+    exhausted_export_job.refresh_from_db()
+
+    assert exhausted_export_job.status == ExportJob.Status.FAILED
+
+
+@pytest.mark.django_db
+def test_retry_export_job():
+    """Test failed export job is queued again"""
+    export_job: ExportJob = enqueue_export_job(
+        user=User.objects.create(), export_job_type=ExportJob.Type.CASES
+    )
+    export_job.status = ExportJob.Status.FAILED
+    export_job.attempts = 3
+    export_job.error = "Error"
+    export_job.save()
+
+    retry_export_job(export_job)
+    export_job.refresh_from_db()
+
+    assert export_job.status == ExportJob.Status.QUEUED
+    assert export_job.attempts == 0
+    assert export_job.error == ""
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_s3_export_job_storage():
+    """Test export job chunks are written to and read from S3"""
+    export_job: ExportJob = enqueue_export_job(
+        user=User.objects.create(), export_job_type=ExportJob.Type.CASES
+    )
+    storage: S3ExportJobStorage = S3ExportJobStorage()
+
+    storage.write_chunk(export_job=export_job, chunk_number=0, content="a,b\r\n")
+
+    assert storage.read_chunk(export_job=export_job, chunk_number=0) == b"a,b\r\n"
+
+
+@pytest.mark.django_db
+def test_run_export_jobs_command():
+    """Test worker command renders waiting export jobs"""
+    export: Export = create_cases_and_export()
+    export_job: ExportJob = enqueue_export_job(
+        user=export.exporter,
+        export_job_type=ExportJob.Type.EQUALITY_BODY_ALL,
+        export=export,
+    )
+    out: StringIO = StringIO()
+
+    call_command("run_export_jobs", "--once", stdout=out)
+
+    export_job.refresh_from_db()
+
+    assert export_job.status == ExportJob.Status.COMPLETE
+    assert f"Running {export_job} (attempt 1)" in out.getvalue()
+    assert f"{export_job}: Complete, 2 rows in 1 chunks" in out.getvalue()
+    assert ORGANISATION_NAME in b"".join(read_export_job_csv(export_job)).decode()
@@ -69,6 +69,24 @@ def test_export_save():
     assert ExportCase.objects.all().first().case == qualifying_case
 
 
+@pytest.mark.django_db
+def test_export_save_creates_export_cases_in_bulk(django_assert_max_num_queries):
+    """Tests Export.save() creates ExportCase objects in a fixed number of queries"""
+    cases: list[Case] = [
+        Case.objects.create(compliance_email_sent_date=COMPLIANCE_EMAIL_SENT_DATE)
+        for _ in range(3)
+    ]
+    CaseStatus.objects.filter(case__in=cases).update(
+        status=CaseStatus.Status.CASE_CLOSED_WAITING_TO_SEND
+    )
+    user: User = User.objects.create()
+
+    with django_assert_max_num_queries(5):
+        export: Export = Export.objects.create(cutoff_date=CUTOFF_DATE, exporter=user)
+
+    assert export.all_cases == cases
+
+
 @pytest.mark.django_db
 def test_export_save_excludes_ecni():
     """
@@ -156,7 +174,7 @@ def test_export_ready_cases_count():
     export_case.status = ExportCase.Status.READY
     export_case.save()
 
-    assert export.ready_cases_count == 1
+    assert Export.objects.get(id=export.id).ready_cases_count == 1
 
 
 @pytest.mark.django_db
@@ -170,7 +188,7 @@ def test_export_excluded_cases_count():
     export_case.status = ExportCase.Status.EXCLUDED
     export_case.save()
 
-    assert export.excluded_cases_count == 1
+    assert Export.objects.get(id=export.id).excluded_cases_count == 1
 
 
 @pytest.mark.django_db
@@ -184,7 +202,40 @@ def test_export_unready_cases_count():
     export_case.status = ExportCase.Status.READY
     export_case.save()
 
-    assert export.unready_cases_count == 0
+    assert Export.objects.get(id=export.id).unready_cases_count == 0
+
+
+@pytest.mark.django_db
+def test_export_case_counts(django_assert_num_queries):
+    """Tests Export.case_counts counts cases by status in one query"""
+    export, case = create_cases_and_export()
+    export_case: ExportCase = export.exportcase_set.get(case=case)
+    export_case.status = ExportCase.Status.EXCLUDED
+    export_case.save()
+
+    with django_assert_num_queries(1):
+        assert export.case_counts == {
+            ExportCase.Status.UNREADY: 0,
+            ExportCase.Status.READY: 0,
+            ExportCase.Status.EXCLUDED: 1,
+        }
+        assert export.ready_cases_count == 0
+        assert export.excluded_cases_count == 1
+        assert export.unready_cases_count == 0
+
+
+@pytest.mark.django_db
+def test_export_mark_all_cases_as_ready(django_assert_num_queries):
+    """Tests Export.mark_all_cases_as_ready updates cases in one query"""
+    export, case = create_cases_and_export()
+
+    assert export.ready_cases_count == 0
+
+    with django_assert_num_queries(1):
+        assert export.mark_all_cases_as_ready() == 1
+
+    assert export.ready_cases == [case]
+    assert export.ready_cases_count == 1
 
 
 @pytest.mark.django_db
@@ -1,7 +1,7 @@
 import pytest
 
 from ...cases.models import Case
-from ..utils import get_exportable_cases
+from ..utils import get_exportable_case_ids, get_exportable_cases
 from .test_forms import CUTOFF_DATE, create_exportable_case
 
 
@@ -32,3 +32,19 @@ def test_get_exportable_case():
     assert get_exportable_cases(
         cutoff_date=CUTOFF_DATE, enforcement_body=Case.EnforcementBody.ECNI
     ) == [case]
+
+
+@pytest.mark.django_db
+def test_get_exportable_case_ids():
+    """Tests get_exportable_case_ids gets ids of exportable cases"""
+    case: Case = create_exportable_case()
+
+    assert get_exportable_case_ids(
+        cutoff_date=CUTOFF_DATE, enforcement_body=Case.EnforcementBody.EHRC
+    ) == [case.id]
+    assert (
+        get_exportable_case_ids(
+            cutoff_date=CUTOFF_DATE, enforcement_body=Case.EnforcementBody.ECNI
+        )
+        == []
+    )
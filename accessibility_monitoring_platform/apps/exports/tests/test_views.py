@@ -14,7 +14,8 @@ from pytest_django.asserts import assertContains, assertNotContains
 
 from ...cases.models import Case, CaseStatus
 from ...common.models import Event
-from ..models import Export, ExportCase
+from ..export_job_utils import run_export_job
+from ..models import Export, ExportCase, ExportJob
 from .test_forms import CUTOFF_DATE, create_exportable_case
 
 ORGANISATION_NAME: str = "Org Name"
@@ -150,8 +151,11 @@ def test_draft_export_csv_returned(admin_client):
 
     assert response.status_code == 200
     assert response.headers["Content-Type"] == "text/csv"
-    assertContains(response, EXPORT_CSV_COLUMNS)
-    assertContains(response, ORGANISATION_NAME)
+
+    content: str = response.getvalue().decode("utf-8")
+
+    assert EXPORT_CSV_COLUMNS in content
+    assert ORGANISATION_NAME in content
 
 
 @pytest.mark.parametrize(
@@ -228,8 +232,11 @@ def test_ready_export_csv_returned(admin_client):
 
     assert response.status_code == 200
     assert response.headers["Content-Type"] == "text/csv"
-    assertContains(response, EXPORT_CSV_COLUMNS)
-    assertNotContains(response, ORGANISATION_NAME)
+
+    content: str = response.getvalue().decode("utf-8")
+
+    assert EXPORT_CSV_COLUMNS in content
+    assert ORGANISATION_NAME not in content
 
     export_case: ExportCase = export.exportcase_set.first()
     export_case.status = ExportCase.Status.READY
@@ -241,8 +248,11 @@ def test_ready_export_csv_returned(admin_client):
 
     assert response.status_code == 200
     assert response.headers["Content-Type"] == "text/csv"
-    assertContains(response, EXPORT_CSV_COLUMNS)
-    assertContains(response, ORGANISATION_NAME)
+
+    content: str = response.getvalue().decode("utf-8")
+
+    assert EXPORT_CSV_COLUMNS in content
+    assert ORGANISATION_NAME in content
 
 
 def test_create_export(admin_client, admin_user):
@@ -340,3 +350,208 @@ def test_confirm_delete_export(admin_client):
     assert event is not None
     assert event.parent == export
     assert event.type == "model_update"
+
+
+def test_create_equality_body_export_job(admin_client):
+    """Test equality body export is queued and user redirected to its progress"""
+    export: Export = create_cases_and_export()
+
+    response: HttpResponse = admin_client.post(
+        reverse("exports:export-job-create-all-cases", kwargs={"pk": export.id})
+    )
+
+    export_job: ExportJob = ExportJob.objects.get()
+
+    assert response.status_code == 302
+    assert response.url == reverse(
+        "exports:export-job-detail", kwargs={"pk": export_job.id}
+    )
+    assert export_job.type == ExportJob.Type.EQUALITY_BODY_ALL
+    assert export_job.export == export
+    assert export_job.storage == ExportJob.Storage.S3
+
+
+@pytest.mark.parametrize(
+    "path_name, expected_type",
+    [
+        ("exports:export-job-create-cases", ExportJob.Type.CASES),
+        ("exports:export-job-create-feedback-survey", ExportJob.Type.FEEDBACK_SURVEY),
+    ],
+)
+def test_create_case_search_export_job(path_name, expected_type, admin_client):
+    """Test case search export is queued with the search parameters"""
+    response: HttpResponse = admin_client.post(f"{reverse(path_name)}?search=Org")
+
+    export_job: ExportJob = ExportJob.objects.get()
+
+    assert response.status_code == 302
+    assert export_job.type == expected_type
+    assert export_job.search_parameters == "search=Org"
+
+
+@pytest.mark.parametrize(
+    "path_name, needs_export",
+    [
+        ("exports:export-job-create-all-cases", True),
+        ("exports:export-job-create-cases", False),
+        ("exports:export-job-create-feedback-survey", False),
+    ],
+)
+def test_create_export_job_requires_post(path_name, needs_export, admin_client):
+    """Test export jobs are not queued by following a link"""
+    kwargs: dict[str, int] = (
+        {"pk": create_cases_and_export().id} if needs_export else {}
+    )
+
+    response: HttpResponse = admin_client.get(reverse(path_name, kwargs=kwargs))
+
+    assert response.status_code == 405
+    assert ExportJob.objects.count() == 0
+
+
+@pytest.mark.parametrize("export_jobs_enabled", [False, True])
+def test_export_detail_offers_export_job_when_enabled(
+    export_jobs_enabled, admin_client, settings
+):
+    """
+    Test export page always links to streamed CSV and only offers background
+    export when a worker runs export jobs
+    """
+    settings.EXPORT_JOBS_ENABLED = export_jobs_enabled
+    export: Export = create_cases_and_export()
+
+    response: HttpResponse = admin_client.get(
+        reverse("exports:export-detail", kwargs={"pk": export.id})
+    )
+
+    assertContains(
+        response, reverse("exports:export-all-cases", kwargs={"pk": export.id})
+    )
+    export_job_form: str = (
+        '<form method="post" action="'
+        f'{reverse("exports:export-job-create-all-cases", kwargs={"pk": export.id})}">'
+    )
+    if export_jobs_enabled:
+        assertContains(response, export_job_form)
+    else:
+        assertNotContains(response, export_job_form)
+
+
+@pytest.mark.parametrize("export_jobs_enabled", [False, True])
+def test_case_list_offers_export_jobs_when_enabled(
+    export_jobs_enabled, admin_client, settings
+):
+    """
+    Test case search always links to streamed CSVs and only offers background
+    exports when a worker runs export jobs
+    """
+    settings.EXPORT_JOBS_ENABLED = export_jobs_enabled
+
+    response: HttpResponse = admin_client.get(
+        f'{reverse("cases:case-list")}?search=Org'
+    )
+
+    assertContains(response, f'{reverse("cases:case-export-list")}?search=Org')
+    assertContains(
+        response, f'{reverse("cases:export-feedback-survey-cases")}?search=Org'
+    )
+    for path_name in [
+        "exports:export-job-create-cases",
+        "exports:export-job-create-feedback-survey",
+    ]:
+        export_job_form: str = (
+            f'<form method="post" action="{reverse(path_name)}?search=Org">'
+        )
+        if export_jobs_enabled:
+            assertContains(response, export_job_form)
+        else:
+            assertNotContains(response, export_job_form)
+
+
+def test_export_job_detail_refreshes_until_complete(admin_client, tmp_path, settings):
+    """Test export job page refreshes until job complete then offers download"""
+    settings.EXPORT_JOB_STORAGE = ExportJob.Storage.LOCAL
+    settings.EXPORT_JOB_DIRECTORY = tmp_path
+    export: Export = create_cases_and_export()
+    admin_client.post(
+        reverse("exports:export-job-create-all-cases", kwargs={"pk": export.id})
+    )
+    export_job: ExportJob = ExportJob.objects.get()
+    url: str = reverse("exports:export-job-detail", kwargs={"pk": export_job.id})
+
+    response: HttpResponse = admin_client.get(url)
+
+    assert response.status_code == 200
+    assertContains(response, '<meta http-equiv="refresh" content="5">')
+    assertContains(response, "Status: Queued")
+
+    run_export_job(export_job)
+
+    response: HttpResponse = admin_client.get(url)
+
+    assertNotContains(response, '<meta http-equiv="refresh" content="5">')
+    assertContains(response, "Status: Complete")
+    assertContains(
+        response, reverse("exports:export-job-download", kwargs={"pk": export_job.id})
+    )
+
+
+def test_download_export_job(admin_client, tmp_path, settings):
+    """Test CSV rendered by export job is downloaded once complete"""
+    settings.EXPORT_JOB_STORAGE = ExportJob.Storage.LOCAL
+    settings.EXPORT_JOB_DIRECTORY = tmp_path
+    export: Export = create_cases_and_export()
+    admin_client.post(
+        reverse("exports:export-job-create-all-cases", kwargs={"pk": export.id})
+    )
+    export_job: ExportJob = ExportJob.objects.get()
+    url: str = reverse("exports:export-job-download", kwargs={"pk": export_job.id})
+
+    response: HttpResponse = admin_client.get(url)
+
+    assert response.status_code == 302
+
+    run_export_job(export_job)
+
+    response: HttpResponse = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "text/csv"
+    assert (
+        response.headers["Content-Disposition"]
+        == f"attachment; filename={export_job.filename}"
+    )
+
+    content: str = response.getvalue().decode("utf-8")
+
+    assert EXPORT_CSV_COLUMNS in content
+    assert ORGANISATION_NAME in content
+
+
+def test_retry_failed_export_job(admin_client):
+    """Test failed export job can be queued again"""
+    export: Export = create_cases_and_export()
+    export_job: ExportJob = ExportJob.objects.create(
+        type=ExportJob.Type.EQUALITY_BODY_ALL,
+        export=export,
+        created_by=export.exporter,
+        status=ExportJob.Status.FAILED,
+        error="Disk full",
+    )
+    url: str = reverse("exports:export-job-detail", kwargs={"pk": export_job.id})
+    retry_url: str = reverse("exports:export-job-retry", kwargs={"pk": export_job.id})
+
+    response: HttpResponse = admin_client.get(url)
+
+    assertContains(response, "Export failed: Disk full")
+    assertContains(response, f'<form method="post" action="{retry_url}">')
+
+    response: HttpResponse = admin_client.get(retry_url)
+
+    assert response.status_code == 405
+    assert ExportJob.objects.get(id=export_job.id).status == ExportJob.Status.FAILED
+
+    response: HttpResponse = admin_client.post(retry_url)
+
+    assert response.status_code == 302
+    assert ExportJob.objects.get(id=export_job.id).status == ExportJob.Status.QUEUED
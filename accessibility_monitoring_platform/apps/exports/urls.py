@@ -11,13 +11,19 @@ from .views import (
     ExportConfirmDeleteUpdateView,
     ExportCreateView,
     ExportDetailView,
+    ExportJobDetailView,
     ExportListView,
+    create_all_cases_export_job,
+    create_cases_export_job,
+    create_feedback_survey_export_job,
+    download_export_job,
     export_all_cases,
     export_ready_cases,
     mark_all_export_cases_as_ready,
     mark_export_case_as_excluded,
     mark_export_case_as_ready,
     mark_export_case_as_unready,
+    retry_failed_export_job,
 )
 
 app_name: str = "exports"
@@ -77,4 +83,34 @@ urlpatterns: list[URLPattern] = [
         login_required(export_ready_cases),
         name="export-ready-cases",
     ),
+    path(
+        "<int:pk>/export-job-create-all-cases/",
+        login_required(create_all_cases_export_job),
+        name="export-job-create-all-cases",
+    ),
+    path(
+        "export-job-create-cases/",
+        login_required(create_cases_export_job),
+        name="export-job-create-cases",
+    ),
+    path(
+        "export-job-create-feedback-survey/",
+        login_required(create_feedback_survey_export_job),
+        name="export-job-create-feedback-survey",
+    ),
+    path(
+        "<int:pk>/export-job-detail/",
+        login_required(ExportJobDetailView.as_view()),
+        name="export-job-detail",
+    ),
+    path(
+        "<int:pk>/export-job-download/",
+        login_required(download_export_job),
+        name="export-job-download",
+    ),
+    path(
+        "<int:pk>/export-job-retry/",
+        login_required(retry_failed_export_job),
+        name="export-job-retry",
+    ),
 ]
@@ -2,20 +2,43 @@
 
 from datetime import date
 
+from django.db.models import QuerySet
+
 from ..cases.models import Case, CaseStatus
 
 
+def get_exportable_cases_queryset(
+    cutoff_date: date, enforcement_body: Case.EnforcementBody
+) -> QuerySet[Case]:
+    """Return queryset of Cases to export for enforcement body"""
+    return (
+        Case.objects.filter(
+            status__status=CaseStatus.Status.CASE_CLOSED_WAITING_TO_SEND
+        )
+        .filter(enforcement_body=enforcement_body)
+        .filter(compliance_email_sent_date__lte=cutoff_date)
+        .exclude(case_completed=Case.CaseCompleted.COMPLETE_NO_SEND)
+        .order_by("id")
+    )
+
+
 def get_exportable_cases(
     cutoff_date: date, enforcement_body: Case.EnforcementBody
 ) -> list[Case]:
     """Return list of Cases to export for enforcement body"""
-    return [
-        case_status.case
-        for case_status in CaseStatus.objects.filter(
-            status=CaseStatus.Status.CASE_CLOSED_WAITING_TO_SEND
+    return list(
+        get_exportable_cases_queryset(
+            cutoff_date=cutoff_date, enforcement_body=enforcement_body
         )
-        .filter(case__enforcement_body=enforcement_body)
-        .filter(case__compliance_email_sent_date__lte=cutoff_date)
-        .exclude(case__case_completed=Case.CaseCompleted.COMPLETE_NO_SEND)
-        .order_by("case__id")
-    ]
+    )
+
+
+def get_exportable_case_ids(
+    cutoff_date: date, enforcement_body: Case.EnforcementBody
+) -> list[int]:
+    """Return ids of Cases to export for enforcement body"""
+    return list(
+        get_exportable_cases_queryset(
+            cutoff_date=cutoff_date, enforcement_body=enforcement_body
+        ).values_list("id", flat=True)
+    )
@@ -8,9 +8,15 @@ from typing import Any
 from django.contrib.auth.models import User
 from django.db.models.query import QuerySet
 from django.forms.models import ModelForm
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.views.decorators.http import require_POST
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView, UpdateView
 from django.views.generic.list import ListView
@@ -18,8 +24,9 @@ from django.views.generic.list import ListView
 from ..cases.models import Case
 from ..common.utils import record_model_create_event, record_model_update_event
 from .csv_export_utils import download_equality_body_cases
+from .export_job_utils import enqueue_export_job, read_export_job_csv, retry_export_job
 from .forms import ExportConfirmForm, ExportCreateForm, ExportDeleteForm
-from .models import Export, ExportCase
+from .models import Export, ExportCase, ExportJob
 
 
 class EnforcementBodyMixin:
@@ -159,7 +166,7 @@ def export_all_cases(request: HttpRequest, pk: int) -> HttpResponse:
     """View to export all cases"""
     export: Export = get_object_or_404(Export, id=pk)
     return download_equality_body_cases(
-        cases=export.all_cases,
+        cases=Case.objects.filter(exportcase__export=export).order_by("exportcase__id"),
         filename=f"DRAFT_{export.enforcement_body.upper()}_cases_{export.cutoff_date}.csv",
     )
 
@@ -168,7 +175,9 @@ def export_ready_cases(request: HttpRequest, pk: int) -> HttpResponse:
     """View to export only ready cases."""
     export: Export = get_object_or_404(Export, pk=pk)
     return download_equality_body_cases(
-        cases=export.ready_cases,
+        cases=Case.objects.filter(
+            exportcase__export=export, exportcase__status=ExportCase.Status.READY
+        ).order_by("exportcase__id"),
         filename=f"{export.enforcement_body.upper()}_cases_{export.cutoff_date}.csv",
     )
 
@@ -178,9 +187,7 @@ def mark_all_export_cases_as_ready(
 ) -> HttpResponseRedirect:
     """Mark all the cases in an export as ready"""
     export: Export = get_object_or_404(Export, id=pk)
-    for export_case in export.exportcase_set.all():
-        export_case.status = ExportCase.Status.READY
-        export_case.save()
+    export.mark_all_cases_as_ready()
     return redirect(reverse("exports:export-detail", kwargs={"pk": export.id}))
 
 
@@ -212,3 +219,75 @@ def mark_export_case_as_excluded(request: HttpRequest, pk: int) -> HttpResponseR
     return redirect(
         f'{reverse("exports:export-detail", kwargs={"pk": export_case.export.id})}#export-case-{export_case.id}'
     )
+
+
+def redirect_to_export_job(export_job: ExportJob) -> HttpResponseRedirect:
+    """Redirect to page showing progress of export job"""
+    return redirect(reverse("exports:export-job-detail", kwargs={"pk": export_job.id}))
+
+
+@require_POST
+def create_all_cases_export_job(request: HttpRequest, pk: int) -> HttpResponseRedirect:
+    """Queue export of all cases in background"""
+    export: Export = get_object_or_404(Export, id=pk)
+    return redirect_to_export_job(
+        enqueue_export_job(
+            user=request.user,
+            export_job_type=ExportJob.Type.EQUALITY_BODY_ALL,
+            export=export,
+        )
+    )
+
+
+@require_POST
+def create_cases_export_job(request: HttpRequest) -> HttpResponseRedirect:
+    """Queue export of cases found by search in background"""
+    return redirect_to_export_job(
+        enqueue_export_job(
+            user=request.user,
+            export_job_type=ExportJob.Type.CASES,
+            search_parameters=request.GET.urlencode(),
+        )
+    )
+
+
+@require_POST
+def create_feedback_survey_export_job(request: HttpRequest) -> HttpResponseRedirect:
+    """Queue export of cases found by search for feedback survey in background"""
+    return redirect_to_export_job(
+        enqueue_export_job(
+            user=request.user,
+            export_job_type=ExportJob.Type.FEEDBACK_SURVEY,
+            search_parameters=request.GET.urlencode(),
+        )
+    )
+
+
+class ExportJobDetailView(DetailView):
+    """
+    View of progress of export job; Refreshes until it has finished
+    """
+
+    model: type[ExportJob] = ExportJob
+    context_object_name: str = "export_job"
+    template_name: str = "exports/export_job_detail.html"
+
+
+def download_export_job(request: HttpRequest, pk: int) -> HttpResponse:
+    """Download CSV rendered by export job"""
+    export_job: ExportJob = get_object_or_404(ExportJob, id=pk)
+    if export_job.status != ExportJob.Status.COMPLETE:
+        return redirect_to_export_job(export_job)
+    response: StreamingHttpResponse = StreamingHttpResponse(
+        read_export_job_csv(export_job), content_type="text/csv"
+    )
+    response["Content-Disposition"] = f"attachment; filename={export_job.filename}"
+    return response
+
+
+@require_POST
+def retry_failed_export_job(request: HttpRequest, pk: int) -> HttpResponseRedirect:
+    """Queue failed export job to resume from its last chunk"""
+    export_job: ExportJob = get_object_or_404(ExportJob, id=pk)
+    retry_export_job(export_job)
+    return redirect_to_export_job(export_job)
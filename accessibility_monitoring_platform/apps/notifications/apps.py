@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class NotificationsConfig(AppConfig):
+    name = "accessibility_monitoring_platform.apps.notifications"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,41 @@
+"""
+Signal handlers for notifications app - Invalidate cached numbers of tasks
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..audits.models import Retest
+from ..cases.models import Case, EqualityBodyCorrespondence
+from .models import Task
+from .utils import invalidate_number_of_tasks
+
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_task_user_number_of_tasks(sender, instance: Task, **kwargs) -> None:
+    """Task changes only affect the number of tasks of the task's user"""
+    invalidate_number_of_tasks(user_id=instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=EqualityBodyCorrespondence)
+@receiver([post_save, post_delete], sender=Retest)
+def invalidate_auditor_number_of_tasks(
+    sender, instance: EqualityBodyCorrespondence | Retest, **kwargs
+) -> None:
+    """Post case tasks are shown to the auditor of the case"""
+    auditor_id: int | None = (
+        Case.objects.filter(id=instance.case_id)
+        .values_list("auditor_id", flat=True)
+        .first()
+    )
+    if auditor_id is not None:
+        invalidate_number_of_tasks(user_id=auditor_id)
+
+
+@receiver([post_save, post_delete], sender=Case)
+def invalidate_all_number_of_tasks(sender, instance: Case, **kwargs) -> None:
+    """
+    Case changes can move overdue tasks between auditors (e.g. on reassignment)
+    so invalidate everyone's number of tasks.
+    """
+    invalidate_number_of_tasks()
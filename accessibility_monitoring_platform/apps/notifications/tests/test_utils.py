@@ -8,7 +8,7 @@ from django.http import HttpRequest
 from django.urls import reverse
 
 from ...audits.models import Retest
-from ...cases.models import Case, CaseCompliance, EqualityBodyCorrespondence
+from ...cases.models import Case, CaseCompliance, CaseStatus, EqualityBodyCorrespondence
 from ...cases.utils import create_case_and_compliance
 from ...cases.views import (
     calculate_report_followup_dates,
@@ -23,8 +23,10 @@ from ..utils import (
     get_number_of_tasks,
     get_overdue_cases,
     get_post_case_tasks,
+    get_task_count_cache_key,
     get_task_type_counts,
     get_tasks_by_type_count,
+    invalidate_number_of_tasks,
     mark_tasks_as_read,
 )
 
@@ -250,6 +252,32 @@ def test_get_post_case_tasks():
     assert len(get_post_case_tasks(user=user)) == 0
 
 
+@pytest.mark.parametrize("number_of_correspondences", [1, 10])
+@pytest.mark.django_db
+def test_get_post_case_tasks_uses_constant_number_of_queries(
+    number_of_correspondences: int, django_assert_num_queries
+):
+    """Test post case tasks are built without per-task queries"""
+    user: User = User.objects.create()
+    case: Case = Case.objects.create(auditor=user)
+    case_with_reminder: Case = Case.objects.create(auditor=user)
+    Task.objects.create(
+        type=Task.Type.REMINDER, user=user, case=case_with_reminder, date=TODAY
+    )
+    for _ in range(number_of_correspondences):
+        EqualityBodyCorrespondence.objects.create(case=case)
+        EqualityBodyCorrespondence.objects.create(case=case_with_reminder)
+        Retest.objects.create(case=case)
+
+    with django_assert_num_queries(2):
+        post_case_tasks: list[Task] = get_post_case_tasks(user=user)
+        for post_case_task in post_case_tasks:
+            assert post_case_task.case.id == case.id
+            assert post_case_task.options[0].url
+
+    assert len(post_case_tasks) == number_of_correspondences * 2
+
+
 @pytest.mark.django_db
 def test_report_ready_to_send_seven_day_no_contact():
     """
@@ -429,6 +457,28 @@ def test_returns_no_overdue_cases():
     assert list(get_overdue_cases(None)) == []
 
 
+@pytest.mark.django_db
+def test_get_overdue_cases_uses_constant_number_of_queries(django_assert_num_queries):
+    """Test overdue cases are found without per-case queries"""
+    user: User = User.objects.create()
+    for _ in range(5):
+        case: Case = create_case(user)
+        case.contact_details_found = Case.ContactDetailsFound.NOT_FOUND
+        case.seven_day_no_contact_email_sent_date = ONE_WEEK_AGO
+        case.save()
+    Task.objects.create(
+        type=Task.Type.REMINDER, user=user, case=case, date=date.today()
+    )
+
+    with django_assert_num_queries(2):
+        overdue_cases: list[Case] = get_overdue_cases(user)
+        for overdue_case in overdue_cases:
+            assert overdue_case.next_action_due_date == date(1970, 1, 1)
+            assert overdue_case.status.status == CaseStatus.Status.REPORT_READY_TO_SEND
+
+    assert len(overdue_cases) == 4
+
+
 @pytest.mark.django_db
 def test_in_report_correspondence_week_1_overdue():
     """Creates two cases; one that is not overdue and another that requires a one-week chaser."""
@@ -764,6 +814,93 @@ def test_get_number_of_tasks():
     assert get_number_of_tasks(user=user) == 1
 
 
+@pytest.mark.django_db
+def test_get_number_of_tasks_is_cached(django_assert_num_queries):
+    """Test get_number_of_tasks does not recalculate a cached value"""
+    user: User = User.objects.create()
+
+    assert get_number_of_tasks(user=user) == 0
+
+    with django_assert_num_queries(0):
+        assert get_number_of_tasks(user=user) == 0
+
+
+@pytest.mark.django_db
+def test_get_number_of_tasks_invalidated_by_task_change():
+    """Test creating or updating a task invalidates the user's number of tasks"""
+    user: User = User.objects.create()
+    case: Case = Case.objects.create(auditor=user)
+
+    assert get_number_of_tasks(user=user) == 0
+
+    task: Task = Task.objects.create(
+        type=Task.Type.QA_COMMENT,
+        date=date.today(),
+        case=case,
+        user=user,
+    )
+
+    assert get_number_of_tasks(user=user) == 1
+
+    task.read = True
+    task.save()
+
+    assert get_number_of_tasks(user=user) == 0
+
+
+@pytest.mark.django_db
+def test_get_number_of_tasks_invalidated_by_case_change():
+    """Test reassigning a case invalidates number of tasks"""
+    user: User = User.objects.create()
+    case: Case = Case.objects.create()
+    EqualityBodyCorrespondence.objects.create(case=case)
+
+    assert get_number_of_tasks(user=user) == 0
+
+    case.auditor = user
+    case.save()
+
+    assert get_number_of_tasks(user=user) == 1
+
+
+@pytest.mark.django_db
+def test_get_number_of_tasks_invalidated_by_equality_body_correspondence():
+    """Test new equality body correspondence invalidates number of tasks"""
+    user: User = User.objects.create()
+    case: Case = Case.objects.create(auditor=user)
+
+    assert get_number_of_tasks(user=user) == 0
+
+    EqualityBodyCorrespondence.objects.create(case=case)
+
+    assert get_number_of_tasks(user=user) == 1
+
+
+@pytest.mark.django_db
+def test_get_number_of_tasks_invalidated_by_retest():
+    """Test new retest invalidates number of tasks"""
+    user: User = User.objects.create()
+    case: Case = Case.objects.create(auditor=user)
+
+    assert get_number_of_tasks(user=user) == 0
+
+    Retest.objects.create(case=case)
+
+    assert get_number_of_tasks(user=user) == 1
+
+
+@pytest.mark.django_db
+def test_invalidate_number_of_tasks_for_all_users():
+    """Test invalidating every user's number of tasks changes their cache keys"""
+    user: User = User.objects.create()
+    get_number_of_tasks(user=user)
+    cache_key: str = get_task_count_cache_key(user_id=user.id)
+
+    invalidate_number_of_tasks()
+
+    assert get_task_count_cache_key(user_id=user.id) != cache_key
+
+
 def test_get_tasks_by_type_count():
     """Test filtering tasks by type and counting how many there are"""
     tasks: list[Task] = [
@@ -1,11 +1,13 @@
 """Add notification function for notification app"""
 
+import time
 from datetime import date, datetime, timedelta
 from typing import Any, TypedDict
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.mail import EmailMessage
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
@@ -14,10 +16,13 @@ from django.urls import reverse
 
 from ..audits.models import Retest
 from ..cases.models import Case, CaseStatus, EqualityBodyCorrespondence
+from ..cases.utils import annotate_next_action_due_date
 from .models import Link, NotificationSetting, Task
 
 TASK_LIST_PARAMS: list[str] = ["type", "read", "deleted", "future"]
 TASK_LIST_READ_TIMEDELTA: timedelta = timedelta(days=7)
+TASK_COUNT_CACHE_TIMEOUT: int = 5 * 60
+TASK_COUNT_CACHE_GENERATION_KEY: str = "number_of_tasks_generation"
 
 
 class EmailContextType(TypedDict):
@@ -89,19 +94,25 @@ def mark_tasks_as_read(user: User, case: Case, type: Task.Type) -> None:
         task.save()
 
 
+def pending_reminder_exists(case_field_name: str = "pk") -> Exists:
+    """Return subquery expression checking a case has a current or future reminder"""
+    return Exists(
+        Task.objects.filter(
+            case=OuterRef(case_field_name),
+            type=Task.Type.REMINDER,
+            date__gte=date.today(),
+        )
+    )
+
+
 def exclude_cases_with_pending_reminders(cases: QuerySet[Case]) -> list[Case]:
     """Return only cases without pending reminders"""
-    today: date = date.today()
-    cases_without_pending_reminders: list[Case] = []
-    for case in cases:
-        if (
-            Task.objects.filter(
-                case=case, type=Task.Type.REMINDER, date__gte=today
-            ).first()
-            is None
-        ):
-            cases_without_pending_reminders.append(case)
-    return cases_without_pending_reminders
+    case_ids_with_pending_reminders: set[int] = set(
+        Task.objects.filter(
+            case__in=cases, type=Task.Type.REMINDER, date__gte=date.today()
+        ).values_list("case_id", flat=True)
+    )
+    return [case for case in cases if case.id not in case_ids_with_pending_reminders]
 
 
 def get_overdue_cases(user_request: User | None) -> list[Case]:
@@ -181,85 +192,74 @@ def get_overdue_cases(user_request: User | None) -> list[Case]:
         | in_12_week_correspondence
     )
 
-    overdue_cases: list[Case] = exclude_cases_with_pending_reminders(
-        cases=in_correspondence
-    )
-
-    sorted_overdue_cases: list[Case] = sorted(
-        overdue_cases, key=lambda t: t.next_action_due_date  # type: ignore
-    )
+    overdue_cases: QuerySet[Case] = annotate_next_action_due_date(
+        in_correspondence.exclude(pending_reminder_exists()).select_related("status")
+    ).order_by("annotated_next_action_due_date", "-id")
 
-    return sorted_overdue_cases
+    return list(overdue_cases)
 
 
 def get_post_case_tasks(user: User) -> list[Task]:
     """
     Return list of tasks for unresolved equality body correspondence
     entries and incomplete equality body retests for a user.
-    """
-    tasks: list[Task] = []
 
+    Cases with pending reminders are excluded within the same query so the
+    number of queries does not grow with the number of tasks.
+    """
     equality_body_correspondences: QuerySet[EqualityBodyCorrespondence] = (
         EqualityBodyCorrespondence.objects.filter(
             case__auditor=user,
             status=EqualityBodyCorrespondence.Status.UNRESOLVED,
         )
+        .exclude(pending_reminder_exists(case_field_name="case_id"))
+        .select_related("case")
+    )
+
+    retests: QuerySet[Retest] = (
+        Retest.objects.filter(
+            is_deleted=False,
+            case__auditor=user,
+            retest_compliance_state=Retest.Compliance.NOT_KNOWN,
+            id_within_case__gt=0,
+        )
+        .exclude(pending_reminder_exists(case_field_name="case_id"))
+        .select_related("case")
     )
 
-    today: date = date.today()
+    tasks: list[Task] = []
 
     for equality_body_correspondence in equality_body_correspondences:
-        if (
-            Task.objects.filter(
-                case=equality_body_correspondence.case,
-                type=Task.Type.REMINDER,
-                date__gte=today,
-            ).first()
-            is None
-        ):
-            task: Task = Task(
-                type=Task.Type.POSTCASE,
-                date=equality_body_correspondence.created.date(),
-                case=equality_body_correspondence.case,
-                description="Unresolved correspondence",
-                action="View correspondence",
+        task: Task = Task(
+            type=Task.Type.POSTCASE,
+            date=equality_body_correspondence.created.date(),
+            case=equality_body_correspondence.case,
+            description="Unresolved correspondence",
+            action="View correspondence",
+        )
+        task.options = [
+            Link(
+                label="View correspondence",
+                url=f"{equality_body_correspondence.get_absolute_url()}?view=unresolved",
             )
-            task.options = [
-                Link(
-                    label="View correspondence",
-                    url=f"{equality_body_correspondence.get_absolute_url()}?view=unresolved",
-                )
-            ]
-            tasks.append(task)
-
-    retests: QuerySet[Retest] = Retest.objects.filter(
-        is_deleted=False,
-        case__auditor=user,
-        retest_compliance_state=Retest.Compliance.NOT_KNOWN,
-        id_within_case__gt=0,
-    )
+        ]
+        tasks.append(task)
 
     for retest in retests:
-        if (
-            Task.objects.filter(
-                case=retest.case, type=Task.Type.REMINDER, date__gte=today
-            ).first()
-            is None
-        ):
-            task: Task = Task(
-                type=Task.Type.POSTCASE,
-                date=retest.date_of_retest,
-                case=retest.case,
-                description="Incomplete retest",
-                action="View retest",
+        task: Task = Task(
+            type=Task.Type.POSTCASE,
+            date=retest.date_of_retest,
+            case=retest.case,
+            description="Incomplete retest",
+            action="View retest",
+        )
+        task.options = [
+            Link(
+                label="View retest",
+                url=retest.get_absolute_url(),
             )
-            task.options = [
-                Link(
-                    label="View retest",
-                    url=retest.get_absolute_url(),
-                )
-            ]
-            tasks.append(task)
+        ]
+        tasks.append(task)
 
     return tasks
 
@@ -291,7 +291,7 @@ def build_task_list(user: User | None, **kwargs: dict[str, str]) -> list[Task]:
         for overdue_case in overdue_cases:
             task: Task = Task(
                 type=Task.Type.OVERDUE,
-                date=overdue_case.next_action_due_date,
+                date=overdue_case.annotated_next_action_due_date,
                 case=overdue_case,
                 description=overdue_case.status.get_status_display(),
                 action="Chase overdue response",
@@ -311,10 +311,39 @@ def build_task_list(user: User | None, **kwargs: dict[str, str]) -> list[Task]:
     return sorted_tasks
 
 
+def get_task_count_cache_key(user_id: int) -> str:
+    """
+    Return cache key for a user's number of tasks.
+
+    The key includes today's date so reminders and overdue cases which become
+    due overnight are picked up, and a generation number which is bumped to
+    invalidate the cached counts of every user at once.
+    """
+    cache.add(TASK_COUNT_CACHE_GENERATION_KEY, time.time_ns(), timeout=None)
+    generation: int = cache.get(TASK_COUNT_CACHE_GENERATION_KEY)
+    return f"number_of_tasks:{generation}:{user_id}:{date.today().isoformat()}"
+
+
+def invalidate_number_of_tasks(user_id: int | None = None) -> None:
+    """Discard cached number of tasks for one user or, if none specified, all users"""
+    if user_id is not None:
+        cache.delete(get_task_count_cache_key(user_id=user_id))
+        return
+    try:
+        cache.incr(TASK_COUNT_CACHE_GENERATION_KEY)
+    except ValueError:
+        cache.set(TASK_COUNT_CACHE_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
 def get_number_of_tasks(user: User) -> int:
-    """Return number of tasks"""
+    """Return number of tasks, calculating and caching it if necessary"""
     if user.id:  # If logged in user
-        return len(build_task_list(user=user))
+        cache_key: str = get_task_count_cache_key(user_id=user.id)
+        number_of_tasks: int | None = cache.get(cache_key)
+        if number_of_tasks is None:
+            number_of_tasks = len(build_task_list(user=user))
+            cache.set(cache_key, number_of_tasks, timeout=TASK_COUNT_CACHE_TIMEOUT)
+        return number_of_tasks
     return 0
 
 
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ReportsConfig(AppConfig):
+    name = "accessibility_monitoring_platform.apps.reports"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
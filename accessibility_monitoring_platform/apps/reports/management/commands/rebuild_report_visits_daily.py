@@ -0,0 +1,18 @@
+"""Command to recalculate daily numbers of report visits"""
+
+from django.core.management.base import BaseCommand
+
+from ...utils import rebuild_report_visits_daily
+
+
+class Command(BaseCommand):
+    """
+    Django command which replaces the daily numbers of report visits with
+    totals recalculated from every report visit logged
+    """
+
+    help = "Recalculate daily numbers of report visits from report visit logs"
+
+    def handle(self, *args, **options):  # pylint: disable=unused-argument
+        number_of_rows: int = rebuild_report_visits_daily()
+        self.stdout.write(f"Rebuilt {number_of_rows} daily report visit totals")
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_report_visits_daily(
+    apps, schema_editor
+):  # pylint: disable=unused-argument
+    ReportVisitsMetrics = apps.get_model("reports", "ReportVisitsMetrics")
+    ReportVisitsDaily = apps.get_model("reports", "ReportVisitsDaily")
+    ReportVisitsDaily.objects.bulk_create(
+        [
+            ReportVisitsDaily(**visits_by_day)
+            for visits_by_day in ReportVisitsMetrics.objects.filter(case__isnull=False)
+            .annotate(date=TruncDate("created"))
+            .values("case_id", "date", "fingerprint_hash")
+            .annotate(number_of_visits=Count("id"))
+            .order_by()
+        ],
+        batch_size=1000,
+    )
+
+
+def reverse_code(apps, schema_editor):  # pylint: disable=unused-argument
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0009_casestatus_status_index"),
+        ("reports", "0005_alter_report_report_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportVisitsDaily",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("fingerprint_hash", models.IntegerField(default=0)),
+                ("number_of_visits", models.IntegerField(default=0)),
+                (
+                    "case",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="cases.case"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Report visits daily",
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("case", "date", "fingerprint_hash"),
+                        name="unique_report_visits_daily",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_report_visits_daily, reverse_code=reverse_code),
+    ]
@@ -6,6 +6,8 @@ from datetime import datetime
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
 from django.template import Context, Template
 from django.urls import reverse
 from django.utils import timezone
@@ -116,14 +118,7 @@ class Report(VersionModel):
 
     @property
     def visits_metrics(self) -> dict[str, int]:
-        return {
-            "number_of_visits": self.case.reportvisitsmetrics_set.all().count(),
-            "number_of_unique_visitors": self.case.reportvisitsmetrics_set.values_list(
-                "fingerprint_hash"
-            )
-            .distinct()
-            .count(),
-        }
+        return get_case_visits_metrics(self.case)
 
 
 class ReportVisitsMetrics(models.Model):
@@ -141,3 +136,38 @@ class ReportVisitsMetrics(models.Model):
         return reverse(
             "reports:report-metrics-view", kwargs={"pk": self.case.report.id}  # type: ignore
         )
+
+
+class ReportVisitsDaily(models.Model):
+    """
+    Number of visits to a case's report by each visitor on each day.
+
+    Rolled up from ReportVisitsMetrics as visits are saved so visit totals do
+    not need to count every visit.
+    """
+
+    case = models.ForeignKey(Case, on_delete=models.CASCADE)
+    date = models.DateField()
+    fingerprint_hash = models.IntegerField(default=0)
+    number_of_visits = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name_plural = "Report visits daily"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["case", "date", "fingerprint_hash"],
+                name="unique_report_visits_daily",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.case} | {self.date} | {self.fingerprint_hash}"
+
+
+def get_case_visits_metrics(case: Case) -> dict[str, int]:
+    """Return total and unique visits to case's report in one query"""
+    return ReportVisitsDaily.objects.filter(case=case).aggregate(
+        number_of_visits=Coalesce(Sum("number_of_visits"), 0),
+        number_of_unique_visitors=Count("fingerprint_hash", distinct=True),
+    )
@@ -0,0 +1,18 @@
+"""
+Signal handlers for reports app - Keep daily numbers of report visits up to date
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import ReportVisitsMetrics
+from .utils import add_report_visits_to_daily_totals
+
+
+@receiver(post_save, sender=ReportVisitsMetrics)
+def add_report_visit_to_daily_totals(
+    sender, instance: ReportVisitsMetrics, created: bool, **kwargs
+) -> None:
+    """Visits saved in bulk are added by the code saving them"""
+    if created:
+        add_report_visits_to_daily_totals([instance])
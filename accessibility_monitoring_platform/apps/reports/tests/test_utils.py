@@ -2,17 +2,24 @@
 Test utility functions of reports app
 """
 
+from datetime import date, datetime, timezone
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 
 from ...audits.models import Audit, CheckResult, Page, WcagDefinition
 from ...cases.models import Case
-from ..models import Report
+from ..models import Report, ReportVisitsDaily, ReportVisitsMetrics
 from ..utils import (
     IssueTable,
     TableRow,
+    add_report_visits_to_daily_totals,
     build_issue_table_rows,
     build_issues_tables,
     build_report_context,
+    get_report_visits_metrics,
+    rebuild_report_visits_daily,
 )
 
 NUMBER_OF_TOP_LEVEL_BASE_TEMPLATES: int = 9
@@ -22,6 +29,7 @@ HOME_PAGE_URL: str = "https://example.com/home"
 PDF_PAGE_URL: str = "https://example.com/pdf"
 CHECK_RESULT_NOTES: str = "Check results note <span>including HTML</span>"
 CHECK_RESULT_RETEST_NOTES: str = "Check results retest note <span>including HTML</span>"
+VISIT_DATETIME: datetime = datetime(2024, 3, 4, 12, tzinfo=timezone.utc)
 
 
 @pytest.mark.django_db
@@ -191,3 +199,99 @@ def test_build_report_context():
         "issues_tables": [],
         "report": report,
     }
+
+
+def create_report_visits(case: Case) -> None:
+    """Log visits by two visitors to case's report without rolling them up"""
+    ReportVisitsMetrics.objects.bulk_create(
+        [
+            ReportVisitsMetrics(case=case, fingerprint_hash=fingerprint_hash)
+            for fingerprint_hash in [1, 1, 2]
+        ]
+    )
+    ReportVisitsMetrics.objects.update(created=VISIT_DATETIME)
+
+
+@pytest.mark.django_db
+def test_add_report_visits_to_daily_totals():
+    """Test visits are added to the daily number of visits of each visitor"""
+    case: Case = Case.objects.create()
+    create_report_visits(case=case)
+
+    add_report_visits_to_daily_totals(list(ReportVisitsMetrics.objects.all()))
+    add_report_visits_to_daily_totals(
+        list(ReportVisitsMetrics.objects.filter(fingerprint_hash=2))
+    )
+
+    assert list(
+        ReportVisitsDaily.objects.order_by("fingerprint_hash").values_list(
+            "date", "fingerprint_hash", "number_of_visits"
+        )
+    ) == [(date(2024, 3, 4), 1, 2), (date(2024, 3, 4), 2, 2)]
+
+
+@pytest.mark.django_db
+def test_saving_report_visit_adds_to_daily_totals():
+    """Test creating a report visit adds it to the daily totals"""
+    case: Case = Case.objects.create()
+    ReportVisitsMetrics.objects.create(case=case, fingerprint_hash=1)
+    ReportVisitsMetrics.objects.create(case=case, fingerprint_hash=1)
+
+    report_visits_daily: ReportVisitsDaily = ReportVisitsDaily.objects.get(case=case)
+
+    assert report_visits_daily.fingerprint_hash == 1
+    assert report_visits_daily.number_of_visits == 2
+
+
+@pytest.mark.django_db
+def test_get_report_visits_metrics(django_assert_num_queries):
+    """Test visit metrics are read from daily totals in one query"""
+    case: Case = Case.objects.create()
+    for fingerprint_hash in [1, 1, 2]:
+        ReportVisitsMetrics.objects.create(case=case, fingerprint_hash=fingerprint_hash)
+
+    with django_assert_num_queries(1):
+        metrics: dict[str, int] = get_report_visits_metrics(case)
+
+    assert metrics == {"number_of_visits": 3, "number_of_unique_visitors": 2}
+
+
+@pytest.mark.django_db
+def test_get_report_visits_metrics_no_visits():
+    """Test visit metrics are zero when report has not been visited"""
+    case: Case = Case.objects.create()
+
+    assert get_report_visits_metrics(case) == {
+        "number_of_visits": 0,
+        "number_of_unique_visitors": 0,
+    }
+
+
+@pytest.mark.django_db
+def test_rebuild_report_visits_daily():
+    """Test daily totals are recalculated from every report visit"""
+    case: Case = Case.objects.create()
+    create_report_visits(case=case)
+    ReportVisitsDaily.objects.create(
+        case=case, date=date(2020, 1, 1), fingerprint_hash=3, number_of_visits=9
+    )
+
+    assert rebuild_report_visits_daily() == 2
+    assert list(
+        ReportVisitsDaily.objects.order_by("fingerprint_hash").values_list(
+            "date", "fingerprint_hash", "number_of_visits"
+        )
+    ) == [(date(2024, 3, 4), 1, 2), (date(2024, 3, 4), 2, 1)]
+
+
+@pytest.mark.django_db
+def test_rebuild_report_visits_daily_command():
+    """Test command recalculates daily totals"""
+    case: Case = Case.objects.create()
+    create_report_visits(case=case)
+    out: StringIO = StringIO()
+
+    call_command("rebuild_report_visits_daily", stdout=out)
+
+    assert "Rebuilt 2 daily report visit totals" in out.getvalue()
+    assert ReportVisitsDaily.objects.count() == 2
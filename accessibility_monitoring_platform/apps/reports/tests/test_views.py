@@ -10,11 +10,18 @@ from django.contrib.auth.models import User
 from django.db.models.query import QuerySet
 from django.http import HttpResponse
 from django.urls import reverse
+from moto import mock_aws
 from pytest_django.asserts import assertContains, assertNotContains
 
 from ...audits.models import Audit, Page, StatementCheckResult
 from ...cases.models import Case, CaseCompliance, CaseEvent
 from ...common.models import Boolean
+from ...s3_read_write.models import S3Report
+from ...s3_read_write.utils import (
+    S3ReadWriteReport,
+    report_html_cache,
+    report_html_uploader,
+)
 from ..models import REPORT_VERSION_DEFAULT, Report, ReportVisitsMetrics
 
 USER_NAME: str = "user1"
@@ -310,3 +317,38 @@ def test_report_metrics_unique_vists_shows_only_current_report(admin_client):
     response: HttpResponse = admin_client.get(url)
     assert response.status_code == 200
     assertNotContains(response, "2020-01-05")
+
+
+@mock_aws
+def test_publish_report_invalidates_cached_report_html(
+    admin_client, django_capture_on_commit_callbacks
+):
+    """Test publishing a new version removes earlier versions from cache"""
+    report: Report = create_report()
+    url: str = reverse("reports:publish-report", kwargs={"pk": report.id})
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.get(url)
+    report_html_uploader.wait()
+    first_s3_report: S3Report = S3Report.objects.get(case=report.case)
+    S3ReadWriteReport().retrieve_raw_html_from_s3_by_guid(first_s3_report.guid)
+
+    assert report_html_cache.get(first_s3_report.guid) is not None
+
+    admin_client.get(url)
+
+    assert report_html_cache.get(first_s3_report.guid) is None
+
+
+@mock_aws
+def test_publish_report_marks_only_new_version_as_latest(admin_client):
+    """Test publishing a new version replaces the latest published version"""
+    report: Report = create_report()
+    url: str = reverse("reports:publish-report", kwargs={"pk": report.id})
+    admin_client.get(url)
+    admin_client.get(url)
+
+    assert list(
+        S3Report.objects.filter(case=report.case)
+        .order_by("version")
+        .values_list("version", "latest_published")
+    ) == [(1, False), (2, True)]
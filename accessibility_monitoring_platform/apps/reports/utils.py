@@ -3,18 +3,28 @@
 Utilities for reports app
 """
 
+from collections import Counter
+from datetime import date
+
 from django.contrib import messages
-from django.db.models.query import QuerySet
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
 from django.http import HttpRequest
 from django.template import Context, Template, loader
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
 
 from ..audits.models import Audit, CheckResult, Page, WcagDefinition
 from ..cases.models import Case
-from ..s3_read_write.models import S3Report
 from ..s3_read_write.utils import S3ReadWriteReport
-from .models import Report
+from .models import (
+    Report,
+    ReportVisitsDaily,
+    ReportVisitsMetrics,
+    get_case_visits_metrics,
+)
 
 WCAG_DEFINITION_BOILERPLATE_TEMPLATE: str = """{% if wcag_definition.url_on_w3 %}[{{ wcag_definition.name }}]({{ wcag_definition.url_on_w3 }}){% if wcag_definition.description and wcag_definition.type != 'manual' %}: {% endif %}{% else %}{{ wcag_definition.name }}{% if wcag_definition.description and wcag_definition.type != 'manual' %}: {% endif %}{% endif %}{% if wcag_definition.description and wcag_definition.type != 'manual' %}{{ wcag_definition.description|safe }}.{% endif %}
 {% if first_use_of_wcag_definition %}
@@ -174,16 +184,66 @@ def build_report_context(
     }
 
 
-def get_report_visits_metrics(case: Case) -> dict[str, str]:
+def get_report_visits_metrics(case: Case) -> dict[str, int]:
     """Returns the visit metrics for reports"""
-    return {
-        "number_of_visits": case.reportvisitsmetrics_set.all().count(),
-        "number_of_unique_visitors": case.reportvisitsmetrics_set.values_list(
-            "fingerprint_hash"
+    return get_case_visits_metrics(case)
+
+
+def add_report_visits_to_daily_totals(
+    report_visits: list[ReportVisitsMetrics],
+) -> None:
+    """Add saved report visits to the daily number of visits of each visitor"""
+    visits_by_day: Counter[tuple[int, date, int]] = Counter(
+        (
+            report_visit.case_id,
+            timezone.localdate(report_visit.created),
+            report_visit.fingerprint_hash,
         )
-        .distinct()
-        .count(),
-    }
+        for report_visit in report_visits
+        if report_visit.case_id is not None
+    )
+    if not visits_by_day:
+        return
+    with transaction.atomic():
+        ReportVisitsDaily.objects.bulk_create(
+            [
+                ReportVisitsDaily(
+                    case_id=case_id, date=visit_date, fingerprint_hash=fingerprint_hash
+                )
+                for case_id, visit_date, fingerprint_hash in visits_by_day
+            ],
+            ignore_conflicts=True,
+        )
+        for (
+            case_id,
+            visit_date,
+            fingerprint_hash,
+        ), number_of_visits in visits_by_day.items():
+            ReportVisitsDaily.objects.filter(
+                case_id=case_id, date=visit_date, fingerprint_hash=fingerprint_hash
+            ).update(number_of_visits=F("number_of_visits") + number_of_visits)
+
+
+def rebuild_report_visits_daily() -> int:
+    """Recalculate daily numbers of visits from every visit; Return rows created"""
+    with transaction.atomic():
+        ReportVisitsDaily.objects.all().delete()
+        report_visits_daily: list[ReportVisitsDaily] = (
+            ReportVisitsDaily.objects.bulk_create(
+                [
+                    ReportVisitsDaily(**visits_by_day)
+                    for visits_by_day in ReportVisitsMetrics.objects.filter(
+                        case__isnull=False
+                    )
+                    .annotate(date=TruncDate("created"))
+                    .values("case_id", "date", "fingerprint_hash")
+                    .annotate(number_of_visits=Count("id"))
+                    .order_by()
+                ],
+                batch_size=1000,
+            )
+        )
+    return len(report_visits_daily)
 
 
 def publish_report_util(report: Report, request: HttpRequest) -> None:
@@ -192,12 +252,7 @@ def publish_report_util(report: Report, request: HttpRequest) -> None:
         f"""reports_common/accessibility_report_{report.report_version}.html"""
     )
     html: str = template.render(build_report_context(report=report), request)
-    published_s3_reports: QuerySet[S3Report] = S3Report.objects.filter(case=report.case)
-    for s3_report in published_s3_reports:
-        s3_report.latest_published = False
-        s3_report.save()
-    s3_read_write_report: S3ReadWriteReport = S3ReadWriteReport()
-    s3_read_write_report.upload_string_to_s3_as_html(
+    S3ReadWriteReport().publish_html(
         html_content=html,
         case=report.case,
         user=request.user,
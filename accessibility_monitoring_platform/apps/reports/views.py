@@ -4,7 +4,7 @@ Views for reports app
 
 from typing import Any
 
-from django.db.models.query import QuerySet
+from django.db.models import Min
 from django.forms.models import ModelForm
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect
@@ -161,21 +161,12 @@ class ReportVisitsMetricsView(ReportTemplateView):
                 fingerprint_codename=context["userhash"],
             )
         elif context["showing"] == "unique-visitors":
-            visit_logs: list[Any] = []
-            disinct_values: QuerySet = (
-                ReportVisitsMetrics.objects.filter(case=case)
+            context["visit_logs"] = ReportVisitsMetrics.objects.filter(
+                id__in=ReportVisitsMetrics.objects.filter(case=case)
                 .values("fingerprint_hash")
-                .distinct()
-            )
-            for query_set in disinct_values:
-                visit_logs.append(
-                    ReportVisitsMetrics.objects.filter(
-                        case=case,
-                        fingerprint_hash=query_set["fingerprint_hash"],
-                    ).first()
-                )
-            visit_logs.sort(reverse=True, key=lambda x: x.id)
-            context["visit_logs"] = visit_logs
+                .annotate(first_visit_id=Min("id"))
+                .values("first_visit_id")
+            ).order_by("-id")
         else:
             context["visit_logs"] = ReportVisitsMetrics.objects.filter(case=case)
 
@@ -2,23 +2,52 @@
 Testing s3 read write
 """
 
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from unittest import mock
 
 import boto3
 import pytest
 from django.contrib.auth.models import User
+from django.test import TestCase
 from moto import mock_aws
 
 from ...settings.base import DATABASES, S3_MOCK_ENDPOINT
 from ..cases.models import Case
 from .models import S3Report
-from .utils import NO_REPORT_HTML, S3ReadWriteReport
+from .utils import (
+    NO_REPORT_HTML,
+    S3_CLIENT_CONFIG,
+    ReportHTMLCache,
+    S3ClientPool,
+    S3ReadWriteReport,
+    get_s3_client,
+    report_html_cache,
+    report_html_uploader,
+    upload_compressed_html,
+)
+
+
+def publish_report_html(
+    html_content: str, case: Case, user: User, report_version: str
+) -> S3Report:
+    """Publish report HTML and wait for it to be uploaded to S3"""
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        s3_report: S3Report = S3ReadWriteReport().publish_html(
+            html_content=html_content,
+            case=case,
+            user=user,
+            report_version=report_version,
+        )
+    report_html_uploader.wait()
+    return s3_report
 
 
 @pytest.mark.django_db
 @mock_aws
-def test_upload_string_to_s3():
-    s3rw: S3ReadWriteReport = S3ReadWriteReport()
+def test_publish_html_uploads_to_s3():
     user: User = User.objects.create()
     case: Case = Case.objects.create(
         created=datetime.now().tzinfo,
@@ -33,7 +62,7 @@ def test_upload_string_to_s3():
             <p class="govuk-body-l">datetime: {datetime.now()}.</p>
         </div>
     """
-    s3rw.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content=raw_html, case=case, user=user, report_version="v1_20220406"
     )
 
@@ -47,7 +76,7 @@ def test_upload_string_to_s3():
         endpoint_url=S3_MOCK_ENDPOINT,
     )
     obj = s3_resource.Object("bucketname", s3report.s3_directory)
-    assert obj.get()["Body"].read().decode("utf-8") == raw_html
+    assert gzip.decompress(obj.get()["Body"].read()).decode("utf-8") == raw_html
 
 
 @pytest.mark.django_db
@@ -68,7 +97,7 @@ def test_retrieve_raw_html():
             <p class="govuk-body-l">datetime: {datetime.now()}.</p>
         </div>
     """
-    s3rw.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content=raw_html, case=case, user=user, report_version="v1_20220406"
     )
 
@@ -113,7 +142,7 @@ def test_s3_no_such_key():
             <p class="govuk-body-l">datetime: {datetime.now()}.</p>
         </div>
     """
-    s3rw.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content=raw_html, case=case, user=user, report_version="v1_20220406"
     )
 
@@ -124,3 +153,196 @@ def test_s3_no_such_key():
     res: str = s3rw.retrieve_raw_html_from_s3_by_guid(guid)
 
     assert res == NO_REPORT_HTML
+
+
+@mock_aws
+def test_s3_client_shared_between_instances():
+    """Test S3 client, and bucket, are only created once per process"""
+    with mock.patch(
+        "accessibility_monitoring_platform.apps.s3_read_write.utils.create_bucket_if_missing"
+    ) as mock_create_bucket_if_missing:
+        first_s3rw: S3ReadWriteReport = S3ReadWriteReport()
+        second_s3rw: S3ReadWriteReport = S3ReadWriteReport()
+
+    assert first_s3rw.s3_client is second_s3rw.s3_client
+    mock_create_bucket_if_missing.assert_called_once()
+
+
+@mock_aws
+def test_s3_client_shared_between_threads():
+    """Test concurrent first use of S3 client pool creates one client"""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        s3_clients: list = list(executor.map(lambda _: get_s3_client(), range(32)))
+
+    assert all(s3_client is s3_clients[0] for s3_client in s3_clients)
+
+
+@mock_aws
+def test_s3_client_recreated_after_fork():
+    """Test forked process does not reuse the parent's S3 client"""
+    s3_client_pool: S3ClientPool = S3ClientPool()
+    parent_s3_client = s3_client_pool.get_client()
+
+    with mock.patch("os.getpid", return_value=os.getpid() + 1):
+        child_s3_client = s3_client_pool.get_client()
+
+    assert child_s3_client is not parent_s3_client
+
+
+def test_s3_client_connection_pool_configured():
+    """Test S3 client keeps a pool of persistent connections"""
+    assert S3_CLIENT_CONFIG.max_pool_connections >= 10
+    assert S3_CLIENT_CONFIG.tcp_keepalive is True
+
+
+def create_s3_report(s3rw: S3ReadWriteReport, raw_html: str = "<p>Report</p>") -> str:
+    """Upload report to S3 and return its guid"""
+    case: Case = Case.objects.create(organisation_name="org name")
+    return publish_report_html(
+        html_content=raw_html,
+        case=case,
+        user=User.objects.create(),
+        report_version="v1_20220406",
+    ).guid
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_retrieve_raw_html_served_from_cache(django_assert_num_queries):
+    """Test cached report HTML is returned without reading database or S3"""
+    s3rw: S3ReadWriteReport = S3ReadWriteReport()
+    guid: str = create_s3_report(s3rw)
+
+    assert s3rw.retrieve_raw_html_from_s3_by_guid(guid) == "<p>Report</p>"
+
+    with mock.patch.object(s3rw.s3_client, "get_object") as mock_get_object:
+        with django_assert_num_queries(0):
+            assert s3rw.retrieve_raw_html_from_s3_by_guid(guid) == "<p>Report</p>"
+
+    mock_get_object.assert_not_called()
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_retrieve_raw_html_missing_from_s3_not_cached():
+    """Test report missing from S3 is not cached"""
+    s3rw: S3ReadWriteReport = S3ReadWriteReport()
+    guid: str = create_s3_report(s3rw)
+    s3_report: S3Report = S3Report.objects.get(guid=guid)
+    s3_report.s3_directory = "not-a-valid-dir"
+    s3_report.save()
+
+    assert s3rw.retrieve_raw_html_from_s3_by_guid(guid) == NO_REPORT_HTML
+    assert report_html_cache.get(guid) is None
+
+
+def test_report_html_cache_evicts_least_recently_used():
+    """Test in-process cache is bounded and evicts least recently used"""
+    cache: ReportHTMLCache = ReportHTMLCache(max_entries=2)
+    cache.set(guid="a", html="A")
+    cache.set(guid="b", html="B")
+    cache.get("a")
+    cache.set(guid="c", html="C")
+
+    assert list(cache.entries) == ["a", "c"]
+
+
+def test_report_html_cache_falls_back_to_shared_cache(settings):
+    """Test report evicted from process is read from shared cache"""
+    settings.CACHES = {
+        **settings.CACHES,
+        "report_html": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "report-html-test",
+        },
+    }
+    cache: ReportHTMLCache = ReportHTMLCache(max_entries=1)
+    cache.set(guid="a", html="A")
+    cache.set(guid="b", html="B")
+
+    assert "a" not in cache.entries
+    assert cache.get("a") == "A"
+    assert list(cache.entries) == ["a"]
+
+
+def test_report_html_cache_delete():
+    """Test reports deleted from process and shared cache"""
+    cache: ReportHTMLCache = ReportHTMLCache()
+    cache.set(guid="a", html="A")
+
+    cache.delete(guids=["a"])
+
+    assert cache.get("a") is None
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_publish_html_uploads_compressed_html_after_commit(
+    django_capture_on_commit_callbacks,
+):
+    """Test published report HTML is uploaded, compressed, once saved"""
+    s3rw: S3ReadWriteReport = S3ReadWriteReport()
+    case: Case = Case.objects.create(organisation_name="org name")
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        s3_report: S3Report = s3rw.publish_html(
+            html_content="<p>Report</p>",
+            case=case,
+            user=User.objects.create(),
+            report_version="v1_20220406",
+        )
+
+    assert s3_report.html == "<p>Report</p>"
+    assert s3_report.version == 1
+    assert s3_report.latest_published is True
+    assert s3rw.s3_client.list_objects_v2(Bucket="bucketname")["KeyCount"] == 0
+
+    callbacks[0]()
+    report_html_uploader.wait()
+    s3_object: dict = s3rw.s3_client.get_object(
+        Bucket="bucketname", Key=s3_report.s3_directory
+    )
+
+    assert s3_object["ContentEncoding"] == "gzip"
+    assert gzip.decompress(s3_object["Body"].read()) == b"<p>Report</p>"
+    assert s3rw.retrieve_raw_html_from_s3_by_guid(s3_report.guid) == "<p>Report</p>"
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_publish_html_replaces_latest_published(django_assert_max_num_queries):
+    """Test publishing updates earlier versions without loading them"""
+    s3rw: S3ReadWriteReport = S3ReadWriteReport()
+    case: Case = Case.objects.create(organisation_name="org name")
+    user: User = User.objects.create()
+    S3Report.objects.create(case=case, version=1, latest_published=False)
+    S3Report.objects.create(case=case, version=3, latest_published=True)
+
+    with django_assert_max_num_queries(6):
+        s3_report: S3Report = s3rw.publish_html(
+            html_content="<p>Report</p>",
+            case=case,
+            user=user,
+            report_version="v1_20220406",
+        )
+
+    assert s3_report.version == 4
+    assert list(
+        S3Report.objects.filter(case=case, latest_published=True).values_list(
+            "version", flat=True
+        )
+    ) == [4]
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_upload_compressed_html_failure_logged():
+    """Test failure to upload report HTML is logged"""
+    with mock.patch.object(
+        get_s3_client(), "put_object", side_effect=Exception("S3 unavailable")
+    ), mock.patch(
+        "accessibility_monitoring_platform.apps.s3_read_write.utils.logger"
+    ) as mock_logger:
+        upload_compressed_html(s3_directory="key.html", html_content="<p>Report</p>")
+
+    mock_logger.exception.assert_called_once()
@@ -1,100 +1,305 @@
 """
 S3 readwrite utilities
+
+One S3 client is shared by all threads of a process (boto3 clients are
+thread-safe) and keeps a pool of persistent connections, so reading a report
+does not pay for client construction, credential resolution or a new TLS
+connection. The client is created lazily, on first use, and recreated if the
+process forks.
+
+Published report HTML never changes for a GUID so it is cached, by GUID, in a
+bounded in-process LRU in front of the shared "report_html" cache.
+
+Publishing saves the report HTML on the new S3Report row and uploads it to
+S3, compressed, on a worker thread once the row is committed. Until the
+upload finishes the report viewer shows the HTML saved on the row.
 """
+
+import gzip
+import logging
+import os
 import re
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any
 
 import boto3
+from botocore.config import Config
 from django.contrib.auth.models import User
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.db.models import Max
 
 from ...settings.base import DATABASES, DEBUG, S3_MOCK_ENDPOINT, UNDER_TEST
 from ..cases.models import Case
 from .models import S3Report
 
+logger = logging.getLogger(__name__)
+
 NO_REPORT_HTML: str = "<p>Does not exist</p>"
+S3_BUCKET: str = DATABASES.get("aws-s3-bucket", {}).get("bucket_name", "")
+REPORT_HTML_CACHE_MAX_ENTRIES: int = int(
+    os.getenv("REPORT_HTML_CACHE_MAX_ENTRIES", "100")
+)
+REPORT_UPLOAD_MAX_WORKERS: int = int(os.getenv("REPORT_UPLOAD_MAX_WORKERS", "4"))
+S3_CLIENT_CONFIG: Config = Config(
+    max_pool_connections=int(os.getenv("S3_MAX_POOL_CONNECTIONS", "20")),
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=30,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
 
 
-class S3ReadWriteReport:
-    """S3 readwrite utilities"""
+class S3ClientPool:
+    """Lazily created S3 client shared by all threads in a process"""
 
     def __init__(self) -> None:
-        self.s3_resource = boto3.resource(
-            service_name="s3",
-            region_name=DATABASES["aws-s3-bucket"]["aws_region"],
-            aws_access_key_id=DATABASES["aws-s3-bucket"]["aws_access_key_id"],
-            aws_secret_access_key=DATABASES["aws-s3-bucket"]["aws_secret_access_key"],
-            endpoint_url=S3_MOCK_ENDPOINT,
-        )
+        self.lock: threading.Lock = threading.Lock()
+        self.s3_client: Any = None
+        self.process_id: int | None = None
+
+    def get_client(self) -> Any:
+        """Return the process-wide S3 client, creating it on first use"""
+        s3_client: Any = self.s3_client
+        if s3_client is not None and self.process_id == os.getpid():
+            return s3_client
+        with self.lock:
+            if self.s3_client is None or self.process_id != os.getpid():
+                s3_client = boto3.session.Session().client(
+                    "s3",
+                    region_name=DATABASES["aws-s3-bucket"]["aws_region"],
+                    aws_access_key_id=DATABASES["aws-s3-bucket"]["aws_access_key_id"],
+                    aws_secret_access_key=DATABASES["aws-s3-bucket"][
+                        "aws_secret_access_key"
+                    ],
+                    endpoint_url=S3_MOCK_ENDPOINT,
+                    config=S3_CLIENT_CONFIG,
+                )
+                # Creates bucket for unit testing, integration testing, and local development
+                if DEBUG or UNDER_TEST:
+                    create_bucket_if_missing(s3_client)
+                self.s3_client = s3_client
+                self.process_id = os.getpid()
+            return self.s3_client
 
-        self.s3_client = boto3.client(
-            "s3",
-            region_name=DATABASES["aws-s3-bucket"]["aws_region"],
-            aws_access_key_id=DATABASES["aws-s3-bucket"]["aws_access_key_id"],
-            aws_secret_access_key=DATABASES["aws-s3-bucket"]["aws_secret_access_key"],
-            endpoint_url=S3_MOCK_ENDPOINT,
+    def reset(self) -> None:
+        """Discard the client so the next use creates a new one"""
+        with self.lock:
+            self.s3_client = None
+            self.process_id = None
+
+
+def create_bucket_if_missing(s3_client: Any) -> None:
+    """Create the reports bucket if it does not exist"""
+    response = s3_client.list_buckets()
+    bucket_names = [bucket["Name"] for bucket in response["Buckets"]]
+    if S3_BUCKET not in bucket_names:
+        s3_client.create_bucket(
+            Bucket=S3_BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "us-west-1"},
         )
 
-        # Creates bucket for unit testing, integration testing, and local development
-        if DEBUG or UNDER_TEST:
-            response = self.s3_client.list_buckets()
-            bucket_names = [bucket["Name"] for bucket in response["Buckets"]]
-            if DATABASES["aws-s3-bucket"]["bucket_name"] not in bucket_names:
-                self.s3_client.create_bucket(
-                    Bucket=DATABASES["aws-s3-bucket"]["bucket_name"],
-                    CreateBucketConfiguration={"LocationConstraint": "us-west-1"},
-                )
 
-        self.bucket: str = DATABASES["aws-s3-bucket"]["bucket_name"]
+s3_client_pool: S3ClientPool = S3ClientPool()
 
-    def upload_string_to_s3_as_html(
+
+def get_s3_client() -> Any:
+    """Return the process-wide S3 client"""
+    return s3_client_pool.get_client()
+
+
+class ReportHTMLCache:
+    """
+    Published report HTML by GUID; Least recently used entries are evicted
+    from the in-process cache once it holds max_entries
+    """
+
+    def __init__(
         self,
-        html_content: str,
-        case: Case,
-        user: User,
-        report_version: str,
-    ) -> str:
-        version = 1
-        if S3Report.objects.filter(case=case).exists():
-            version = len(S3Report.objects.filter(case=case)) + 1
+        max_entries: int = REPORT_HTML_CACHE_MAX_ENTRIES,
+        alias: str = "report_html",
+    ) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.max_entries: int = max_entries
+        self.alias: str = alias
 
-        guid: str = str(uuid.uuid4())
+    @property
+    def shared_cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    def get_key(self, guid: str) -> str:
+        return f"report_html_{guid}"
+
+    def get(self, guid: str) -> str | None:
+        """Return cached report HTML or None"""
+        with self.lock:
+            html: str | None = self.entries.get(guid)
+            if html is not None:
+                self.entries.move_to_end(guid)
+                return html
+        html = self.shared_cache.get(self.get_key(guid))
+        if html is not None:
+            self.set_local(guid=guid, html=html)
+        return html
+
+    def set_local(self, guid: str, html: str) -> None:
+        with self.lock:
+            self.entries[guid] = html
+            self.entries.move_to_end(guid)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
 
-        s3_url_for_report: str = self.url_builder(
-            organisation_name=case.organisation_name,
-            case_id=case.id,
-            version=version,
-            report_version=report_version,
-            guid=guid,
+    def set(self, guid: str, html: str) -> None:
+        """Cache report HTML in process and in shared cache"""
+        self.set_local(guid=guid, html=html)
+        self.shared_cache.set(self.get_key(guid), html)
+
+    def delete(self, guids: list[str]) -> None:
+        """Remove reports from cache"""
+        with self.lock:
+            for guid in guids:
+                self.entries.pop(guid, None)
+        self.shared_cache.delete_many([self.get_key(guid) for guid in guids])
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+        self.shared_cache.clear()
+
+
+report_html_cache: ReportHTMLCache = ReportHTMLCache()
+
+
+def upload_compressed_html(s3_directory: str, html_content: str) -> None:
+    """Upload report HTML to S3 compressed with gzip"""
+    try:
+        get_s3_client().put_object(
+            Body=gzip.compress(html_content.encode("utf-8")),
+            Bucket=S3_BUCKET,
+            Key=s3_directory,
+            ContentEncoding="gzip",
+            ContentType="text/html; charset=utf-8",
         )
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Upload of report %s to S3 failed", s3_directory)
+
 
-        self.s3_client.put_object(
-            Body=html_content,
-            Bucket=self.bucket,
-            Key=s3_url_for_report,
+class ReportHTMLUploader:
+    """Uploads published report HTML to S3 on worker threads"""
+
+    def __init__(self, max_workers: int = REPORT_UPLOAD_MAX_WORKERS) -> None:
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="report-upload"
         )
+        self.lock: threading.Lock = threading.Lock()
+        self.pending: set[Future] = set()
 
-        s3report = S3Report(
-            case=case,
-            created_by=user,
-            s3_directory=s3_url_for_report,
-            version=version,
-            guid=guid,
-            html=html_content,
-            latest_published=True,
+    def submit(self, s3_directory: str, html_content: str) -> Future:
+        """Start upload of report HTML"""
+        future: Future = self.executor.submit(
+            upload_compressed_html,
+            s3_directory=s3_directory,
+            html_content=html_content,
         )
+        with self.lock:
+            self.pending.add(future)
+        future.add_done_callback(self.discard)
+        return future
+
+    def discard(self, future: Future) -> None:
+        with self.lock:
+            self.pending.discard(future)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait for uploads in progress to finish"""
+        with self.lock:
+            pending: list[Future] = list(self.pending)
+        wait(pending, timeout=timeout)
+
+
+report_html_uploader: ReportHTMLUploader = ReportHTMLUploader()
+
 
-        s3report.save()
-        return s3report.guid
+class S3ReadWriteReport:
+    """S3 readwrite utilities"""
+
+    def __init__(self) -> None:
+        self.s3_client = get_s3_client()
+        self.bucket: str = S3_BUCKET
+
+    def get_next_version(self, case: Case) -> int:
+        """Return version number of case's next published report"""
+        latest_version: int | None = S3Report.objects.filter(case=case).aggregate(
+            Max("version")
+        )["version__max"]
+        return 1 if latest_version is None else latest_version + 1
+
+    def publish_html(
+        self,
+        html_content: str,
+        case: Case,
+        user: User,
+        report_version: str,
+    ) -> S3Report:
+        """
+        Save report HTML as the latest published version of the case's report
+        and upload it to S3 on a worker thread once the save is committed
+        """
+        guid: str = str(uuid.uuid4())
+        with transaction.atomic():
+            published_guids: list[str] = list(
+                S3Report.objects.filter(case=case).values_list("guid", flat=True)
+            )
+            S3Report.objects.filter(case=case, latest_published=True).update(
+                latest_published=False
+            )
+            version: int = self.get_next_version(case=case)
+            s3_report: S3Report = S3Report.objects.create(
+                case=case,
+                created_by=user,
+                s3_directory=self.url_builder(
+                    organisation_name=case.organisation_name,
+                    case_id=case.id,
+                    version=version,
+                    report_version=report_version,
+                    guid=guid,
+                ),
+                version=version,
+                guid=guid,
+                html=html_content,
+                latest_published=True,
+            )
+            transaction.on_commit(
+                lambda: report_html_uploader.submit(
+                    s3_directory=s3_report.s3_directory, html_content=html_content
+                )
+            )
+        report_html_cache.delete(guids=published_guids)
+        return s3_report
 
     def retrieve_raw_html_from_s3_by_guid(self, guid: str) -> str:
-        if S3Report.objects.filter(guid=guid).exists():
-            s3file = S3Report.objects.get(guid=guid)
-            try:
-                obj = self.s3_resource.Object(self.bucket, s3file.s3_directory)
-                return obj.get()["Body"].read().decode("utf-8")
-            except self.s3_client.exceptions.NoSuchKey:
-                return NO_REPORT_HTML
-        return NO_REPORT_HTML
+        html: str | None = report_html_cache.get(guid)
+        if html is not None:
+            return html
+        s3file: S3Report | None = S3Report.objects.filter(guid=guid).first()
+        if s3file is None:
+            return NO_REPORT_HTML
+        try:
+            s3_object: dict[str, Any] = self.s3_client.get_object(
+                Bucket=self.bucket, Key=s3file.s3_directory
+            )
+        except self.s3_client.exceptions.NoSuchKey:
+            return NO_REPORT_HTML
+        body: bytes = s3_object["Body"].read()
+        if s3_object.get("ContentEncoding") == "gzip":
+            body = gzip.decompress(body)
+        html = body.decode("utf-8")
+        report_html_cache.set(guid=guid, html=html)
+        return html
 
     def url_builder(
         self,
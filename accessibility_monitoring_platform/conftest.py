@@ -0,0 +1,27 @@
+"""Pytest fixtures shared by all platform tests"""
+
+import pytest
+from django.core.cache import cache
+
+from .apps.common.models import clear_date_range_catalogues
+from .apps.s3_read_write.utils import report_html_cache, s3_client_pool
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Stop values cached by one test leaking into the next"""
+    cache.clear()
+    report_html_cache.clear()
+    clear_date_range_catalogues()
+    yield
+    cache.clear()
+    report_html_cache.clear()
+    clear_date_range_catalogues()
+
+
+@pytest.fixture(autouse=True)
+def reset_s3_client_pool():
+    """Create a new S3 client, and bucket, within each test's mocked AWS"""
+    s3_client_pool.reset()
+    yield
+    s3_client_pool.reset()
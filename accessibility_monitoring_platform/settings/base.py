@@ -178,6 +178,31 @@ elif os.getenv("DB_SECRET") and os.getenv("DB_NAME"):
 
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
+# In-process cache, shared by the threads of each platform server process.
+# Cached values (e.g. number of tasks) carry short timeouts so other processes
+# converge after their invalidation.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "accessibility-monitoring-platform",
+    }
+}
+
+# Published report HTML, keyed by GUID. Set REPORT_HTML_CACHE_DIRECTORY to a
+# directory shared by the platform and report viewer to share the cache (and
+# its invalidation on publish) between processes. Without one, report HTML is
+# only held in each process's own ReportHTMLCache.
+REPORT_HTML_CACHE_DIRECTORY: str = os.getenv("REPORT_HTML_CACHE_DIRECTORY", "")
+if REPORT_HTML_CACHE_DIRECTORY:
+    CACHES["report_html"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": REPORT_HTML_CACHE_DIRECTORY,
+        "TIMEOUT": 7 * 24 * 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    }
+else:
+    CACHES["report_html"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -307,4 +332,11 @@ else:
 
 COPILOT_APPLICATION_NAME = os.getenv("COPILOT_APPLICATION_NAME", None)
 
+# Background CSV exports are rendered by the run_export_jobs command; Only offer
+# them when a worker service runs it
+EXPORT_JOBS_ENABLED = os.getenv("EXPORT_JOBS_ENABLED") == "TRUE"
+# Background CSV exports are written to S3 or local filesystem (s3 or local)
+EXPORT_JOB_STORAGE: str = os.getenv("EXPORT_JOB_STORAGE", "s3")
+EXPORT_JOB_DIRECTORY: Path = Path(os.getenv("EXPORT_JOB_DIRECTORY", "/tmp/export_jobs"))
+
 OTP_EMAIL_SUBJECT = "Platform token"
@@ -7,9 +7,13 @@ from uuid import UUID
 
 from django.http import HttpRequest
 
-from accessibility_monitoring_platform.apps.common.models import UserCacheUniqueHash
 from accessibility_monitoring_platform.apps.reports.models import ReportVisitsMetrics
-from accessibility_monitoring_platform.apps.s3_read_write.models import S3Report
+
+from .visit_logger import (
+    get_case_id_for_guid,
+    get_internal_fingerprint_hashes,
+    report_visits_buffer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -101,19 +105,23 @@ class ReportMetrics:
         try:
             string_to_hash: str = self.user_fingerprint(request)
             fingerprint_hash: int = self.four_digit_hash(string_to_hash)
-            if not UserCacheUniqueHash.objects.filter(
-                fingerprint_hash=fingerprint_hash
-            ).exists():
+            if fingerprint_hash not in get_internal_fingerprint_hashes():
                 absolute_uri: str = request.build_absolute_uri()
                 guid: str | None = self.extract_guid_from_url(absolute_uri)
                 if guid:
-                    fingerprint_codename = self.fingerprint_codename(fingerprint_hash)
-                    ReportVisitsMetrics(
-                        case=S3Report.objects.get(guid=guid).case,
-                        guid=guid,
-                        fingerprint_hash=fingerprint_hash,
-                        fingerprint_codename=fingerprint_codename,
-                    ).save()
+                    case_id: int | None = get_case_id_for_guid(guid)
+                    if case_id is not None:
+                        fingerprint_codename = self.fingerprint_codename(
+                            fingerprint_hash
+                        )
+                        report_visits_buffer.add(
+                            ReportVisitsMetrics(
+                                case_id=case_id,
+                                guid=guid,
+                                fingerprint_hash=fingerprint_hash,
+                                fingerprint_codename=fingerprint_codename,
+                            )
+                        )
         except Exception as e:
             logger.warning("Error in ReportMetrics Middleware: %s", e)
 
@@ -0,0 +1,160 @@
+"""
+visit_logger - saves report visits in batches away from the request
+
+Visits are added to an in-process buffer which a background thread saves with
+bulk_create once enough visits are waiting or the flush interval has passed.
+Without the background thread (e.g. in tests) the buffer is saved by the
+request which fills it. Lookups needed to record a visit (the case of each
+report and the fingerprints of platform users) are cached in memory.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from accessibility_monitoring_platform.apps.common.models import UserCacheUniqueHash
+from accessibility_monitoring_platform.apps.reports.models import ReportVisitsMetrics
+from accessibility_monitoring_platform.apps.reports.utils import (
+    add_report_visits_to_daily_totals,
+)
+from accessibility_monitoring_platform.apps.s3_read_write.models import S3Report
+
+logger = logging.getLogger(__name__)
+
+INTERNAL_FINGERPRINT_HASHES_TTL: float = 60
+CASE_ID_BY_GUID_TTL: float = 60 * 60
+CASE_ID_BY_GUID_MAX_ENTRIES: int = 10_000
+
+
+class TTLCache:
+    """Values kept in memory for a number of seconds"""
+
+    def __init__(self, ttl: float, max_entries: int = 1) -> None:
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.lock: threading.Lock = threading.Lock()
+        self.entries: dict[Any, tuple[float, Any]] = {}
+
+    def get(self, key: Any, load: Callable[[], Any]) -> Any:
+        """Return cached value, loading and caching it if missing or expired"""
+        now: float = time.monotonic()
+        with self.lock:
+            entry: tuple[float, Any] | None = self.entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        value: Any = load()
+        if value is not None:
+            with self.lock:
+                if len(self.entries) >= self.max_entries:
+                    self.entries.clear()
+                self.entries[key] = (now + self.ttl, value)
+        return value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+internal_fingerprint_hashes_cache: TTLCache = TTLCache(
+    ttl=INTERNAL_FINGERPRINT_HASHES_TTL
+)
+case_id_by_guid_cache: TTLCache = TTLCache(
+    ttl=CASE_ID_BY_GUID_TTL, max_entries=CASE_ID_BY_GUID_MAX_ENTRIES
+)
+
+
+def get_internal_fingerprint_hashes() -> frozenset[int]:
+    """Return fingerprint hashes of platform users, whose visits are ignored"""
+    return internal_fingerprint_hashes_cache.get(
+        "fingerprint_hashes",
+        lambda: frozenset(
+            UserCacheUniqueHash.objects.values_list("fingerprint_hash", flat=True)
+        ),
+    )
+
+
+def get_case_id_for_guid(guid: str) -> int | None:
+    """Return id of case whose published report has the guid"""
+    return case_id_by_guid_cache.get(
+        guid,
+        lambda: S3Report.objects.filter(guid=guid)
+        .values_list("case_id", flat=True)
+        .first(),
+    )
+
+
+def save_report_visits(report_visits: list[ReportVisitsMetrics]) -> None:
+    """Save batch of report visits and add them to the daily totals"""
+    with transaction.atomic():
+        ReportVisitsMetrics.objects.bulk_create(report_visits)
+        add_report_visits_to_daily_totals(report_visits)
+
+
+class ReportVisitsBuffer:
+    """Report visits waiting to be saved"""
+
+    def __init__(self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        self.report_visits: list[ReportVisitsMetrics] = []
+        self.buffer_full: threading.Event = threading.Event()
+        self.flush_thread: threading.Thread | None = None
+
+    def add(self, report_visit: ReportVisitsMetrics) -> None:
+        """Add visit to buffer; Save the buffer if it is full"""
+        with self.lock:
+            self.report_visits.append(report_visit)
+            buffer_full: bool = (
+                len(self.report_visits) >= settings.REPORT_VISITS_BUFFER_SIZE
+            )
+        if settings.REPORT_VISITS_BACKGROUND_FLUSH:
+            self.start_flush_thread()
+            if buffer_full:
+                self.buffer_full.set()
+        elif buffer_full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Save buffered visits; Return number saved"""
+        with self.lock:
+            report_visits: list[ReportVisitsMetrics] = self.report_visits
+            self.report_visits = []
+        if report_visits:
+            try:
+                save_report_visits(report_visits)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(
+                    "Error saving %s report visits: %s", len(report_visits), e
+                )
+                return 0
+        return len(report_visits)
+
+    def start_flush_thread(self) -> None:
+        if self.flush_thread is not None and self.flush_thread.is_alive():
+            return
+        with self.lock:
+            if self.flush_thread is None or not self.flush_thread.is_alive():
+                self.flush_thread = threading.Thread(
+                    target=self.run_flush_thread,
+                    name="report-visits-flush",
+                    daemon=True,
+                )
+                self.flush_thread.start()
+
+    def run_flush_thread(self) -> None:
+        """Save buffer whenever it fills or the flush interval passes"""
+        while settings.REPORT_VISITS_BACKGROUND_FLUSH:
+            self.buffer_full.wait(timeout=settings.REPORT_VISITS_FLUSH_INTERVAL)
+            self.buffer_full.clear()
+            close_old_connections()
+            self.flush()
+            close_old_connections()
+
+
+report_visits_buffer: ReportVisitsBuffer = ReportVisitsBuffer()
+atexit.register(report_visits_buffer.flush)
@@ -3,13 +3,16 @@ Test report viewer
 """
 
 import logging
+import threading
 from datetime import date
 from unittest import mock
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
 from django.http import HttpResponse
 from django.template import Template, loader
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from moto import mock_aws
 from pytest_django.asserts import assertContains, assertNotContains
@@ -23,12 +26,21 @@ from accessibility_monitoring_platform.apps.common.models import (
 from accessibility_monitoring_platform.apps.common.utils import get_platform_settings
 from accessibility_monitoring_platform.apps.reports.models import (
     Report,
+    ReportVisitsDaily,
     ReportVisitsMetrics,
 )
 from accessibility_monitoring_platform.apps.s3_read_write.models import S3Report
-from accessibility_monitoring_platform.apps.s3_read_write.utils import S3ReadWriteReport
+from accessibility_monitoring_platform.apps.s3_read_write.tests import (
+    publish_report_html,
+)
 
 from .middleware.report_views_middleware import ReportMetrics
+from .middleware.visit_logger import (
+    TTLCache,
+    get_case_id_for_guid,
+    get_internal_fingerprint_hashes,
+    report_visits_buffer,
+)
 from .utils import show_warning
 
 
@@ -91,9 +103,8 @@ def test_view_report(client):
     user: User = User.objects.create()
     Report.objects.create(case=case)
     Audit.objects.create(case=case)
-    s3_read_write_report: S3ReadWriteReport = S3ReadWriteReport()
     html: str = "<p>  This is example text </ p>"
-    s3_read_write_report.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content=html,
         case=case,
         user=user,
@@ -127,8 +138,7 @@ def test_view_older_report(client):
     context: dict[str, Report] = {"report": report}
     html: str = template.render(context)
 
-    s3_read_write_report: S3ReadWriteReport = S3ReadWriteReport()
-    s3_read_write_report.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content=html,
         case=case,
         user=user,
@@ -136,7 +146,7 @@ def test_view_older_report(client):
     )
 
     html: str = template.render(context)
-    s3_read_write_report.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content=html,
         case=case,
         user=user,
@@ -176,9 +186,8 @@ def test_view_report_not_on_s3(client):
     user: User = User.objects.create()
     Report.objects.create(case=case)
     Audit.objects.create(case=case)
-    s3_read_write_report: S3ReadWriteReport = S3ReadWriteReport()
     html_on_db: str = "<p>Text on DB</p>"
-    s3_read_write_report.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content="<p>Text on S3</p>",
         case=case,
         user=user,
@@ -264,9 +273,8 @@ def test_report_metric_middleware_successful(client):
     case: Case = Case.objects.create()
     user: User = User.objects.create()
     Report.objects.create(case=case)
-    s3_read_write_report: S3ReadWriteReport = S3ReadWriteReport()
     html_on_db: str = "<p>Text on DB</p>"
-    s3_read_write_report.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content="<p>Text on S3</p>",
         case=case,
         user=user,
@@ -281,6 +289,7 @@ def test_report_metric_middleware_successful(client):
     client.get(reverse("viewer:viewreport", kwargs=report_guid_kwargs))
     client.get(reverse("viewer:viewreport", kwargs=report_guid_kwargs))
     client.get(reverse("viewer:viewreport", kwargs=report_guid_kwargs))
+    report_visits_buffer.flush()
     res: int = ReportVisitsMetrics.objects.all().count()
     assert res == 3
 
@@ -292,9 +301,8 @@ def test_report_metric_middleware_ignore_user(client, rf):
     case: Case = Case.objects.create()
     user: User = User.objects.create()
     Report.objects.create(case=case)
-    s3_read_write_report: S3ReadWriteReport = S3ReadWriteReport()
     html_on_db: str = "<p>Text on DB</p>"
-    s3_read_write_report.upload_string_to_s3_as_html(
+    publish_report_html(
         html_content="<p>Text on S3</p>",
         case=case,
         user=user,
@@ -321,6 +329,7 @@ def test_report_metric_middleware_ignore_user(client, rf):
     client.get(reverse("viewer:viewreport", kwargs=report_guid_kwargs))
     client.get(reverse("viewer:viewreport", kwargs=report_guid_kwargs))
     client.get(reverse("viewer:viewreport", kwargs=report_guid_kwargs))
+    report_visits_buffer.flush()
     res: int = ReportVisitsMetrics.objects.all().count()
     assert res == 0
 
@@ -338,3 +347,230 @@ def test_show_warning(today, expected_result):
     with mock.patch("report_viewer.apps.viewer.utils.date") as mock_date:
         mock_date.today.return_value = today
         assert show_warning() is expected_result
+
+
+def create_published_report(html: str = "<p>Report text</p>") -> S3Report:
+    """Publish report to S3 and return its S3Report"""
+    case: Case = Case.objects.create()
+    Report.objects.create(case=case)
+    Audit.objects.create(case=case)
+    publish_report_html(
+        html_content=html,
+        case=case,
+        user=User.objects.create(),
+        report_version="v1_202201401",
+    )
+    return S3Report.objects.get(case=case)
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_view_report_conditional_get(client):
+    """Test unchanged report returns 304 when revisited"""
+    s3_report: S3Report = create_published_report()
+    url: str = reverse("viewer:viewreport", kwargs={"guid": s3_report.guid})
+
+    response: HttpResponse = client.get(url)
+
+    assert response.status_code == 200
+    assert "ETag" in response.headers
+    assert "Last-Modified" in response.headers
+    assert "public" in response.headers["Cache-Control"]
+
+    response_if_none_match: HttpResponse = client.get(
+        url, headers={"If-None-Match": response.headers["ETag"]}
+    )
+
+    assert response_if_none_match.status_code == 304
+    assert response_if_none_match.content == b""
+
+    response_if_modified_since: HttpResponse = client.get(
+        url, headers={"If-Modified-Since": response.headers["Last-Modified"]}
+    )
+
+    assert response_if_modified_since.status_code == 304
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_view_report_etag_changes_when_newer_version_published(client):
+    """Test older report is sent again once a newer version is published"""
+    s3_report: S3Report = create_published_report()
+    url: str = reverse("viewer:viewreport", kwargs={"guid": s3_report.guid})
+    etag: str = client.get(url).headers["ETag"]
+    publish_report_html(
+        html_content="<p>Newer report text</p>",
+        case=s3_report.case,
+        user=s3_report.created_by,
+        report_version="v1_202201401",
+    )
+    S3Report.objects.filter(id=s3_report.id).update(latest_published=False)
+
+    response: HttpResponse = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assertContains(response, "A newer version of this report is available.")
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_view_report_page_cached(client):
+    """Test rendered report page is reused for later views"""
+    s3_report: S3Report = create_published_report()
+    url: str = reverse("viewer:viewreport", kwargs={"guid": s3_report.guid})
+    client.get(url)
+
+    with mock.patch(
+        "report_viewer.apps.viewer.views.S3ReadWriteReport"
+    ) as mock_s3_read_write_report:
+        response: HttpResponse = client.get(url)
+
+    assert response.status_code == 200
+    assertContains(response, "Report text")
+    mock_s3_read_write_report.assert_not_called()
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_view_report_page_cache_disabled(client, settings):
+    """Test report page is rendered for every view when caching disabled"""
+    settings.REPORT_PAGE_CACHE_TIMEOUT = 0
+    s3_report: S3Report = create_published_report()
+    url: str = reverse("viewer:viewreport", kwargs={"guid": s3_report.guid})
+    client.get(url)
+
+    with mock.patch(
+        "report_viewer.apps.viewer.views.S3ReadWriteReport"
+    ) as mock_s3_read_write_report:
+        mock_s3_read_write_report.return_value.retrieve_raw_html_from_s3_by_guid.return_value = (
+            "<p>Report text</p>"
+        )
+        response: HttpResponse = client.get(url)
+
+    assertContains(response, "Report text")
+    mock_s3_read_write_report.assert_called_once()
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_report_metric_middleware_does_not_save_visit_inline(client):
+    """Test report visits are buffered rather than saved by the request"""
+    s3_report: S3Report = create_published_report()
+    url: str = reverse("viewer:viewreport", kwargs={"guid": s3_report.guid})
+    client.get(url)
+
+    assert ReportVisitsMetrics.objects.count() == 0
+    assert len(report_visits_buffer.report_visits) == 1
+
+    with CaptureQueriesContext(connection) as captured_queries:
+        client.get(url)
+
+    assert [
+        query["sql"]
+        for query in captured_queries
+        if "reportvisitsmetrics" in query["sql"]
+        or "usercacheuniquehash" in query["sql"]
+    ] == []
+    assert report_visits_buffer.flush() == 2
+    assert ReportVisitsMetrics.objects.filter(case=s3_report.case).count() == 2
+    assert ReportVisitsDaily.objects.get(case=s3_report.case).number_of_visits == 2
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_report_metric_middleware_saves_full_buffer(client, settings):
+    """Test buffered report visits are saved in bulk once buffer is full"""
+    settings.REPORT_VISITS_BUFFER_SIZE = 2
+    s3_report: S3Report = create_published_report()
+    url: str = reverse("viewer:viewreport", kwargs={"guid": s3_report.guid})
+
+    client.get(url)
+
+    assert ReportVisitsMetrics.objects.count() == 0
+
+    with mock.patch.object(
+        ReportVisitsMetrics.objects,
+        "bulk_create",
+        wraps=ReportVisitsMetrics.objects.bulk_create,
+    ) as mock_bulk_create:
+        client.get(url)
+
+    mock_bulk_create.assert_called_once()
+    assert ReportVisitsMetrics.objects.count() == 2
+    assert report_visits_buffer.report_visits == []
+
+
+@pytest.mark.django_db
+def test_report_visits_buffer_flush_error_logged():
+    """Test failure to save report visits is logged"""
+    report_visits_buffer.add(ReportVisitsMetrics(case_id=0, guid="guid"))
+
+    with mock.patch(
+        "report_viewer.apps.viewer.middleware.visit_logger.save_report_visits",
+        side_effect=Exception("Database unavailable"),
+    ), mock.patch(
+        "report_viewer.apps.viewer.middleware.visit_logger.logger"
+    ) as mock_logger:
+        assert report_visits_buffer.flush() == 0
+
+    mock_logger.warning.assert_called_once()
+    assert report_visits_buffer.report_visits == []
+
+
+@pytest.mark.django_db
+def test_get_case_id_for_guid_cached(django_assert_num_queries):
+    """Test case id of report is looked up once"""
+    case: Case = Case.objects.create()
+    S3Report.objects.create(case=case, guid="guid", version=1)
+
+    with django_assert_num_queries(1):
+        assert get_case_id_for_guid("guid") == case.id
+        assert get_case_id_for_guid("guid") == case.id
+
+    with django_assert_num_queries(1):
+        assert get_case_id_for_guid("unknown") is None
+
+
+@pytest.mark.django_db
+def test_get_internal_fingerprint_hashes_cached(django_assert_num_queries):
+    """Test fingerprints of platform users are looked up once"""
+    UserCacheUniqueHash.objects.create(
+        user=User.objects.create(), fingerprint_hash=1234
+    )
+
+    with django_assert_num_queries(1):
+        assert get_internal_fingerprint_hashes() == frozenset([1234])
+        assert get_internal_fingerprint_hashes() == frozenset([1234])
+
+
+def test_ttl_cache_expires():
+    """Test cached value is loaded again once it expires"""
+    ttl_cache: TTLCache = TTLCache(ttl=60)
+    load = mock.Mock(side_effect=["first", "second"])
+
+    with mock.patch(
+        "report_viewer.apps.viewer.middleware.visit_logger.time.monotonic",
+        side_effect=[0, 30, 61],
+    ):
+        assert ttl_cache.get("key", load) == "first"
+        assert ttl_cache.get("key", load) == "first"
+        assert ttl_cache.get("key", load) == "second"
+
+
+def test_report_visits_buffer_saved_by_background_thread(settings):
+    """Test background thread saves buffered visits after flush interval"""
+    settings.REPORT_VISITS_BACKGROUND_FLUSH = True
+    settings.REPORT_VISITS_FLUSH_INTERVAL = 0.01
+    saved: threading.Event = threading.Event()
+
+    with mock.patch(
+        "report_viewer.apps.viewer.middleware.visit_logger.save_report_visits",
+        side_effect=lambda report_visits: saved.set(),
+    ):
+        report_visits_buffer.add(ReportVisitsMetrics(case_id=0, guid="guid"))
+
+        assert saved.wait(timeout=5)
+
+    assert report_visits_buffer.flush_thread.is_alive()
+    assert report_visits_buffer.report_visits == []
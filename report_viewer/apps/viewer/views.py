@@ -1,15 +1,26 @@
 """Views for report viewer"""
 
+import hashlib
 import logging
+from datetime import datetime
 from typing import Any
 
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django.views.generic import TemplateView
 
 from accessibility_monitoring_platform.apps.common.platform_template_view import (
     PlatformTemplateView,
 )
-from accessibility_monitoring_platform.apps.reports.models import Report
+from accessibility_monitoring_platform.apps.reports.models import (
+    WRAPPER_TEXT_FIELDS,
+    Report,
+    ReportWrapper,
+)
 from accessibility_monitoring_platform.apps.s3_read_write.models import S3Report
 from accessibility_monitoring_platform.apps.s3_read_write.utils import (
     NO_REPORT_HTML,
@@ -35,34 +46,109 @@ class PrivacyNoticeTemplateView(PlatformTemplateView):
     template_name: str = "viewer/privacy_notice.html"
 
 
+def get_report_page_etag(
+    s3_report: S3Report,
+    latest_s3_report: S3Report | None,
+    report: Report,
+    warning_shown: bool,
+) -> str:
+    """
+    Return entity tag for report page; Changes when the report, whether it is
+    the latest version, the report wrapper text or the warning banner change
+    """
+    report_wrapper_text: tuple | None = ReportWrapper.objects.values_list(
+        *WRAPPER_TEXT_FIELDS
+    ).first()
+    validator: str = "|".join(
+        str(value)
+        for value in [
+            s3_report.guid,
+            s3_report.created.isoformat(),
+            latest_s3_report.guid if latest_s3_report is not None else "",
+            report.report_version,
+            report.report_rebuilt.isoformat() if report.report_rebuilt else "",
+            report_wrapper_text,
+            warning_shown,
+        ]
+    )
+    return quote_etag(
+        hashlib.md5(validator.encode("utf-8"), usedforsecurity=False).hexdigest()
+    )
+
+
 class ViewReport(TemplateView):
     """
     View of report on S3
+
+    Supports conditional requests so revisits of an unchanged report get a
+    304 response, and caches rendered pages so repeated views of the same
+    report are not rendered again.
     """
 
     template_name: str = "reports_common/accessibility_report_base.html"
 
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        self.s3_report: S3Report = get_object_or_404(
+            S3Report.objects.select_related("case"), guid=self.kwargs["guid"]
+        )
+        self.report: Report = self.s3_report.case.report
+        self.warning_shown: bool = show_warning()
+        latest_s3_report: S3Report | None = self.report.latest_s3_report
+        etag: str = get_report_page_etag(
+            s3_report=self.s3_report,
+            latest_s3_report=latest_s3_report,
+            report=self.report,
+            warning_shown=self.warning_shown,
+        )
+        last_modified: datetime = max(
+            [self.s3_report.created]
+            + ([latest_s3_report.created] if latest_s3_report is not None else [])
+        )
+        response: HttpResponse | None = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp())
+        )
+        if response is None:
+            response = self.get_page_response(etag=etag)
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_cache_control(response, public=True, max_age=settings.REPORT_PAGE_MAX_AGE)
+        return response
+
+    def get_page_response(self, etag: str) -> HttpResponse:
+        """Return rendered report page, from cache if caching is enabled"""
+        cache_key: str = (
+            f"report_page_{self.s3_report.guid}_{self.warning_shown}_{etag}"
+        )
+        if settings.REPORT_PAGE_CACHE_TIMEOUT:
+            content: bytes | None = cache.get(cache_key)
+            if content is not None:
+                return HttpResponse(content)
+        response: HttpResponse = self.render_to_response(self.get_context_data())
+        response.render()
+        if settings.REPORT_PAGE_CACHE_TIMEOUT:
+            cache.set(cache_key, response.content, settings.REPORT_PAGE_CACHE_TIMEOUT)
+        return response
+
     def get_context_data(
         self, *args, **kwargs  # pylint: disable=unused-argument
     ) -> dict[str, Any]:
         context: dict[str, Any] = super().get_context_data(**kwargs)
         guid: str = self.kwargs["guid"]
-        s3_report = get_object_or_404(S3Report, guid=guid)
+        s3_report: S3Report = self.s3_report
         s3_rw = S3ReadWriteReport()
         raw_html = s3_rw.retrieve_raw_html_from_s3_by_guid(guid=guid)
         if raw_html == NO_REPORT_HTML and s3_report.html:
             raw_html = s3_report.html
             logger.warning("Report %s not found on S3", guid)
-        report: Report = s3_report.case.report
 
         context.update(
             {
                 "html_report": raw_html,
-                "report": report,
+                "report": self.report,
                 "s3_report": s3_report,
                 "guid": self.kwargs["guid"],
                 "report_viewer": True,
-                "show_warning": show_warning(),
+                "show_warning": self.warning_shown,
             }
         )
         return context
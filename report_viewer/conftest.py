@@ -0,0 +1,43 @@
+"""Pytest fixtures shared by all report viewer tests"""
+
+import pytest
+from django.core.cache import cache
+
+from accessibility_monitoring_platform.apps.s3_read_write.utils import (
+    report_html_cache,
+    s3_client_pool,
+)
+
+from .apps.viewer.middleware.visit_logger import (
+    case_id_by_guid_cache,
+    internal_fingerprint_hashes_cache,
+    report_visits_buffer,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_s3_client_pool():
+    """Create a new S3 client, and bucket, within each test's mocked AWS"""
+    s3_client_pool.reset()
+    yield
+    s3_client_pool.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Stop pages and report HTML cached by one test leaking into the next"""
+    cache.clear()
+    report_html_cache.clear()
+    yield
+    cache.clear()
+    report_html_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_visit_logger():
+    """Start each test with empty visit buffer and lookup caches"""
+    report_visits_buffer.report_visits.clear()
+    case_id_by_guid_cache.clear()
+    internal_fingerprint_hashes_cache.clear()
+    yield
+    report_visits_buffer.report_visits.clear()
@@ -162,6 +162,43 @@ elif os.getenv("DB_SECRET") and os.getenv("DB_NAME"):
         "aws_region": None,
     }
 
+# In-process cache, shared by the threads of each report viewer process
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "report-viewer",
+    }
+}
+
+# Published report HTML, keyed by GUID. Set REPORT_HTML_CACHE_DIRECTORY to a
+# directory shared by the platform and report viewer to share the cache (and
+# its invalidation on publish) between processes. Without one, report HTML is
+# only held in each process's own ReportHTMLCache.
+REPORT_HTML_CACHE_DIRECTORY: str = os.getenv("REPORT_HTML_CACHE_DIRECTORY", "")
+if REPORT_HTML_CACHE_DIRECTORY:
+    CACHES["report_html"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": REPORT_HTML_CACHE_DIRECTORY,
+        "TIMEOUT": 7 * 24 * 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    }
+else:
+    CACHES["report_html"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+
+# Seconds browsers and proxies may reuse a report page before revalidating it
+REPORT_PAGE_MAX_AGE: int = int(os.getenv("REPORT_PAGE_MAX_AGE", "60"))
+# Seconds rendered report pages are kept in the default cache (0 to disable)
+REPORT_PAGE_CACHE_TIMEOUT: int = int(os.getenv("REPORT_PAGE_CACHE_TIMEOUT", "600"))
+
+# Report visits are buffered and saved in batches, by a background thread,
+# once REPORT_VISITS_BUFFER_SIZE visits are waiting or every
+# REPORT_VISITS_FLUSH_INTERVAL seconds
+REPORT_VISITS_BUFFER_SIZE: int = int(os.getenv("REPORT_VISITS_BUFFER_SIZE", "50"))
+REPORT_VISITS_FLUSH_INTERVAL: float = float(
+    os.getenv("REPORT_VISITS_FLUSH_INTERVAL", "5")
+)
+REPORT_VISITS_BACKGROUND_FLUSH: bool = not UNDER_TEST
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,